@@ -6,32 +6,86 @@
 # -----------------------------
 # Import Statements
 # -----------------------------
+import time
+launch_started = time.perf_counter()   # start of the 'import' timing phase
 import pygame
 import sys
-import time
-import pyttsx3      # Added for that sound
+import os
+import urllib.parse
 import webbrowser   # Added for Play Again button
+from engine import HanoiState
+from solver import min_moves_pegs, plan_between, MAX_PEGS
+from text_cache import TextCache
+from renderer import DirtyRenderer
+from scheduler import FrameScheduler
+from speech import Announcer            # Added for that sound (pyttsx3, lazily)
+from timing import PhaseTimer
+from replay import ReplayWriter, to_base64
+from autosolve import AutoSolver
+from result_channel import ResultReporter
+from perf_overlay import FrameStats, FrameProfiler
+import logs
+
+startup = PhaseTimer(launch_started)
+startup.mark('import')
 
 # -----------------------------
-# Initialization
+# Initialization (window is opened in main)
 # -----------------------------
-
-pygame.init()
-pygame.display.set_caption("Towers of Hanoi")
-screen = pygame.display.set_mode((640, 480))
-clock = pygame.time.Clock()
 framerate = 60
+scheduler = FrameScheduler(framerate)
+text_cache = TextCache()
+
+# Loggers: game lifecycle, per-move events (high volume, DEBUG),
+# menu presses and performance counters
+log = logs.get_logger('game')
+move_log = logs.get_logger('game.moves')
+menu_log = logs.get_logger('game.menu')
+perf_log = logs.get_logger('game.perf')
 
 # -----------------------------
 # Game Variables
 # -----------------------------
+screen = None       # display surface, created in main()
+renderer = None     # DirtyRenderer, created in main()
+announcer = Announcer(enabled=False)
+username = "Guest"
+n_disks = 3
+n_pegs = 3          # number of towers (--pegs=K)
+launched_by_flask = False
+server_url = os.environ.get('HANOI_SERVER', 'http://127.0.0.1:5000')   # --server=URL
+open_browser = True # --no-browser skips the Game Over page
 game_done = False
 steps = 0
-disks = []
-towers_midx = [120, 320, 520]
+state = None        # engine.HanoiState, the source of truth for the rules
+disks = []          # disks[d] is the pygame.Rect of disk d (index 0 unused)
+towers_midx = [120, 320, 520]   # recomputed for n_pegs by layout_towers()
+tower_spacing = 200
+disk_widest = 69    # width of the largest disk (set by layout_towers)
+disk_stride = 23    # vertical distance between stacked disks
+disk_height = 20
+MENU_MAX_DISKS = 32
+POLE_HEIGHT = 200
+autosolver = None   # autosolve.AutoSolver while the A key playback runs
+auto_label = ''     # HUD text for the playback, refreshed a few times a second
+auto_label_at = 0.0
+hint_table = None   # hints.HintTable, loaded on the first H press (False if not built)
+hint_text = ''      # last hint shown, cleared by the next move
+challenge = None    # (start, target, optimal) boards from --challenge=START:TARGET
 pointing_at = 0
 floating = False
-floater = 0
+floater = 0         # disk currently lifted (0 if none)
+lifted_from = 0     # tower the floating disk was lifted from
+off_by = 0          # extra moves compared with the optimal path
+replay_log = None   # replay.ReplayWriter, every move of this game
+frame_stats = FrameStats()      # per-phase frame timing for the O key overlay
+profiler = FrameProfiler()      # P key: cProfile the next profile_frames frames
+profile_frames = 120            # --profile-frames=N
+show_overlay = False
+overlay_lines = ('', '')        # overlay text, refreshed a few times a second
+overlay_at = 0.0
+last_profile = ''               # file name of the last capture, shown in the overlay
+last_move_at = 0.0  # time of the previous move, for replay timing
 
 # -----------------------------
 # Colors
@@ -44,36 +98,6 @@ BLUE = (78,162,196)
 GREY = (170, 170, 170)
 GREEN = (77, 206, 145)
 
-# -----------------------------
-# User Input Arguments
-# -----------------------------
-
-# Check if Flask passed arguments
-if len(sys.argv) >= 3:
-    username = sys.argv[1]           # player name from form
-    n_disks = int(sys.argv[2])       # number of disks from form
-else:
-    # fallback if running manually
-    username = input("Enter your name: ") or "Guest"
-    
-    while True:
-        try:
-            n_disks = int(input("Enter number of disks (3-6): "))
-            if 3 <= n_disks <= 6:
-                break
-            print("Please enter a number between 3 and 6.")
-        except:
-            print("Invalid input, enter a number.")
-
-print(f"Starting Tower of Hanoi for {username} with {n_disks} disks")
-
-# -----------------------------
-# Audio Setup
-# -----------------------------
-engine = pyttsx3.init()
-engine.say("Enjoy Tower of Hanoi Game!!!")
-engine.runAndWait()
-
 # =============================
 # Helper Functions
 # =============================
@@ -105,8 +129,8 @@ def blit_text(screen, text, midtop, aa=True, font=None, font_name = None, size =
         RGB color
     """
     if font is None:
-        font = pygame.font.SysFont(font_name, size)
-    font_surface = font.render(text, aa, color)
+        font = text_cache.font(font_name, size)
+    font_surface = text_cache.render(text, font, color, aa)
     font_rect = font_surface.get_rect()
     font_rect.midtop = midtop
     screen.blit(font_surface, font_rect)
@@ -124,106 +148,389 @@ def menu_screen():
     """
     global screen, n_disks, game_done
     menu_done = False
+    redraw = True
     while not menu_done:
-        screen.fill(WHITE)
+        # Only redraw after something changed
+        if redraw:
+            screen.fill(WHITE)
+            
+            # Draw Title Shadow
+            blit_text(screen, 'Towers of Hanoi', (323,122), font_name='sans serif', size=90, color=GREY)
+            blit_text(screen, 'Towers of Hanoi', (320,120), font_name='sans serif', size=90, color=GOLD)
+            
+            # Instruction
+            blit_text(screen, 'Use arrow keys to select difficulty:', (320, 220), font_name='sans serif', size=30, color=BLACK)
+            blit_text(screen, str(n_disks), (320, 260), font_name='sans serif', size=40, color=BLUE)
+            blit_text(screen, 'Press ENTER to continue', (320, 320), font_name='sans serif', size=30, color=BLACK)
+            pygame.display.flip()
+        scheduler.frame_done(redraw)
+        redraw = False
         
-        # Draw Title Shadow
-        blit_text(screen, 'Towers of Hanoi', (323,122), font_name='sans serif', size=90, color=GREY)
-        blit_text(screen, 'Towers of Hanoi', (320,120), font_name='sans serif', size=90, color=GOLD)
-        
-        # Instruction
-        blit_text(screen, 'Use arrow keys to select difficulty:', (320, 220), font_name='sans serif', size=30, color=BLACK)
-        blit_text(screen, str(n_disks), (320, 260), font_name='sans serif', size=40, color=BLUE)
-        blit_text(screen, 'Press ENTER to continue', (320, 320), font_name='sans serif', size=30, color=BLACK)
-        
-        # Event handling for menu
-        for event in pygame.event.get():
+        # Event handling for menu (blocks while idle)
+        for event in scheduler.events():
+            redraw = True
             if event.type==pygame.KEYDOWN:
                 if event.key == pygame.K_q:
                     menu_done = True
                     game_done = True
-                    print("Menu: Quit pressed")
+                    menu_log.debug("Menu: Quit pressed")
                 if event.key == pygame.K_RETURN:
                     menu_done = True
-                    print("Menu: Enter pressed")
+                    menu_log.debug("Menu: Enter pressed")
                 if event.key in [pygame.K_RIGHT, pygame.K_UP]:
                     n_disks += 1
-                    if n_disks > 6:
-                        n_disks = 6
-                    print(f"Menu: Increased disks to {n_disks}")
+                    if n_disks > MENU_MAX_DISKS:
+                        n_disks = MENU_MAX_DISKS
+                    menu_log.debug("Menu: Increased disks to %d", n_disks)
                 if event.key in [pygame.K_LEFT, pygame.K_DOWN]:
                     n_disks -= 1
                     if n_disks < 1:
                         n_disks = 1
-                    print(f"Menu: Decreased disks to {n_disks}")
+                    menu_log.debug("Menu: Decreased disks to %d", n_disks)
             if event.type == pygame.QUIT:
                 menu_done = True
                 game_done = True
-                print("Menu: Quit via window close")
-        pygame.display.flip()
-        clock.tick(60)
+                menu_log.debug("Menu: Quit via window close")
+
+# -----------------------------
+# Function: layout_towers
+# Purpose: Spread n_pegs towers across the window
+# -----------------------------
+def layout_towers():
+    """
+    Towers share the window width between 20px margins equally, which
+    gives the classic 120/320/520 layout for 3 pegs. Up to 6 disks keep
+    the classic 23px steps; beyond that disks get narrower and thinner
+    so the largest fits on its base and a full stack fits on its pole.
+    """
+    global towers_midx, tower_spacing, disk_widest, disk_stride, disk_height
+    width = screen.get_width() if screen else 640
+    tower_spacing = (width - 40) // n_pegs
+    towers_midx = [20 + tower_spacing*i + tower_spacing//2 for i in range(n_pegs)]
+    disk_widest = min(23*n_disks, tower_spacing - 40)    # no wider than the base
+    disk_stride = max(1, min(23, (POLE_HEIGHT - 10) // n_disks))
+    disk_height = disk_stride - 3 if disk_stride > 12 else max(1, disk_stride - 1)
+
+# -----------------------------
+# Function: place_disk
+# Purpose: Move a disk's rect to a stack level on a tower
+# -----------------------------
+def place_disk(disk, tower, level):
+    disks[disk].midtop = (towers_midx[tower], 397 - disk_height - level*disk_stride)
 
 # -----------------------------
 # Function: make_disks
-# Purpose: Initialize disk objects with size, value, position
+# Purpose: Initialize the engine state and one rect per disk
 # -----------------------------
 def make_disks():
-    global n_disks, disks
-    disks = []
-    height = 20
-    ypos = 397 - height
-    width = n_disks * 23
-    for i in range(n_disks):
-        disk = {}
-        disk['rect'] = pygame.Rect(0, 0, width, height)
-        disk['rect'].midtop = (120, ypos)
-        disk['val'] = n_disks-i
-        disk['tower'] = 0
-        disks.append(disk)
-        ypos -= height+3
-        width -= 23
-        # Debug log
-        print(f"Disk {i} created with width {disk['rect'].width} at position {disk['rect'].midtop}")
+    global n_disks, disks, state, replay_log, last_move_at, hint_table, hint_text
+    if challenge:
+        state = HanoiState.from_locations(challenge[0])
+    else:
+        state = HanoiState(n_disks, goal=n_pegs-1, n_pegs=n_pegs)
+    hint_table = None
+    hint_text = ''
+    replay_log = ReplayWriter(n_disks, n_pegs=n_pegs)
+    last_move_at = time.perf_counter()
+    disks = [None]
+    for val in range(1, n_disks+1):
+        disks.append(pygame.Rect(0, 0, max(3, val*disk_widest // n_disks), disk_height))
+        place_disk(val, 0, n_disks-val)
+        move_log.debug("Disk %d created with width %d at position %s", val, disks[val].width, disks[val].midtop)
+    if challenge:
+        sync_disks()
+
+# -----------------------------
+# Function: sync_disks
+# Purpose: Put every disk rect where the engine state says it is
+# -----------------------------
+def sync_disks():
+    for peg, stack in enumerate(state.pegs):
+        for level, disk in enumerate(stack):
+            place_disk(disk, peg, level)
 
 # -----------------------------
 # Function: draw_disks
 # Purpose: Draw all disks on screen
 # -----------------------------
-def draw_disks():
-    for disk in disks:
-        pygame.draw.rect(screen, BLUE, disk['rect'])
+def draw_disks(surface=None):
+    surface = screen if surface is None else surface
+    for rect in disks[1:]:
+        pygame.draw.rect(surface, BLUE, rect)
 
 # -----------------------------
 # Function: draw_towers
 # Purpose: Draw towers and base
 # -----------------------------
-def draw_towers():
-    for xpos in range(40, 460+1, 200):
-        pygame.draw.rect(screen, GREEN, pygame.Rect(xpos, 400, 160 , 20))
-        pygame.draw.rect(screen, GREY, pygame.Rect(xpos+75, 200, 10, 200))
-    blit_text(screen, 'Start', (towers_midx[0], 403), font_name='mono', size=14, color=BLACK)
-    blit_text(screen, 'Finish', (towers_midx[2], 403), font_name='mono', size=14, color=BLACK)
+def draw_towers(surface=None):
+    surface = screen if surface is None else surface
+    base_width = tower_spacing - 40
+    for midx in towers_midx:
+        pygame.draw.rect(surface, GREEN, pygame.Rect(midx - base_width//2, 400, base_width, 20))
+        pygame.draw.rect(surface, GREY, pygame.Rect(midx-5, 200, 10, 200))
+    blit_text(surface, 'Start', (towers_midx[0], 403), font_name='mono', size=14, color=BLACK)
+    blit_text(surface, 'Finish', (towers_midx[-1], 403), font_name='mono', size=14, color=BLACK)
+
+# -----------------------------
+# Function: make_background
+# Purpose: Pre-render the static layer (bases, poles, labels) once
+# -----------------------------
+def make_background():
+    background = pygame.Surface(screen.get_size()).convert()
+    background.fill(WHITE)
+    draw_towers(background)
+    if challenge:
+        draw_target(background)
+    return background
+
+# -----------------------------
+# Function: draw_target
+# Purpose: Miniature of the challenge's target board (top right)
+# -----------------------------
+def draw_target(surface):
+    blit_text(surface, 'Target', (565, 8), font_name='mono', size=14, color=BLACK)
+    stride = max(1, min(6, 60 // n_disks))
+    levels = [0, 0, 0]
+    for disk in range(n_disks, 0, -1):
+        peg = challenge[1][disk-1]
+        width = 4 + disk*36 // n_disks
+        rect = pygame.Rect(0, 0, width, max(1, stride-1))
+        rect.midbottom = (520 + 45*peg, 95 - levels[peg]*stride)
+        pygame.draw.rect(surface, BLUE, rect)
+        levels[peg] += 1
+    pygame.draw.line(surface, GREEN, (495, 96), (635, 96), 2)
 
 # -----------------------------
 # Function: draw_ptr
 # Purpose: Draw the pointer triangle on selected tower
 # -----------------------------
-def draw_ptr():
+def draw_ptr(surface=None):
+    surface = screen if surface is None else surface
     ptr_points = [
         (towers_midx[pointing_at]-7 ,440), 
         (towers_midx[pointing_at]+7, 440), 
         (towers_midx[pointing_at], 433)
     ]
-    pygame.draw.polygon(screen, RED, ptr_points)
+    pygame.draw.polygon(surface, RED, ptr_points)
+
+# -----------------------------
+# Function: text_item
+# Purpose: Renderer item for a cached text label
+# -----------------------------
+def text_item(key, text, midtop, font_name, size, color):
+    surface = text_cache.render(text, text_cache.font(font_name, size), color)
+    rect = surface.get_rect(midtop=midtop)
+    return (key, rect, text, lambda target: target.blit(surface, rect))
+
+# -----------------------------
+# Function: frame_items
+# Purpose: Collect the dynamic layer for the dirty-rect renderer
+# -----------------------------
+def frame_items():
+    items = [
+        (disk, rect, None, lambda target, rect=rect: pygame.draw.rect(target, BLUE, rect))
+        for disk, rect in enumerate(disks) if rect is not None
+    ]
+    ptr_rect = pygame.Rect(towers_midx[pointing_at]-7, 433, 15, 8)
+    items.append(('ptr', ptr_rect, None, draw_ptr))
+    items.append(text_item('steps', 'Steps: '+str(steps), (320, 20), 'mono', 30, BLACK))
+    if autosolver is not None:
+        items.append(text_item('path', auto_label, (320, 50), 'mono', 20, BLUE))
+    elif n_pegs != 3 and not hint_table:
+        # No cheap distance-to-goal beyond 3 pegs; show the target instead
+        best = 'Best possible: '+str(min_moves_pegs(n_disks, n_pegs))
+        items.append(text_item('path', best, (320, 50), 'mono', 20, BLACK))
+    elif off_by:
+        items.append(text_item('path', 'Off optimal path by '+str(off_by), (320, 50), 'mono', 20, RED))
+    else:
+        items.append(text_item('path', 'On optimal path', (320, 50), 'mono', 20, GREEN))
+    if hint_text:
+        items.append(text_item('hint', hint_text, (320, 75), 'mono', 18, BLUE))
+    return items
+
+# -----------------------------
+# Function: paint_group
+# Purpose: Overlay phase an item's painting counts toward
+# -----------------------------
+def paint_group(key):
+    # Disks have integer keys; the pointer is drawn with them
+    return 'text' if isinstance(key, str) and key != 'ptr' else 'disks'
+
+# -----------------------------
+# Function: overlay_items
+# Purpose: O key - frame time, FPS, phase split and object counts
+# -----------------------------
+def overlay_items():
+    """
+    Two lines along the bottom of the window. Like the auto-solve label
+    the text is rebuilt at most four times a second, so the overlay
+    doesn't flood the text cache or skew the timings it shows.
+    """
+    global overlay_lines, overlay_at
+    now = time.perf_counter()
+    summary = frame_stats.summary()
+    if summary and now - overlay_at >= 0.25:
+        overlay_at = now
+        phases = ' '.join(f"{name} {ms:.2f}" for name, ms in summary['phases_ms'].items())
+        status = ' [profiling]' if profiler.active else (f' [{last_profile}]' if last_profile else '')
+        overlay_lines = (
+            f"FPS {frame_stats.fps():2d}  frame {summary['last_ms']:.2f} ms  avg {summary['avg_ms']:.2f}"
+            f"  max {summary['max_ms']:.2f}  disks {n_disks}  items {len(renderer.drawn)}"
+            f"  texts {len(text_cache.surfaces)}",
+            f"avg ms: {phases}{status}",
+        )
+    return [
+        text_item('perf1', overlay_lines[0], (320, 446), 'mono', 13, BLACK),
+        text_item('perf2', overlay_lines[1], (320, 461), 'mono', 13, BLACK),
+    ]
+
+# -----------------------------
+# Functions: start_profile / finish_profile
+# Purpose: P key - cProfile capture of the next frames
+# -----------------------------
+def start_profile():
+    if profiler.active:
+        return
+    profiler.start(profile_frames)
+    scheduler.start_animation()     # keep frames coming while capturing
+    perf_log.info("Profiling the next %d frames", profile_frames)
+
+def finish_profile(result):
+    """Log a finished capture (result from FrameProfiler.frame_done/stop)."""
+    global last_profile
+    scheduler.stop_animation()
+    path, summary = result
+    last_profile = os.path.basename(path)
+    if profiler.captured < profiler.frames:
+        perf_log.info("Profile stopped early: %d of %d frames", profiler.captured, profiler.frames)
+    perf_log.info("Profile of %d frames saved to %s\n%s", profiler.captured, path, summary)
+
+# -----------------------------
+# Functions: start_auto_solve / stop_auto_solve / auto_solve_frame
+# Purpose: A key playback of the optimal solution
+# -----------------------------
+def start_auto_solve():
+    """Restart the board and play the optimal solution, time-compressed."""
+    global autosolver, state, steps, floating, floater, off_by, auto_label_at, hint_text
+    autosolver = AutoSolver(n_disks, n_pegs)
+    hint_text = ''
+    state = autosolver.state
+    steps = off_by = 0
+    floating = False
+    floater = 0
+    auto_label_at = 0.0
+    sync_disks()
+    scheduler.start_animation()
+    log.info("Auto-solve started: %d moves at %.0f moves/s", autosolver.total, autosolver.rate)
+
+def stop_auto_solve():
+    """End the playback and give the player a fresh board."""
+    global autosolver, steps
+    if autosolver is None:
+        return
+    if not autosolver.finished:
+        scheduler.stop_animation()
+    autosolver = None
+    steps = 0
+    make_disks()
+    renderer.invalidate()
+    log.info("Auto-solve stopped")
+
+def auto_solve_frame():
+    """
+    Advance the playback to the current time and move the disk rects.
+    Runs once per displayed frame however many moves that covers; the
+    HUD text only changes a few times a second so the text cache is
+    not flooded with one-off labels.
+    """
+    global state, steps, auto_label, auto_label_at
+    if autosolver.finished:
+        return
+    if autosolver.advance():
+        state = autosolver.state
+        steps = autosolver.done
+        sync_disks()
+    now = time.perf_counter()
+    if autosolver.finished:
+        scheduler.stop_animation()
+        auto_label = f"Auto-solved {autosolver.total:,} moves in {autosolver.elapsed():.1f}s"
+        log.info(auto_label)
+    elif now - auto_label_at >= 0.25 or not auto_label_at:
+        auto_label_at = now
+        auto_label = f"Auto-solve: {autosolver.moves_per_sec():,.0f} moves/s  (+/- speed)"
+
+# -----------------------------
+# Function: show_hint
+# Purpose: H key - best next move and moves left, from the hint table
+# -----------------------------
+def show_hint():
+    """
+    Looks the current board up in the precomputed table (one array
+    read). Without a table, 3-peg games fall back to the engine's O(n)
+    evaluation; other games ask for the table to be built. Challenges
+    are planned directly against their target board.
+    """
+    global hint_table, hint_text
+    if hint_table is None and not challenge:
+        import hints            # NumPy is only loaded once a hint is asked for
+        hint_table = hints.open_table(n_disks, n_pegs) or False
+    if challenge:
+        distance, best = plan_between(state.locations(), challenge[1])
+    elif hint_table:
+        distance, best = hint_table.lookup(state.locations())
+    elif n_pegs == 3:
+        distance, best = state.distance_to_goal(), state.best_move()
+    else:
+        hint_text = f"No hint table: run python hints.py --pegs {n_pegs}"
+        return
+    if best is None:
+        hint_text = 'Solved!'
+    else:
+        names = {0: 'Start', n_pegs-1: 'Finish'}
+        src, dst = (names.get(peg, f'Tower {peg+1}') for peg in best)
+        hint_text = f"Hint: {src} -> {dst} ({distance} moves left)"
+    log.info(hint_text)
+
+# -----------------------------
+# Functions: parse_challenge / board_text
+# Purpose: --challenge=START:TARGET boards as peg digit strings
+# -----------------------------
+def parse_challenge(text):
+    """Return (start, target, optimal moves), or None if malformed."""
+    try:
+        start, target = (tuple(int(p) for p in board) for board in text.split(':'))
+    except ValueError:
+        log.warning("Ignoring malformed challenge '%s'", text)
+        return None
+    if len(start) != len(target) or not start or any(p not in (0, 1, 2) for p in start + target):
+        log.warning("Ignoring malformed challenge '%s'", text)
+        return None
+    return start, target, plan_between(start, target)[0]
+
+def board_text(board):
+    return ''.join(map(str, board))
+
+# -----------------------------
+# Function: int_option
+# Purpose: Whole-number value of a --name=N option, clamped to [low, high]
+# -----------------------------
+def int_option(option, default, low, high=None):
+    """Return the clamped value, or `default` if it isn't a number."""
+    name, _, text = option.partition('=')
+    try:
+        value = int(text)
+    except ValueError:
+        log.warning("Ignoring %s: '%s' is not a number, using %d", name, text, default)
+        return default
+    return max(low, value if high is None else min(high, value))
 
 # -----------------------------
 # Function: check_won
 # Purpose: Check if all disks are at last tower
 # -----------------------------
 def check_won():
-    over = all(disk['tower']==2 for disk in disks)
-    if over:
-        print("All disks at finish tower! Game over.")
+    if (state.locations() == challenge[1]) if challenge else state.is_won():
+        log.info("All disks at finish tower! Game over.")
         time.sleep(0.2)
         game_over()
 
@@ -233,8 +540,11 @@ def check_won():
 # -----------------------------
 def game_over():
     global steps
+    if profiler.active:
+        finish_profile(profiler.stop())
+    reporter = report_result()
     screen.fill(WHITE)
-    min_steps = 2**n_disks-1
+    min_steps = challenge[2] if challenge else min_moves_pegs(n_disks, n_pegs)
     # Title shadow
     blit_text(screen, 'You Won!', (322, 202), font_name='sans serif', size=72, color=GOLD)
     blit_text(screen, 'You Won!', (320, 200), font_name='sans serif', size=72, color=GOLD)
@@ -244,126 +554,326 @@ def game_over():
     if min_steps==steps:
         blit_text(screen, 'You finished in minimum steps!', (320, 300), font_name='mono', size=26, color=GREEN)
     pygame.display.flip()
-    print(f"Game Over! Steps taken: {steps}, Minimum: {min_steps}")
-    time.sleep(2)
-    
+    announcer.say("You won!")
+    if min_steps==steps:
+        announcer.say("You finished in minimum steps!")
+    log.info("Game Over! Steps taken: %d, Minimum: %d", steps, min_steps)
+    perf_log.info("Text cache: %s", text_cache.stats())
+    perf_log.info("Renderer: %s", renderer.stats())
+    perf_log.info("Scheduler: %s", scheduler.stats())
+    # Speech and the result upload run in parallel; carry on once both are done
+    announcer.close(timeout=2)
+    reply = reporter.wait(timeout=REPORT_TIMEOUT)
+    if reply:
+        log.info("Result delivered to server (%d attempt(s))", reporter.attempts)
+        query = {'username': username, 'disks': n_disks, 'moves': steps, 'pegs': n_pegs,
+                 'result': reply.get('id', '')}
+    else:
+        # Not delivered: the Game Over page submits the replay instead,
+        # under the same id in case a late attempt still gets through.
+        # Timing is left out so the URL stays ~3 bits per move.
+        log.warning("Could not deliver result to %s -> %s", server_url, reporter.error)
+        query = {'username': username, 'disks': n_disks, 'moves': steps, 'pegs': n_pegs,
+                 'result': reporter.id, 'replay': to_base64(replay_log, timed=False)}
+        if challenge:
+            query['challenge'] = f"{board_text(challenge[0])}:{board_text(challenge[1])}"
+
     # Open Flask game_over page
-    try:
-        webbrowser.open(f"http://127.0.0.1:5000/game_over?username={username}&disks={n_disks}&moves={steps}")
-        print("Opened Play Again page in browser")
-    except:
-        print("Could not open browser page. Make sure Flask server is running.")
+    if open_browser:
+        try:
+            webbrowser.open(f"{server_url}/game_over?{urllib.parse.urlencode(query)}")
+            log.info("Opened Play Again page in browser")
+        except:
+            log.warning("Could not open browser page. Make sure Flask server is running.")
     
     pygame.quit()
     sys.exit()
 
+# -----------------------------
+# Function: report_result
+# Purpose: Send the result and replay to the server in the background
+# -----------------------------
+REPORT_TIMEOUT = 5.0    # longest the game waits for the server to acknowledge
+
+def report_result():
+    payload = {
+        'username': username,
+        'disks': n_disks,
+        'pegs': n_pegs,
+        'moves': steps,
+        'replay': to_base64(replay_log),
+        'challenge': f"{board_text(challenge[0])}:{board_text(challenge[1])}" if challenge else None,
+    }
+    return ResultReporter(f"{server_url}/api/results", payload)
+
 # -----------------------------
 # Function: reset
 # Purpose: Reset game variables and go to menu
 # -----------------------------
 def reset():
-    global steps, pointing_at, floating, floater
+    global steps, pointing_at, floating, floater, lifted_from, off_by
     steps = 0
+    off_by = 0
     pointing_at = 0
     floating = False
     floater = 0
-    menu_screen()
+    lifted_from = 0
+    stop_auto_solve()
+    if not challenge:       # a challenge restarts from its own start board
+        menu_screen()
+    layout_towers()
     make_disks()
-    print("Game reset to menu")
+    renderer.invalidate()
+    log.info("Game reset to menu")
 
 # -----------------------------
 # Function: handle_key_up
 # Purpose: Pick up top disk from current tower
 # -----------------------------
 def handle_key_up():
-    global floating, floater
-    for disk in disks[::-1]:
-        if disk['tower'] == pointing_at:
-            floating = True
-            floater = disks.index(disk)
-            disk['rect'].midtop = (towers_midx[pointing_at], 100)
-            print(f"Picked up disk {floater} from tower {pointing_at}")
-            break
+    global floating, floater, lifted_from
+    disk = state.top(pointing_at)
+    if disk:
+        floating = True
+        floater = disk
+        lifted_from = pointing_at
+        disks[disk].midtop = (towers_midx[pointing_at], 100)
+        move_log.debug("Picked up disk %d from tower %d", floater, pointing_at)
 
 # -----------------------------
 # Function: handle_key_down
 # Purpose: Place the floating disk onto target tower
 # -----------------------------
 def handle_key_down():
-    global floating, floater, steps
-    for disk in disks[::-1]:
-        if disk['tower'] == pointing_at and disks.index(disk) != floater:
-            if disk['val'] > disks[floater]['val']:
-                floating = False
-                disk_top = disk['rect'].top
-                disks[floater]['rect'].midtop = (towers_midx[pointing_at], disk_top-23)
-                disks[floater]['tower'] = pointing_at
-                steps += 1
-                print(f"Placed disk {floater} on tower {pointing_at} on top of disk {disks.index(disk)}")
-            break
-    else:
+    global floating, floater, steps, off_by, last_move_at, hint_text
+    if pointing_at == lifted_from:
+        # Putting a disk back where it came from is not a move
+        floating = False
+        place_disk(floater, pointing_at, state.height(pointing_at)-1)
+        move_log.debug("Put disk %d back on tower %d", floater, pointing_at)
+    elif state.can_move(lifted_from, pointing_at):
+        below = state.top(pointing_at)
+        state.move(lifted_from, pointing_at)
+        now = time.perf_counter()
+        replay_log.add(lifted_from, pointing_at, (now - last_move_at) * 1000)
+        last_move_at = now
         floating = False
-        disks[floater]['rect'].midtop = (towers_midx[pointing_at], 400-23)
-        disks[floater]['tower'] = pointing_at
-        steps += 1
-        print(f"Placed disk {floater} on empty tower {pointing_at}")
+        steps = state.steps
+        hint_text = ''
+        if challenge:
+            off_by = steps + plan_between(state.locations(), challenge[1])[0] - challenge[2]
+        elif hint_table:
+            off_by = steps + hint_table.lookup(state.locations())[0] - hint_table.min_moves
+        elif n_pegs == 3:
+            off_by = steps + state.distance_to_goal() - min_moves_pegs(n_disks)
+        place_disk(floater, pointing_at, state.height(pointing_at)-1)
+        if below:
+            move_log.debug("Placed disk %d on tower %d on top of disk %d", floater, pointing_at, below)
+        else:
+            move_log.debug("Placed disk %d on empty tower %d", floater, pointing_at)
 
 # =============================
-# Start Game
+# Function: main
+# Purpose: Start the game; argv is [name, disks, --options...]
 # =============================
+def main(argv=None):
+    """
+    Runs the game until the window is closed or the game is won.
+    Kept out of module level so the game can be imported (e.g. by the
+    pre-warmed launcher workers) without opening a window.
+    """
+    global screen, renderer, announcer, username, n_disks, n_pegs, launched_by_flask, challenge
+    global server_url, open_browser, profile_frames, show_overlay
+    global game_done, pointing_at
+    if argv is None:
+        argv = sys.argv[1:]
 
-# Only show menu if NOT started via Flask
-if len(sys.argv) < 3:
-    menu_screen()
+    # -----------------------------
+    # Initialization
+    # -----------------------------
+    startup.restart_phase()
+    logs.configure()
+    pygame.init()
+    pygame.display.set_caption("Towers of Hanoi")
+    screen = pygame.display.set_mode((640, 480))
+    startup.mark('pygame_init')
+
+    # -----------------------------
+    # User Input Arguments
+    # -----------------------------
 
-make_disks()
+    # Options come as --flags after the positional arguments:
+    #   --no-voice           turn off text-to-speech
+    #   --timing-file=PATH   also write startup timing as JSON
+    #   --pegs=K             play on K towers instead of 3
+    #   --challenge=S:T      start from board S and finish on board T
+    #                        (peg digits, smallest disk first, e.g. 0120:2001)
+    #   --server=URL         Flask app to report the result to
+    #   --no-browser         don't open the Game Over page when the game is won
+    #   --profile-frames=N   frames captured by the P key profiler (default 120)
+    args = [arg for arg in argv if not arg.startswith('--')]
+    options = [arg for arg in argv if arg.startswith('--')]
+    voice_enabled = '--no-voice' not in options
+    open_browser = '--no-browser' not in options
+    timing_file = None
+    for option in options:
+        if option.startswith('--timing-file='):
+            timing_file = option.split('=', 1)[1]
+        if option.startswith('--pegs='):
+            n_pegs = int_option(option, 3, 3, MAX_PEGS)
+        if option.startswith('--challenge='):
+            challenge = parse_challenge(option.split('=', 1)[1])
+        if option.startswith('--server='):
+            server_url = option.split('=', 1)[1].rstrip('/')
+        if option.startswith('--profile-frames='):
+            profile_frames = int_option(option, 120, 1)
 
-# =============================
-# Main Game Loop
-# =============================
-while not game_done:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            game_done = True
-            print("Quit via window close")
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
-                reset()
-            if event.key == pygame.K_q:
-                game_done = True
-                print("Quit via Q key")
-            if event.key == pygame.K_RIGHT:
-                pointing_at = (pointing_at+1)%3
-                if floating:
-                    disks[floater]['rect'].midtop = (towers_midx[pointing_at], 100)
-                    disks[floater]['tower'] = pointing_at
-                    print(f"Moved floating disk {floater} to tower {pointing_at}")
-            if event.key == pygame.K_LEFT:
-                pointing_at = (pointing_at-1)%3
-                if floating:
-                    disks[floater]['rect'].midtop = (towers_midx[pointing_at], 100)
-                    disks[floater]['tower'] = pointing_at
-                    print(f"Moved floating disk {floater} to tower {pointing_at}")
-            if event.key == pygame.K_UP and not floating:
-                handle_key_up()
-            if event.key == pygame.K_DOWN and floating:
-                handle_key_down()
+    # Check if Flask passed arguments
+    launched_by_flask = len(args) >= 2
+    if launched_by_flask:
+        username = args[0]               # player name from form
+        n_disks = int(args[1])           # number of disks from form
+    else:
+        # fallback if running manually
+        username = input("Enter your name: ") or "Guest"
     
+        while not challenge:
+            try:
+                n_disks = int(input(f"Enter number of disks (3-{MENU_MAX_DISKS}): "))
+                if 3 <= n_disks <= MENU_MAX_DISKS:
+                    break
+                print(f"Please enter a number between 3 and {MENU_MAX_DISKS}.")
+            except:
+                print("Invalid input, enter a number.")
+
+    if challenge and n_pegs != 3:
+        log.warning("Challenge ignored: challenges are played on 3 pegs")
+        challenge = None
+    if challenge:
+        n_disks = len(challenge[0])      # the boards fix the disk count
+    log.info("Starting Tower of Hanoi for %s with %d disks on %d pegs", username, n_disks, n_pegs)
+    if challenge:
+        log.info("Challenge: %s -> %s, best possible %d moves",
+                 board_text(challenge[0]), board_text(challenge[1]), challenge[2])
+    startup.mark('arguments')
+
     # -----------------------------
-    # Draw Everything
+    # Audio Setup
     # -----------------------------
-    screen.fill(WHITE)
-    draw_towers()
-    draw_disks()
-    draw_ptr()
-    blit_text(screen, 'Steps: '+str(steps), (320, 20), font_name='mono', size=30, color=BLACK)
+    # Speech runs on a background thread; pyttsx3 is only imported there
+    announcer = Announcer(voice_enabled, on_ready=lambda secs: startup.record('tts_engine_init', secs))
+    announcer.say("Enjoy Tower of Hanoi Game!!!")
+    startup.mark('tts_init')
+
+    # =============================
+    # Start Game
+    # =============================
+
+    # Only show menu if NOT started via Flask (or for a challenge)
+    if not launched_by_flask and not challenge:
+        menu_screen()
+
+    layout_towers()
+    make_disks()
+    renderer = DirtyRenderer(screen, make_background(), group=paint_group)
+
+    # =============================
+    # Main Game Loop
+    # =============================
+    while not game_done:
+        # Phases are timed for the O key overlay; waiting for input is not
+        frame_stats.begin()
+
+        # Auto-solve moves are simulated against the clock, not per frame
+        if autosolver is not None:
+            auto_solve_frame()
+        frame_stats.mark('logic')
+
+        # -----------------------------
+        # Draw Everything (only what changed)
+        # -----------------------------
+        items = frame_items()
+        if show_overlay:
+            items += overlay_items()
+        frame_stats.mark('text')
+        rendered = bool(renderer.render(items))
+        # The renderer says how its time splits: towers (background
+        # restore), disks, text labels and the display update
+        frame_stats.mark('disks')
+        frame_stats.shift('disks', 'towers', renderer.background_seconds)
+        frame_stats.shift('disks', 'text', renderer.paint_seconds.get('text', 0.0))
+        frame_stats.shift('disks', 'flip', renderer.update_seconds)
+        scheduler.frame_done(rendered)
+        if 'first_frame' not in startup.phases:
+            startup.mark('first_frame')
+            perf_log.info("Startup timing: %s", startup.report())
+            if timing_file:
+                startup.export(timing_file)
     
-    # Check win condition if no disk floating
-    if not floating:
-        check_won()
+        # Check win condition if no disk floating (auto-solves are not scored)
+        if not floating and autosolver is None:
+            check_won()
+        frame_stats.mark('logic')
     
-    pygame.display.flip()
-    clock.tick(framerate)
+        # Wait for input (blocks while idle)
+        events = scheduler.events()
+        frame_stats.skip()
+        for event in events:
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                renderer.invalidate()
+            if event.type == pygame.QUIT:
+                game_done = True
+                log.info("Quit via window close")
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    reset()
+                if event.key == pygame.K_q:
+                    game_done = True
+                    log.info("Quit via Q key")
+                if event.key == pygame.K_RIGHT:
+                    pointing_at = (pointing_at+1)%n_pegs
+                    if floating:
+                        disks[floater].midtop = (towers_midx[pointing_at], 100)
+                        move_log.debug("Moved floating disk %d to tower %d", floater, pointing_at)
+                if event.key == pygame.K_LEFT:
+                    pointing_at = (pointing_at-1)%n_pegs
+                    if floating:
+                        disks[floater].midtop = (towers_midx[pointing_at], 100)
+                        move_log.debug("Moved floating disk %d to tower %d", floater, pointing_at)
+                if event.key == pygame.K_o:
+                    show_overlay = not show_overlay
+                if event.key == pygame.K_p:
+                    start_profile()
+                if event.key == pygame.K_a and not challenge:
+                    if autosolver is None:
+                        start_auto_solve()
+                    else:
+                        stop_auto_solve()
+                if autosolver is not None:
+                    # The board belongs to the playback until it is stopped
+                    if event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                        autosolver.faster()
+                    if event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                        autosolver.slower()
+                    continue
+                if event.key == pygame.K_h:
+                    show_hint()
+                if event.key == pygame.K_UP and not floating:
+                    handle_key_up()
+                if event.key == pygame.K_DOWN and floating:
+                    handle_key_down()
+        frame_stats.mark('events')
+        frame_stats.end(rendered)
+        result = profiler.frame_done()
+        if result:
+            finish_profile(result)
+
+    if profiler.active:
+        finish_profile(profiler.stop())
+
+
+if __name__ == '__main__':
+    main()
 
 # ===============================================
 # END OF GAME CODE
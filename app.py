@@ -8,15 +8,176 @@
 # -------------------
 # Import dependencies
 # -------------------
-from flask import Flask, render_template, request, redirect, url_for
-import subprocess
-import sys
+from flask import Flask, render_template, request, redirect, url_for, jsonify
+import threading
 import os
+import hashlib
+from engine import HanoiState, MAX_DISKS
+from solver import min_moves, MAX_PEGS
+from launcher import GamePool
+from sessions import SessionStore
+from results import ResultsStore
+from feedback_log import FeedbackWriter
+from verify import verify_replay, verify_batch, BatchTooLarge
+import hints
+import challenges
+from web_cache import PageCache, StaticAssets
+from result_channel import ResultInbox
+import metrics
+import logs
 
 # -------------------
 # Initialize Flask app
 # -------------------
 app = Flask(__name__)
+# Where launched games report their results: the dev server's address
+# below, or the one serve.py bound; never a request's Host header.
+# HANOI_SERVER_URL overrides it.
+app.config['SERVER_URL'] = os.environ.get('HANOI_SERVER_URL', 'http://127.0.0.1:5000')
+
+# -------------------
+# Logging
+# -------------------
+# Queue-buffered, leveled loggers (see logs.py). Page banners are DEBUG;
+# turn them on with HANOI_LOG_LEVELS=web.pages=DEBUG.
+logs.configure()
+log = logs.get_logger('web')
+page_log = logs.get_logger('web.pages')
+
+# -------------------
+# Response caching
+# -------------------
+# CSS is served from content-hashed /assets/ URLs (asset_url() in
+# templates) and pages with fixed output are rendered once, both
+# stored precompressed.
+static_assets = StaticAssets(app)
+page_cache = PageCache(app, static_assets)
+CACHED_PAGES = ('index.html', 'about.html', 'tips.html')
+
+# -------------------
+# Game launcher pool
+# -------------------
+# Games run on pre-warmed worker processes. Sizes can be set with
+# HANOI_POOL_WARM, HANOI_MAX_GAMES and HANOI_MAX_QUEUE.
+game_pool = None
+game_pool_lock = threading.Lock()
+
+
+def get_game_pool():
+    """Create the launcher pool on first use (not in the reloader parent)."""
+    global game_pool
+    with game_pool_lock:
+        if game_pool is None:
+            game_pool = GamePool(
+                warm=int(os.environ.get('HANOI_POOL_WARM', 2)),
+                max_games=int(os.environ.get('HANOI_MAX_GAMES', 8)),
+                max_queue=int(os.environ.get('HANOI_MAX_QUEUE', 16)),
+                on_started=launch_latency.observe
+            ).start()
+    return game_pool
+
+# -------------------
+# Hosted game sessions
+# -------------------
+# Games played through the JSON API live here. Idle sessions are
+# dropped after HANOI_SESSION_TTL seconds (default 30 minutes).
+session_store = SessionStore(ttl=float(os.environ.get('HANOI_SESSION_TTL', 1800)))
+
+# -------------------
+# Results store (leaderboard)
+# -------------------
+# Finished games are saved to SQLite (HANOI_DB, default hanoi.db next to
+# this file) in background batches; /stats reads are served from a cache.
+results_store = ResultsStore(
+    os.environ.get('HANOI_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hanoi.db'))
+)
+
+
+def record_result(player_name, replay, key=None):
+    """
+    Verify a game's replay and queue it for the leaderboard.
+    Disks and moves come from replaying the log, never from the query
+    string, so forged results are not recorded. `key` identifies the
+    game (default: a hash of player and replay), so reloading the
+    game-over page or a repeated report doesn't record it twice.
+    Returns the VerifyResult.
+    """
+    if not replay:
+        log.warning("⚠ No replay from '%s', result not recorded.", player_name)
+        return None
+    result = verify_replay(replay)
+    if not result.ok:
+        log.warning("⚠ Replay from '%s' rejected: %s", player_name, result.reason)
+        return result
+    if key is None:
+        key = hashlib.sha256(f"{player_name}\n{replay}".encode('utf-8')).hexdigest()
+    results_store.record(player_name, result.n_disks, result.moves, pegs=result.n_pegs, key=key)
+    return result
+
+
+def ingest_result(payload):
+    """
+    Handle a result POSTed by a finished game (runs on the inbox thread).
+    Challenge games start from other boards and are not ranked. The
+    game's result id is the leaderboard key, so a retried POST and the
+    game-over page's replay fallback record the game once between them.
+    """
+    player_name = str(payload.get('username') or 'Guest')
+    if payload.get('challenge'):
+        log.info("🧩 Challenge %s finished by '%s' in %s moves", payload['challenge'], player_name, payload.get('moves'))
+        return None
+    return record_result(player_name, payload.get('replay'), key=payload['id'])
+
+# -------------------
+# Result channel
+# -------------------
+# Games POST their result and replay to /api/results when they end;
+# the inbox verifies and records them off the request path.
+result_inbox = ResultInbox(ingest_result)
+
+# -------------------
+# Feedback ingestion
+# -------------------
+# Feedback is queued and appended in batches by a background thread to
+# HANOI_FEEDBACK_LOG (default feedback.jsonl next to this file), rotated at 10 MB.
+feedback_writer = FeedbackWriter(
+    os.environ.get('HANOI_FEEDBACK_LOG',
+                   os.path.join(os.path.dirname(os.path.abspath(__file__)), 'feedback.jsonl'))
+)
+
+# -------------------
+# Metrics (/metrics, Prometheus text format)
+# -------------------
+# Every route is counted and timed by request hooks; the launcher pool,
+# result channel and caches are read when /metrics is scraped.
+registry = metrics.Registry()
+metrics.instrument(app, registry)
+launches = registry.counter('hanoi_game_launches_total', 'Game launch requests by outcome', ('status',))
+launch_latency = registry.histogram('hanoi_game_launch_seconds',
+                                    'Time from a launch request until the game process is running')
+
+
+def pool_stat(key):
+    """Launcher pool figure for /metrics, or None before the pool exists."""
+    return None if game_pool is None else game_pool.stats()[key]
+
+
+registry.collect('hanoi_games_running', 'Game processes currently running', lambda: pool_stat('running'))
+registry.collect('hanoi_games_queued', 'Launches waiting for a free slot', lambda: pool_stat('queued'))
+registry.collect('hanoi_game_workers_idle', 'Pre-warmed workers ready for a game', lambda: pool_stat('warm_idle'))
+registry.collect('hanoi_game_workers_booting', 'Workers still importing the game', lambda: pool_stat('booting'))
+registry.collect('hanoi_game_pool_healthy', '0 once game workers keep failing to boot',
+                 lambda: None if game_pool is None else int(game_pool.healthy))
+registry.collect('hanoi_hosted_sessions', 'Live games on the session API', lambda: len(session_store))
+registry.collect('hanoi_results_received_total', 'Results reported by games',
+                 lambda: result_inbox.received, kind='counter')
+registry.collect('hanoi_results_queued', 'Results waiting to be verified', lambda: result_inbox.queue.qsize())
+registry.collect('hanoi_feedback_queued', 'Feedback records waiting to be written',
+                 lambda: feedback_writer.queue.qsize())
+registry.collect('hanoi_page_cache_hits_total', 'Pages served from the render cache',
+                 lambda: page_cache.hits, kind='counter')
+registry.collect('hanoi_log_records_dropped_total', 'Log records dropped because the queue was full',
+                 lambda: logs.stats()['dropped'], kind='counter')
 
 # ==============================================
 # ROUTES DEFINITIONS
@@ -31,8 +192,7 @@ def index():
     Render the main home page.
     This is the landing screen where player can enter name and disk count.
     """
-    print("\n📌 Rendering: index.html (Home Page)\n")
-    return render_template('index.html')
+    return page_cache.render('index.html', banner="📌 Rendering: index.html (Home Page)")
 
 
 # -------------------
@@ -41,26 +201,60 @@ def index():
 @app.route('/start_game', methods=['POST'])
 def start_game():
     """
-    Starts the Tower of Hanoi game using subprocess.
+    Starts the Tower of Hanoi game on a pre-warmed launcher worker.
     Accepts player details and launches the Python game file.
     """
     player_name = request.form.get('playerName')
     disks = request.form.get('disks')
+    pegs = request.form.get('pegs', 3, type=int)
+    mode = request.form.get('mode', 'classic')
 
     # Input validation
     if not player_name or not disks:
-        print("⚠ Missing player details. Redirecting to Home.")
+        log.warning("⚠ Missing player details. Redirecting to Home.")
+        return redirect(url_for('index'))
+    try:
+        HanoiState(int(disks))
+    except ValueError:
+        log.warning("⚠ Invalid disk count '%s'. Redirecting to Home.", disks)
+        return redirect(url_for('index'))
+    if pegs is None or not 3 <= pegs <= MAX_PEGS:
+        log.warning("⚠ Invalid peg count '%s'. Redirecting to Home.", request.form.get('pegs'))
         return redirect(url_for('index'))
 
-    # Prepare script path and execute
-    script_path = os.path.abspath('Towerofhanoi.py')
+    # Challenge modes draw a puzzle from the pre-generated index in O(1)
+    # Games report back to the server that launched them
+    extra = [f"--server={app.config['SERVER_URL']}"]
+    if mode != 'classic':
+        tier = challenges.DAILY_TIER if mode == 'daily' else mode
+        index = challenges.open_index(int(disks), tier) if tier in challenges.TIERS and pegs == 3 else None
+        if index is None:
+            log.warning("⚠ No '%s' challenges for %s disks on %d pegs. Starting a classic game.", mode, disks, pegs)
+        else:
+            puzzle = index.daily() if mode == 'daily' else index.random()
+            extra.append(f"--challenge={challenges.board_text(puzzle.start)}:"
+                         f"{challenges.board_text(puzzle.target)}")
+            log.info("🧩 %s challenge #%d (%d moves) for '%s'", mode.title(), puzzle.index, puzzle.optimal, player_name)
+
+    if not app.config.get('LAUNCH_GAMES', True):
+        # Load testing (serve.py --no-launch): everything but the game window
+        launches.inc('disabled')
+        return redirect(url_for('index'))
 
     try:
-        # Launch the game window
-        subprocess.Popen([sys.executable, script_path, player_name, disks], shell=True)
-        print(f"\n🎮 Game started successfully for player '{player_name}' with {disks} disks.\n")
+        # Hand the game to a pre-warmed worker
+        status = get_game_pool().submit(player_name, int(disks), pegs, extra)
+        launches.inc(status)
+        if status == 'started':
+            log.info("🎮 Game started successfully for player '%s' with %s disks on %d pegs.", player_name, disks, pegs)
+        elif status == 'queued':
+            log.info("⏳ Game for player '%s' queued until a slot is free.", player_name)
+        elif status == 'unavailable':
+            log.error("⚠ Game workers are failing to start, launch for '%s' refused.", player_name)
+        else:
+            log.warning("⚠ Too many games running, launch for '%s' rejected.", player_name)
     except Exception as e:
-        print(f"⚠ Error launching TowerofHanoi.py -> {e}")
+        log.error("⚠ Error launching TowerofHanoi.py -> %s", e)
 
     # Redirect to home or waiting screen
     return redirect(url_for('index'))
@@ -76,7 +270,7 @@ def game_over_page():
     Includes Play Again and Go Home navigation options.
     Dynamically passes last player's stats to the template for View Stats form.
     """
-    print("\n🏁 Rendering: Game Over Screen\n")
+    page_log.debug("🏁 Rendering: Game Over Screen")
 
     # Use query parameters sent by Towerofhanoi.py
     player_name = request.args.get('username', 'Guest')
@@ -87,6 +281,20 @@ def game_over_page():
     # Determine if feedback form should be shown
     show_feedback_form = True if feedback_status is None else False
 
+    # First arrival from the game. Results sent over the result channel
+    # are already queued for the leaderboard; show their verified numbers.
+    # Otherwise verify the replay in the URL and save it here under the
+    # game's result id (challenge games start from other boards and are
+    # not ranked). Either way a game is only stored once.
+    result_id = request.args.get('result') or None
+    if feedback_status is None:
+        result = result_inbox.get(result_id, timeout=2) if result_id else None
+        replay = request.args.get('replay')
+        if result is None and (replay or not result_id) and not request.args.get('challenge'):
+            result = record_result(player_name, replay, key=result_id)
+        if result is not None and result.ok:
+            disks_count, total_moves = result.n_disks, result.moves
+
     return render_template(
         'game_over.html',
         show_play_again=not show_feedback_form,  # only show play again if feedback given or skipped
@@ -117,14 +325,12 @@ def feedback():
 
         if user_feedback:
             feedback_status = "Yes"
-            print("\n💬 Feedback Received from Player:")
-            print("----------------------------------")
-            print(user_feedback)
-            print("----------------------------------\n")
+            # Queued for the background writer; no terminal or disk I/O here
+            feedback_writer.submit(player_name, disks, moves, user_feedback)
             message = "✅ Feedback submitted successfully! Thank you for your response."
         else:
             feedback_status = "No"
-            print("\nℹ Feedback form submitted empty or skipped by player.\n")
+            log.info("ℹ Feedback form submitted empty or skipped by player.")
             message = "ℹ You skipped feedback submission."
 
         # Redirect to Game Over page with feedback processed
@@ -135,7 +341,7 @@ def feedback():
                                 feedback=feedback_status))
 
     # GET request renders the feedback form
-    print("\n📝 Rendering: feedback.html\n")
+    page_log.debug("📝 Rendering: feedback.html")
     return render_template('feedback.html', message=None)
 
 
@@ -148,7 +354,7 @@ def skip_feedback():
     Route triggered when player chooses to skip feedback.
     Returns Game Over page with replay options enabled.
     """
-    print("\nℹ Player skipped feedback voluntarily.\n")
+    log.info("ℹ Player skipped feedback voluntarily.")
 
     player_name = request.args.get('username', 'Guest')
     disks_count = request.args.get('disks', 3)
@@ -171,8 +377,7 @@ def about_page():
     Renders the About page which describes the project,
     tools used, and developer details.
     """
-    print("\n📄 Rendering: about.html (About Page)\n")
-    return render_template('about.html')
+    return page_cache.render('about.html', banner="📄 Rendering: about.html (About Page)")
 
 
 # -------------------
@@ -184,8 +389,7 @@ def tips_page():
     Displays a visually rich 'Gameplay Tips' page.
     Offers hints, strategies, and logic-building advice.
     """
-    print("\n💡 Rendering: tips.html (Gameplay Tips Page)\n")
-    return render_template('tips.html')
+    return page_cache.render('tips.html', banner="💡 Rendering: tips.html (Gameplay Tips Page)")
 
 
 # -------------------
@@ -197,21 +401,34 @@ def stats_page():
     Renders a statistics page displaying player scores.
     - POST: Receives player stats from game completion and displays dynamically.
     - GET: Shows placeholder/default stats if no game has been played yet.
+    Both show the per-disk aggregates and the leaderboard for one
+    disk and peg count.
     """
-    print("\n📊 Rendering: stats.html (Player Stats Page)\n")
+    page_log.debug("📊 Rendering: stats.html (Player Stats Page)")
+
+    # Clamped, so odd query strings can't fill the leaderboard cache
+    board_disks = min(max(request.values.get('disks', type=int) or 3, 1), MAX_DISKS)
+    board_pegs = min(max(request.values.get('pegs', type=int) or 3, 3), MAX_PEGS)
+    leaderboard = {
+        'aggregates': results_store.aggregates(),
+        'leaderboard': results_store.leaderboard(board_disks, pegs=board_pegs),
+        'board_disks': board_disks,
+        'board_pegs': board_pegs,
+    }
 
     if request.method == 'POST':
         username = request.form.get('username')
         disks = request.form.get('disks')
         moves = request.form.get('moves')
         feedback = request.form.get('feedback') or "No"
-        print(f"📌 Stats Received -> Player: {username}, Disks: {disks}, Moves: {moves}, Feedback: {feedback}")
+        log.info("📌 Stats Received -> Player: %s, Disks: %s, Moves: %s, Feedback: %s", username, disks, moves, feedback)
         return render_template(
             'stats.html',
             username=username,
             disks=disks,
             moves=moves,
-            feedback=feedback
+            feedback=feedback,
+            **leaderboard
         )
 
     # GET request shows default placeholder stats
@@ -220,10 +437,204 @@ def stats_page():
         username=None,
         disks=None,
         moves=None,
-        feedback="No"
+        feedback="No",
+        **leaderboard
     )
 
 
+# -------------------
+# Launcher Stats
+# -------------------
+@app.route('/launcher')
+def launcher_stats():
+    """
+    Returns pool occupancy and launch latency of the game launcher as JSON.
+    Viewing it doesn't start the pool; before the first launch (or when
+    the server doesn't warm it) it only reports that.
+    """
+    if game_pool is None:
+        return jsonify({'started': False})
+    return jsonify(dict(game_pool.stats(), started=True))
+
+
+# -------------------
+# Game Session API
+# -------------------
+@app.route('/api/games', methods=['POST'])
+def create_game():
+    """
+    Creates a hosted game.
+    JSON body: {"username": str, "disks": int, "pegs": int (default 3)}.
+    Returns the new game state.
+    """
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify(error="Expected a JSON object"), 400
+    try:
+        session = session_store.create(str(data.get('username') or 'Guest'), int(data.get('disks', 3)),
+                                       int(data.get('pegs', 3)))
+    except (TypeError, ValueError) as e:
+        return jsonify(error=str(e)), 400
+    return jsonify(session.to_dict()), 201
+
+
+@app.route('/api/games/<game_id>')
+def get_game(game_id):
+    """
+    Returns the current state of a hosted game.
+    """
+    session = session_store.get(game_id)
+    if session is None:
+        return jsonify(error="Unknown or expired game"), 404
+    return jsonify(session.to_dict())
+
+
+@app.route('/api/games/<game_id>/moves', methods=['POST'])
+def move_game(game_id):
+    """
+    Moves the top disk of one tower onto another.
+    JSON body: {"from": int, "to": int}. Returns the updated game state.
+    """
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify(error="Expected {'from': int, 'to': int}"), 400
+    try:
+        session = session_store.move(game_id, int(data['from']), int(data['to']))
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify(error=f"Illegal move: {e}"), 400
+    if session is None:
+        return jsonify(error="Unknown or expired game"), 404
+    return jsonify(session.to_dict())
+
+
+# -------------------
+# Feedback Pipeline Stats
+# -------------------
+@app.route('/feedback/stats')
+def feedback_stats():
+    """
+    Returns queue depth, batch size and flush latency of the feedback writer as JSON.
+    """
+    return jsonify(feedback_writer.stats())
+
+
+# -------------------
+# Replay Verification API
+# -------------------
+# Per request: most replays, and most moves decoded across all of them
+# (2^20, about 2 MB of move arrays and well under a second of checking)
+MAX_VERIFY_REPLAYS = 1000
+MAX_VERIFY_MOVES = 1 << 20
+
+
+@app.route('/api/verify', methods=['POST'])
+def verify_replays():
+    """
+    Verifies a batch of replays.
+    JSON body: {"replays": [base64url, ...]}. Returns one result per replay
+    with ok, disks, pegs, the true move count and the rejection reason.
+    Batches over MAX_VERIFY_REPLAYS replays or MAX_VERIFY_MOVES moves get a 413.
+    """
+    data = request.get_json(silent=True)
+    replays = data.get('replays') if isinstance(data, dict) else None
+    if not isinstance(replays, list) or not all(isinstance(r, str) for r in replays):
+        return jsonify(error="Expected {'replays': [str, ...]}"), 400
+    if len(replays) > MAX_VERIFY_REPLAYS:
+        return jsonify(error=f"At most {MAX_VERIFY_REPLAYS} replays per request"), 413
+    try:
+        results = verify_batch(replays, max_total_moves=MAX_VERIFY_MOVES)
+    except BatchTooLarge:
+        return jsonify(error=f"At most {MAX_VERIFY_MOVES} moves per request"), 413
+    return jsonify(results=[
+        {'ok': r.ok, 'disks': r.n_disks, 'pegs': r.n_pegs, 'moves': r.moves, 'reason': r.reason}
+        for r in results
+    ])
+
+
+# -------------------
+# Game Result API
+# -------------------
+@app.route('/api/results', methods=['POST'])
+def report_result():
+    """
+    Receives the result of a finished game straight from the game process.
+    JSON body: {"id": str, "username": str, "replay": base64url, "challenge": "S:T" or null}.
+    Returns {"id": ...} at once; verification and saving happen in the background.
+    Sending the same id again (a retry) is acknowledged but not queued twice.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('replay', ''), str):
+        return jsonify(error="Expected {'username': str, 'replay': str}"), 400
+    result_id = result_inbox.submit(data)
+    if result_id is None:
+        return jsonify(error="Too many results waiting, try again"), 503
+    return jsonify(id=result_id), 202
+
+
+# -------------------
+# Board Evaluation API
+# -------------------
+@app.route('/evaluate')
+def evaluate():
+    """
+    Scores an arbitrary board against the optimal solution.
+    Query parameter 'pegs' lists the tower of every disk, smallest first
+    (e.g. ?pegs=0012). Returns the minimum moves left and the best next move.
+    """
+    pegs = request.args.get('pegs', '')
+    try:
+        state = HanoiState.from_locations([int(p) for p in pegs])
+    except ValueError:
+        return jsonify(error=f"Invalid board '{pegs}'"), 400
+
+    return jsonify(
+        disks=state.n_disks,
+        distance=state.distance_to_goal(),
+        best_move=state.best_move(),
+        min_moves=min_moves(state.n_disks)
+    )
+
+
+# -------------------
+# Hint API (precomputed tables)
+# -------------------
+@app.route('/hint')
+def hint():
+    """
+    Best next move and distance to the Finish tower from the hint table.
+    Query parameters: 'pegs' lists the tower of every disk, smallest first
+    (e.g. ?pegs=0012), 'towers' is the number of pegs (default 3) and
+    'moves' the moves played so far, used to report how far off the
+    optimal game the player is.
+    Tables are memory-mapped, so every worker shares one copy.
+    """
+    pegs = request.args.get('pegs', '')
+    towers = request.args.get('towers', 3, type=int)
+    moves = request.args.get('moves', type=int)
+    try:
+        if not 3 <= towers <= MAX_PEGS:
+            raise ValueError(towers)
+        state = HanoiState.from_locations([int(p) for p in pegs], goal=towers-1, n_pegs=towers)
+    except ValueError:
+        return jsonify(error=f"Invalid board '{pegs}' for {towers} pegs"), 400
+
+    table = hints.open_table(state.n_disks, towers)
+    if table is not None:
+        distance, best_move = table.lookup(state.locations())
+        optimal, source = table.min_moves, 'table'
+    elif towers == 3:
+        distance, best_move = state.distance_to_goal(), state.best_move()
+        optimal, source = min_moves(state.n_disks), 'engine'
+    else:
+        return jsonify(error=f"No hint table for {state.n_disks} disks on {towers} pegs"), 404
+
+    result = dict(disks=state.n_disks, towers=towers, distance=distance,
+                  best_move=best_move, min_moves=optimal, source=source)
+    if moves is not None:
+        result['off_by'] = moves + distance - optimal
+    return jsonify(result)
+
+
 # -------------------
 # Error Handlers (Optional enhancement)
 # -------------------
@@ -233,7 +644,7 @@ def page_not_found(e):
     Custom 404 Error Page (future-proof addition).
     Currently redirects users safely to home.
     """
-    print("⚠ 404 Page Not Found. Redirecting to Home Page.")
+    log.warning("⚠ 404 Page Not Found. Redirecting to Home Page.")
     return redirect(url_for('index'))
 
 
@@ -241,6 +652,10 @@ def page_not_found(e):
 # MAIN EXECUTION POINT
 # ==============================================
 if __name__ == '__main__':
-    print("\n🚀 Launching Tower of Hanoi Flask App ...")
-    print("🔗 Visit http://127.0.0.1:5000/ to access the game interface.\n")
+    log.info("🚀 Launching Tower of Hanoi Flask App ...")
+    log.info("🔗 Visit http://127.0.0.1:5000/ to access the game interface.")
+    # Warm the launcher pool in the serving process (not the reloader parent)
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        get_game_pool()
+        page_cache.warm(CACHED_PAGES)
     app.run(debug=True)
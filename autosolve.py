@@ -0,0 +1,120 @@
+# ===============================================
+# Tower of Hanoi - Auto-solve Playback
+# ===============================================
+# Plays the optimal solution against the wall clock, so
+# how many moves happen per second is independent of how
+# many frames are drawn.
+# ===============================================
+
+import collections
+import time
+
+from engine import HanoiState
+from solver import min_moves_pegs, solve_pegs, state_after
+
+# Default playback length: the whole solution in about this many seconds
+AUTO_SOLVE_SECONDS = 10.0
+MIN_RATE = 1.0          # moves per second
+MAX_RATE = 1e12
+
+
+# -----------------------------
+# Class: AutoSolver
+# Purpose: Time-compressed playback of the optimal solution
+# -----------------------------
+class AutoSolver:
+    """
+    advance() is called once per displayed frame and moves the board
+    forward by however many moves the elapsed time is worth at `rate`
+    moves per second, from a handful up to millions.
+
+    With 3 pegs the board after move k is computed directly with
+    solver.state_after in O(n), so the cost of a frame does not depend
+    on how many moves it covers. With more pegs the Frame-Stewart moves
+    are applied one by one, at most `budget` seconds per frame; moves
+    that do not fit are dropped, so playback slows down instead of
+    stalling the window.
+
+    Parameters:
+    n_disks : int
+        Number of disks
+    n_pegs : int
+        Number of pegs
+    seconds : float
+        Initial speed, as the time the whole solution should take
+    clock : callable
+        Time source in seconds
+    """
+
+    def __init__(self, n_disks, n_pegs=3, seconds=AUTO_SOLVE_SECONDS, clock=time.perf_counter):
+        self.n_disks = n_disks
+        self.n_pegs = n_pegs
+        self.total = min_moves_pegs(n_disks, n_pegs)
+        self.rate = max(MIN_RATE, self.total / seconds)
+        self.clock = clock
+        self.state = HanoiState(n_disks, goal=n_pegs-1, n_pegs=n_pegs)
+        self.moves = None if n_pegs == 3 else solve_pegs(n_disks, n_pegs)
+        self.done = 0
+        self.owed = 0.0         # fraction of a move carried to the next frame
+        self.last = clock()
+        self.started = self.last
+        self.samples = collections.deque([(self.last, 0)])   # (time, done) for the live rate
+
+    @property
+    def finished(self):
+        return self.done >= self.total
+
+    # -----------------------------
+    # Speed
+    # -----------------------------
+    def faster(self):
+        self.rate = min(MAX_RATE, self.rate * 2)
+
+    def slower(self):
+        self.rate = max(MIN_RATE, self.rate / 2)
+
+    # -----------------------------
+    # Playback
+    # -----------------------------
+    def advance(self, budget=0.008):
+        """
+        Catch up with the clock. Returns the number of moves played;
+        self.state is the board after them.
+        """
+        now = self.clock()
+        owed = self.owed + (now - self.last) * self.rate
+        self.last = now
+        count = min(int(owed), self.total - self.done)
+        self.owed = owed - int(owed) if count else owed
+        if count <= 0:
+            return 0
+        if self.moves is None:
+            self.state = state_after(self.n_disks, self.done + count, goal=self.n_pegs-1)
+        else:
+            count = self._step(count, now + budget)
+        self.done += count
+        self.samples.append((now, self.done))
+        while len(self.samples) > 2 and now - self.samples[0][0] > 1.0:
+            self.samples.popleft()
+        return count
+
+    def _step(self, count, deadline):
+        state, moves, clock = self.state, self.moves, self.clock
+        played = 0
+        while played < count:
+            for src, dst in moves:
+                state.move(src, dst)
+                played += 1
+                if played == count or not played & 1023:
+                    break
+            if clock() >= deadline:
+                break
+        return played
+
+    def moves_per_sec(self):
+        """Moves actually played per second over about the last second."""
+        (t0, m0), (t1, m1) = self.samples[0], self.samples[-1]
+        return (m1 - m0) / (t1 - t0) if t1 > t0 else 0.0
+
+    def elapsed(self):
+        return self.last - self.started
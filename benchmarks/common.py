@@ -0,0 +1,18 @@
+# ===============================================
+# Tower of Hanoi - Benchmark Helpers
+# ===============================================
+# Shared by the scripts in this folder; imported as
+# `from common import ...` (a script's own folder is on
+# sys.path when it is run directly).
+# ===============================================
+
+
+# -----------------------------
+# Function: percentile
+# Purpose: Nearest-rank percentile of a sorted list
+# -----------------------------
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))
+    return sorted_values[index]
@@ -0,0 +1,113 @@
+# ===============================================
+# Tower of Hanoi - Session API Load Benchmark
+# ===============================================
+# Plays many hosted games at once against a local server
+# and reports moves/sec and move latency percentiles.
+#
+# Usage:
+#   python benchmarks/session_load.py [--clients 16] [--games 200] [--disks 6]
+#   python benchmarks/session_load.py --url http://127.0.0.1:5000
+# ===============================================
+
+import argparse
+import http.client
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import percentile
+from solver import solve
+
+
+# -----------------------------
+# Function: start_local_server
+# Purpose: Serve app.py on a free port in a background thread
+# -----------------------------
+def start_local_server():
+    # Throwaway leaderboard and feedback files, never the real ones
+    scratch = tempfile.mkdtemp()
+    os.environ.setdefault('HANOI_DB', os.path.join(scratch, 'session_load.db'))
+    os.environ.setdefault('HANOI_FEEDBACK_LOG', os.path.join(scratch, 'feedback.jsonl'))
+    from werkzeug.serving import make_server
+    from app import app
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+# -----------------------------
+# Function: play_games
+# Purpose: One client: create games and play them optimally
+# -----------------------------
+def play_games(base_url, n_games, n_disks, latencies, errors):
+    url = urlsplit(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port)
+    headers = {'Content-Type': 'application/json'}
+
+    def post(path, body):
+        conn.request('POST', path, json.dumps(body), headers)
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+
+    for _ in range(n_games):
+        status, game = post('/api/games', {'username': 'bench', 'disks': n_disks})
+        if status != 201:
+            errors.append(status)
+            continue
+        path = f"/api/games/{game['id']}/moves"
+        for src, dst in solve(n_disks):
+            started = time.perf_counter()
+            status, game = post(path, {'from': src, 'to': dst})
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+                break
+        if not game.get('won'):
+            errors.append('not won')
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play hosted games against the session API and "
+                                                 "report moves/sec and move latency")
+    parser.add_argument('--url', help='Existing server to test (default: start one locally)')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--games', type=int, default=200, help='Games per client')
+    parser.add_argument('--disks', type=int, default=6)
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server, base_url = start_local_server()
+
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=play_games, args=(base_url, args.games, args.disks, latencies, errors))
+        for _ in range(args.clients)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"Games: {args.clients * args.games} x {args.disks} disks, {args.clients} clients")
+    print(f"Moves: {len(latencies)} in {elapsed:.2f} s -> {len(latencies)/elapsed:.0f} moves/sec")
+    print(f"Latency: p50 {percentile(latencies, 50)*1000:.2f} ms, "
+          f"p99 {percentile(latencies, 99)*1000:.2f} ms, max {latencies[-1]*1000 if latencies else 0:.2f} ms")
+    print(f"Errors: {len(errors)}")
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,263 @@
+# ===============================================
+# Tower of Hanoi - Headless Benchmark Suite
+# ===============================================
+# Times the game's drawing, move handling and win check on
+# SDL's dummy video driver, plus the Flask routes through
+# the test client, and saves the numbers as JSON so two
+# runs can be compared.
+#
+# Usage:
+#   python benchmarks/suite.py [--output bench.json] [--quick]
+#   python benchmarks/suite.py --compare base.json              (run, then compare)
+#   python benchmarks/suite.py --compare base.json new.json     (compare two files)
+# ===============================================
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+# Headless: must be set before pygame (or the game) is imported
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('HANOI_LOG_LEVEL', 'WARNING')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import percentile
+
+DISK_COUNTS = (3, 8, 16, 25)
+MOVE_DISK_COUNTS = (3, 8, 12)
+
+
+# -----------------------------
+# Function: measure
+# Purpose: Time `fn` call by call and summarise
+# -----------------------------
+def measure(fn, samples, per_call=1, warmup=10, setup=None):
+    """
+    Call fn `samples` times (after a few warm-up calls) and return
+    latency percentiles in microseconds plus operations per second.
+    `per_call` is how many operations one call performs (e.g. the
+    number of moves in a solved game). `setup`, if given, runs
+    untimed before every call.
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    times = []
+    clock = time.perf_counter
+    for _ in range(samples):
+        if setup:
+            setup()
+        started = clock()
+        fn()
+        times.append(clock() - started)
+    total = sum(times)
+    times.sort()
+    return {
+        'samples': samples,
+        'mean_us': round(sum(times) / samples * 1e6 / per_call, 3),
+        'p50_us': round(percentile(times, 50) * 1e6 / per_call, 3),
+        'p99_us': round(percentile(times, 99) * 1e6 / per_call, 3),
+        'ops_per_sec': round(samples * per_call / total, 1),
+    }
+
+
+# -----------------------------
+# Function: setup_game
+# Purpose: Put the game module into a fresh mid-game state without main()
+# -----------------------------
+def setup_game(game, n_disks, n_pegs=3):
+    import pygame
+    from renderer import DirtyRenderer
+    if game.screen is None:
+        pygame.init()
+        game.screen = pygame.display.set_mode((640, 480))
+    game.n_disks = n_disks
+    game.n_pegs = n_pegs
+    game.challenge = None
+    game.autosolver = None
+    game.pointing_at = 0
+    game.floating = False
+    game.steps = game.off_by = 0
+    game.layout_towers()
+    game.make_disks()
+    game.renderer = DirtyRenderer(game.screen, game.make_background())
+
+
+# -----------------------------
+# Function: bench_game
+# Purpose: Drawing, move handling and win check
+# -----------------------------
+def bench_game(results, quick):
+    import Towerofhanoi as game
+    from solver import solve
+    samples = 200 if quick else 2000
+
+    for n_disks in DISK_COUNTS:
+        setup_game(game, n_disks)
+        surface = game.screen
+        results[f'game.draw_towers[{n_disks}]'] = measure(lambda: game.draw_towers(surface), samples)
+        results[f'game.draw_disks[{n_disks}]'] = measure(lambda: game.draw_disks(surface), samples)
+
+        # One frame through the dirty-rect renderer after the pointer moves
+        def frame():
+            game.pointing_at = (game.pointing_at + 1) % game.n_pegs
+            game.renderer.render(game.frame_items())
+        results[f'game.frame[{n_disks}]'] = measure(frame, samples)
+
+        # Win check on an unsolved board (the every-frame case)
+        results[f'game.check_won[{n_disks}]'] = measure(game.check_won, samples * 5)
+
+    results['game.blit_text'] = measure(
+        lambda: game.blit_text(game.screen, 'Steps: 123', (320, 20), font_name='mono', size=30,
+                               color=game.BLACK),
+        samples * 5)
+
+    # Pick-up + put-down for every move of the optimal solution
+    for n_disks in MOVE_DISK_COUNTS:
+        moves = list(solve(n_disks, 0, 2))
+
+        def play():
+            for src, dst in moves:
+                game.pointing_at = src
+                game.handle_key_up()
+                game.pointing_at = dst
+                game.handle_key_down()
+        rounds = max(3, (samples * 10) // len(moves))
+        results[f'game.moves[{n_disks}]'] = measure(play, rounds, per_call=len(moves), warmup=1,
+                                                  setup=lambda: setup_game(game, n_disks))
+
+
+# -----------------------------
+# Function: bench_routes
+# Purpose: Flask routes through the test client
+# -----------------------------
+def bench_routes(results, quick):
+    from replay import ReplayWriter, to_base64
+    from solver import solve
+    from app import app
+    client = app.test_client()
+    samples = 100 if quick else 1000
+
+    writer = ReplayWriter(5)
+    for src, dst in solve(5):
+        writer.add(src, dst, 300)
+    replay = to_base64(writer)
+
+    def get(path, **headers):
+        return lambda: client.get(path, headers=headers)
+
+    def post(path, body):
+        return lambda: client.post(path, json=body)
+
+    routes = [
+        ('GET /', get('/')),
+        ('GET / (gzip)', get('/', **{'Accept-Encoding': 'gzip'})),
+        ('GET /about', get('/about')),
+        ('GET /tips', get('/tips')),
+        ('GET /stats', get('/stats?disks=5')),
+        ('GET /game_over', get('/game_over?username=bench&disks=5&moves=31&feedback=No')),
+        ('GET /evaluate', get('/evaluate?pegs=0120210')),
+        ('GET /hint', get('/hint?pegs=0120210&towers=3')),
+        ('POST /api/games', post('/api/games', {'username': 'bench', 'disks': 5})),
+        ('POST /api/verify', post('/api/verify', {'replays': [replay] * 10})),
+    ]
+    for name, call in routes:
+        response = call()
+        if response.status_code >= 400:
+            raise RuntimeError(f"{name} returned {response.status_code}")
+        results[f'web.{name}'] = measure(call, samples)
+
+
+# -----------------------------
+# Function: compare
+# Purpose: Flag benchmarks whose p50 got slower than the threshold
+# -----------------------------
+def compare(base, new, threshold):
+    """Print a side-by-side table and return the names that regressed."""
+    regressions = []
+    print(f"{'benchmark':34s} {'base p50 us':>12s} {'new p50 us':>12s} {'change':>8s}")
+    for name in sorted(set(base['benchmarks']) | set(new['benchmarks'])):
+        old, cur = base['benchmarks'].get(name), new['benchmarks'].get(name)
+        if old is None or cur is None:
+            print(f"{name:34s} {'only in ' + ('new' if old is None else 'base'):>34s}")
+            continue
+        change = (cur['p50_us'] - old['p50_us']) / old['p50_us'] if old['p50_us'] else 0.0
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif change < -threshold:
+            flag = '  faster'
+        print(f"{name:34s} {old['p50_us']:12.1f} {cur['p50_us']:12.1f} {change:+7.1%}{flag}")
+    return regressions
+
+
+# -----------------------------
+# Function: run
+# Purpose: Run every group and wrap the numbers with run metadata
+# -----------------------------
+def run(quick=False):
+    import pygame
+    benchmarks = {}
+    started = time.perf_counter()
+    bench_game(benchmarks, quick)
+    bench_routes(benchmarks, quick)
+    return {
+        'created': time.time(),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'platform': platform.platform(),
+        'quick': quick,
+        'seconds': round(time.perf_counter() - started, 2),
+        'benchmarks': benchmarks,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tower of Hanoi headless benchmarks")
+    parser.add_argument('--output', default='bench.json', help="where to save this run")
+    parser.add_argument('--quick', action='store_true', help="fewer samples (smoke test)")
+    parser.add_argument('--compare', nargs='+', metavar='JSON',
+                        help="BASE to run and compare against, or BASE NEW to compare two files")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="slowdown in p50 reported as a regression (default 0.10 = 10%%)")
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) == 2:
+        with open(args.compare[0]) as f:
+            base = json.load(f)
+        with open(args.compare[1]) as f:
+            new = json.load(f)
+    else:
+        # Results and feedback go to throwaway files, never the real ones
+        scratch = tempfile.mkdtemp()
+        os.environ.setdefault('HANOI_DB', os.path.join(scratch, 'bench.db'))
+        os.environ.setdefault('HANOI_FEEDBACK_LOG', os.path.join(scratch, 'feedback.jsonl'))
+        new = run(args.quick)
+        with open(args.output, 'w') as f:
+            json.dump(new, f, indent=2)
+        for name, stats in new['benchmarks'].items():
+            print(f"{name:34s} p50 {stats['p50_us']:10.1f} us  p99 {stats['p99_us']:10.1f} us  "
+                  f"{stats['ops_per_sec']:12,.0f} ops/s")
+        print(f"Saved {len(new['benchmarks'])} benchmarks to {args.output} ({new['seconds']} s)")
+        if not args.compare:
+            return
+        with open(args.compare[0]) as f:
+            base = json.load(f)
+
+    regressions = compare(base, new, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+    print("No regressions")
+
+
+if __name__ == '__main__':
+    main()
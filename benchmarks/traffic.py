@@ -0,0 +1,159 @@
+# ===============================================
+# Tower of Hanoi - Player Traffic Load Generator
+# ===============================================
+# Simulates players going through the whole site:
+# home -> start_game -> (game reports its result) ->
+# game_over -> feedback -> stats, and reports throughput
+# and p50/p99 latency per step.
+#
+# Usage:
+#   python serve.py --no-launch --workers 2 --threads 16 &
+#   python benchmarks/traffic.py --url http://127.0.0.1:8000 [--clients 32] [--seconds 30]
+#   python benchmarks/traffic.py            (in-process server, quick check)
+# ===============================================
+
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import percentile
+from replay import ReplayWriter, to_base64
+from solver import solve
+
+STEPS = ('home', 'start_game', 'report_result', 'game_over', 'feedback', 'stats')
+FORM = {'Content-Type': 'application/x-www-form-urlencoded'}
+JSON = {'Content-Type': 'application/json'}
+
+
+# -----------------------------
+# Function: start_local_server
+# Purpose: serve.py's server in a background thread, games not launched
+# -----------------------------
+def start_local_server(threads):
+    # Throwaway leaderboard and feedback files, never the real ones
+    scratch = tempfile.mkdtemp()
+    os.environ.setdefault('HANOI_DB', os.path.join(scratch, 'traffic.db'))
+    os.environ.setdefault('HANOI_FEEDBACK_LOG', os.path.join(scratch, 'feedback.jsonl'))
+    import serve
+    app = serve.load_app(launch_games=False)
+    server = serve.PooledWSGIServer('127.0.0.1', 0, app, threads)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.port}"
+
+
+def make_replays(max_disks):
+    """Replay of a slightly sloppy game for each disk count, as the game would send."""
+    rng = random.Random(1)
+    replays = {}
+    for n_disks in range(3, max_disks + 1):
+        writer = ReplayWriter(n_disks)
+        moves = [(0, 1), (1, 0)] * rng.randint(0, 2) + list(solve(n_disks))
+        for src, dst in moves:
+            writer.add(src, dst, rng.randint(200, 1500))
+        replays[n_disks] = (to_base64(writer), len(moves))
+    return replays
+
+
+# -----------------------------
+# Function: player
+# Purpose: One client playing sessions back to back until the deadline
+# -----------------------------
+def player(base_url, deadline, replays, latencies, errors, seed):
+    rng = random.Random(seed)
+    url = urlsplit(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+
+    def call(step, method, path, body=None, headers=None, expect=(200,)):
+        started = time.perf_counter()
+        try:
+            conn.request(method, path, body, headers or {})
+            response = conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()    # reconnects on the next request
+            errors.append(f"{step}: {e.__class__.__name__}")
+            return None
+        latencies[step].append(time.perf_counter() - started)
+        if response.status not in expect:
+            errors.append(f"{step}: HTTP {response.status}")
+            return None
+        return data
+
+    while time.perf_counter() < deadline:
+        name = f"player{rng.randrange(10000)}"
+        disks = rng.choice(list(replays))
+        replay, moves = replays[disks]
+        game = {'username': name, 'disks': disks, 'moves': moves}
+
+        call('home', 'GET', '/', headers={'Accept-Encoding': 'gzip'})
+        call('start_game', 'POST', '/start_game',
+             urlencode({'playerName': name, 'disks': disks, 'pegs': 3, 'mode': 'classic'}), FORM, expect=(302,))
+        reply = call('report_result', 'POST', '/api/results',
+                     json.dumps(dict(game, pegs=3, replay=replay, challenge=None)), JSON, expect=(202,))
+        result_id = json.loads(reply)['id'] if reply else ''
+        call('game_over', 'GET', '/game_over?' + urlencode(dict(game, pegs=3, result=result_id)))
+        call('feedback', 'POST', '/feedback',
+             urlencode({'feedback_text': 'Fun puzzle!', 'username': name, 'disks': disks, 'moves': moves}),
+             FORM, expect=(302,))
+        call('stats', 'POST', '/stats', urlencode(dict(game, feedback='Yes')), FORM)
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay realistic player traffic against the server")
+    parser.add_argument('--url', default=None, help="server to test (default: start one in-process)")
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--max-disks', type=int, default=8)
+    parser.add_argument('--threads', type=int, default=16, help="server threads for the in-process server")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server, base_url = start_local_server(args.threads)
+        print(f"Started in-process server at {base_url} (use --url to test a real deployment)")
+
+    replays = make_replays(args.max_disks)
+    latencies = {step: [] for step in STEPS}
+    errors = []
+    started = time.perf_counter()
+    deadline = started + args.seconds
+    clients = [threading.Thread(target=player, args=(base_url, deadline, replays, latencies, errors, i))
+               for i in range(args.clients)]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - started
+    if server is not None:
+        server.shutdown()
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"\n{'step':14s} {'requests':>9s} {'req/s':>9s} {'p50 ms':>9s} {'p99 ms':>9s} {'max ms':>9s}")
+    everything = []
+    for step in STEPS:
+        values = sorted(latencies[step])
+        everything += values
+        print(f"{step:14s} {len(values):9d} {len(values)/elapsed:9.1f} {percentile(values, 50)*1000:9.2f} "
+              f"{percentile(values, 99)*1000:9.2f} {(values[-1] if values else 0)*1000:9.2f}")
+    everything.sort()
+    print(f"{'all':14s} {total:9d} {total/elapsed:9.1f} {percentile(everything, 50)*1000:9.2f} "
+          f"{percentile(everything, 99)*1000:9.2f} {(everything[-1] if everything else 0)*1000:9.2f}")
+    print(f"\n{len(latencies['stats'])} player sessions by {args.clients} clients in {elapsed:.1f}s, "
+          f"{len(errors)} errors")
+    for error in sorted(set(errors))[:10]:
+        print(f"  {error} (x{errors.count(error)})")
+
+
+if __name__ == '__main__':
+    main()
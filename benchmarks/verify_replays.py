@@ -0,0 +1,81 @@
+# ===============================================
+# Tower of Hanoi - Replay Verification Benchmark
+# ===============================================
+# Builds a mix of valid and forged replays and reports
+# replays verified per second for each verifier mode.
+#
+# Usage:
+#   python benchmarks/verify_replays.py [--replays 5000] [--max-disks 8] [--processes 4]
+# ===============================================
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from replay import ReplayWriter, to_base64
+from solver import solve
+from verify import verify_replay, verify_batch
+
+
+# -----------------------------
+# Function: make_replays
+# Purpose: Timed replays like the game records, ~1 in 4 forged
+# -----------------------------
+def make_replays(count, max_disks, seed=1):
+    rng = random.Random(seed)
+    replays = []
+    for _ in range(count):
+        n_disks = rng.randint(3, max_disks)
+        writer = ReplayWriter(n_disks)
+        moves = list(solve(n_disks))
+        kind = rng.random()
+        if kind < 0.1:
+            moves = moves[:-1]                      # never finishes
+        elif kind < 0.2:
+            i = rng.randrange(len(moves))
+            moves[i] = (moves[i][1], moves[i][0])   # illegal move
+        elif kind < 0.25:
+            moves.append((2, 0))                    # moves after winning
+        elif kind < 0.5:
+            # legal detours before the optimal solution: the top disk
+            # out and back, which leaves the start position as it was
+            moves = [(0, 1), (1, 0)] * rng.randint(1, 5) + moves
+        for src, dst in moves:
+            writer.add(src, dst, rng.randint(150, 2000))
+        replays.append(to_base64(writer))
+    return replays
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--replays', type=int, default=5000)
+    parser.add_argument('--max-disks', type=int, default=8)
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    replays = make_replays(args.replays, args.max_disks)
+    results = {}
+
+    modes = [
+        ('one by one (engine)', lambda: [verify_replay(r) for r in replays]),
+        ('batch (NumPy)', lambda: verify_batch(replays)),
+        (f'batch x{args.processes} processes', lambda: verify_batch(replays, processes=args.processes)),
+    ]
+    for name, run in modes:
+        started = time.perf_counter()
+        results[name] = run()
+        elapsed = time.perf_counter() - started
+        print(f"{name:28s} {len(replays)/elapsed:10.0f} replays/sec  ({elapsed:.2f} s)")
+
+    first = next(iter(results.values()))
+    assert all(r == first for r in results.values()), "verifier modes disagree"
+    total_moves = sum(r.moves for r in first)
+    print(f"Replays: {len(replays)}, valid: {sum(r.ok for r in first)}, moves checked: {total_moves}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+# ===============================================
+# Tower of Hanoi - Challenge Puzzles
+# ===============================================
+# Random start and target boards with a known optimal
+# move count, generated in bulk across a process pool and
+# stored in fixed-size records for O(1) random access.
+#
+# Build with:  python challenges.py --disks 4 5 6 7 8 --count 10000
+# ===============================================
+
+import argparse
+import datetime
+import hashlib
+import mmap
+import os
+import random
+import struct
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from solver import min_moves, plan_between
+
+# Difficulty by optimal moves as a share of the classic game (2^n - 1)
+TIERS = {
+    'easy': (0.0, 0.4),
+    'medium': (0.4, 0.7),
+    'hard': (0.7, 1.0),
+}
+TIER_CODES = {name: code for code, name in enumerate(TIERS)}
+DAILY_TIER = 'medium'
+MAX_CHALLENGE_DISKS = 32
+
+# File layout: header, then `count` records of
+#   start (state_bytes) | target (state_bytes) | optimal (uint32)
+# where a board is the integer whose base-3 digit d is the peg of disk d+1.
+MAGIC = b'HC'
+VERSION = 1
+HEADER = struct.Struct('<2sBBBBI')    # magic, version, n_disks, tier, state_bytes, count
+DEFAULT_DIR = os.environ.get(
+    'HANOI_CHALLENGES', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'challenges'))
+
+Challenge = namedtuple('Challenge', 'start target optimal index')
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+# -----------------------------
+# Functions: board encoding
+# -----------------------------
+def state_bytes(n_disks):
+    return ((3 ** n_disks - 1).bit_length() + 7) // 8
+
+
+def board_to_int(board):
+    value = 0
+    for peg in reversed(board):
+        value = value * 3 + peg
+    return value
+
+
+def int_to_board(value, n_disks):
+    board = []
+    for _ in range(n_disks):
+        value, peg = divmod(value, 3)
+        board.append(peg)
+    return tuple(board)
+
+
+def board_text(board):
+    """Board as a digit string, smallest disk first (e.g. '0012')."""
+    return ''.join(map(str, board))
+
+
+# -----------------------------
+# Function: _generate_chunk
+# Purpose: Worker body - pack `count` puzzles of one tier
+# -----------------------------
+def _generate_chunk(n_disks, tier, count, seed):
+    rng = random.Random(seed)
+    low, high = TIERS[tier]
+    full = min_moves(n_disks)
+    width = state_bytes(n_disks)
+    out = bytearray()
+    made = 0
+    while made < count:
+        start = [rng.randrange(3) for _ in range(n_disks)]
+        target = [rng.randrange(3) for _ in range(n_disks)]
+        optimal, _ = plan_between(start, target)
+        share = optimal / full
+        # tiers are half-open, except that the hardest one includes 100%
+        if not optimal or share < low or (share >= high and high < 1.0):
+            continue
+        out += board_to_int(start).to_bytes(width, 'little')
+        out += board_to_int(target).to_bytes(width, 'little')
+        out += optimal.to_bytes(4, 'little')
+        made += 1
+    return bytes(out)
+
+
+# -----------------------------
+# Function: generate
+# Purpose: Build one index file across a process pool
+# -----------------------------
+def generate(n_disks, tier, count, directory=None, processes=None, seed=None):
+    """
+    Generate `count` puzzles for a disk count and tier and write them
+    atomically to the index file. Work is split into chunks, each with
+    its own seed, so results do not depend on the number of processes.
+    Returns the file path.
+    """
+    if not 2 <= n_disks <= MAX_CHALLENGE_DISKS:
+        raise ValueError(f"n_disks must be between 2 and {MAX_CHALLENGE_DISKS}, got {n_disks}")
+    if tier not in TIERS:
+        raise ValueError(f"Unknown tier '{tier}'")
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    seed = random.randrange(1 << 32) if seed is None else seed
+    chunk = 4096
+    jobs = [(n_disks, tier, min(chunk, count - i), seed + i) for i in range(0, count, chunk)]
+    args = list(zip(*jobs))
+    if processes == 1 or len(jobs) == 1:
+        data = b''.join(map(_generate_chunk, *args))
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            data = b''.join(pool.map(_generate_chunk, *args))
+
+    path = index_path(n_disks, tier, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, n_disks, TIER_CODES[tier], state_bytes(n_disks), count))
+        f.write(data)
+    os.replace(tmp, path)
+    return path
+
+
+def index_path(n_disks, tier, directory=None):
+    return os.path.join(directory or DEFAULT_DIR, f"challenges_{n_disks}disks_{tier}.bin")
+
+
+# -----------------------------
+# Class: ChallengeIndex
+# Purpose: O(1) access to a memory-mapped puzzle file
+# -----------------------------
+class ChallengeIndex:
+    """
+    Records have a fixed size, so puzzle i is a slice at a computed
+    offset; nothing is parsed or loaded up front.
+
+    Parameters:
+    path : str
+        File written by generate()
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.n_disks, tier, self.width, self.count = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a challenge index")
+        self.tier = list(TIERS)[tier]
+        self.record_size = 2 * self.width + 4
+        if len(self.data) < HEADER.size + self.count * self.record_size:
+            raise ValueError(f"{path} is truncated")
+
+    def __len__(self):
+        return self.count
+
+    def get(self, i):
+        """Return puzzle i as a Challenge."""
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        offset = HEADER.size + i * self.record_size
+        width = self.width
+        record = self.data[offset:offset + self.record_size]
+        return Challenge(
+            int_to_board(int.from_bytes(record[:width], 'little'), self.n_disks),
+            int_to_board(int.from_bytes(record[width:2*width], 'little'), self.n_disks),
+            int.from_bytes(record[2*width:], 'little'),
+            i,
+        )
+
+    def random(self, rng=random):
+        return self.get(rng.randrange(self.count))
+
+    def daily(self, day=None):
+        """Same puzzle for everyone on a given date."""
+        day = day or datetime.date.today()
+        digest = hashlib.sha256(f"{day.isoformat()}:{self.n_disks}:{self.tier}".encode()).digest()
+        return self.get(int.from_bytes(digest[:8], 'big') % self.count)
+
+
+# -----------------------------
+# Function: open_index
+# Purpose: Shared ChallengeIndex, or None if not generated
+# -----------------------------
+def open_index(n_disks, tier, directory=None):
+    path = index_path(n_disks, tier, directory)
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None and os.path.exists(path):
+            index = _indexes[path] = ChallengeIndex(path)
+        return index
+
+
+# -----------------------------
+# Command line builder
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate Tower of Hanoi challenge puzzles")
+    parser.add_argument('--disks', type=int, nargs='+', default=list(range(3, 9)))
+    parser.add_argument('--tiers', nargs='+', default=list(TIERS), choices=list(TIERS))
+    parser.add_argument('--count', type=int, default=10000, help="puzzles per disk count and tier")
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--directory', default=DEFAULT_DIR)
+    args = parser.parse_args(argv)
+
+    for n_disks in args.disks:
+        for tier in args.tiers:
+            started = time.perf_counter()
+            path = generate(n_disks, tier, args.count, args.directory, args.processes, args.seed)
+            print(f"{n_disks:2d} disks, {tier:6s}: {args.count:,} puzzles "
+                  f"in {time.perf_counter() - started:6.2f}s -> {path} ({os.path.getsize(path):,} bytes)")
+
+
+if __name__ == '__main__':
+    main()
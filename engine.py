@@ -0,0 +1,182 @@
+# ===============================================
+# Tower of Hanoi - Game State Engine
+# ===============================================
+# Headless (pygame-free) rules engine shared by the
+# pygame game and the Flask app.
+# ===============================================
+
+# -----------------------------
+# Engine Constants
+# -----------------------------
+N_PEGS = 3
+START_PEG = 0
+FINISH_PEG = 2
+MIN_DISKS = 1
+MAX_DISKS = 64
+
+
+# -----------------------------
+# Class: HanoiState
+# Purpose: Compact board state with O(1) move checks
+# -----------------------------
+class HanoiState:
+    """
+    Board state for a Tower of Hanoi game.
+
+    Disks are numbered by size, 1 (smallest) to n_disks (largest),
+    the same as the 'val' of the old pygame disk dicts.
+    Each peg is a stack (list, bottom to top) and `location` is a
+    peg-per-disk byte array, so the top of a peg, the peg of a disk,
+    legal-move checks and win detection are all O(1).
+
+    Parameters:
+    n_disks : int
+        Number of disks
+    start : int
+        Peg all disks start on
+    goal : int
+        Peg all disks must end on
+    n_pegs : int
+        Number of pegs
+    """
+    __slots__ = ('n_disks', 'n_pegs', 'goal', 'pegs', 'location', 'steps')
+
+    def __init__(self, n_disks, start=START_PEG, goal=FINISH_PEG, n_pegs=N_PEGS):
+        if not MIN_DISKS <= n_disks <= MAX_DISKS:
+            raise ValueError(f"n_disks must be between {MIN_DISKS} and {MAX_DISKS}, got {n_disks}")
+        self.n_disks = n_disks
+        self.n_pegs = n_pegs
+        self.goal = goal
+        self.pegs = [[] for _ in range(n_pegs)]
+        self.pegs[start] = list(range(n_disks, 0, -1))
+        # index 0 is unused so disk d lives at location[d]
+        self.location = bytearray(1) + bytearray([start]) * n_disks
+        self.steps = 0
+
+    # -----------------------------
+    # Alternate constructors
+    # -----------------------------
+    @classmethod
+    def from_locations(cls, locations, goal=FINISH_PEG, n_pegs=N_PEGS):
+        """
+        Build a state from a peg-per-disk sequence.
+
+        Parameters:
+        locations : sequence of int
+            locations[i] is the peg of disk i+1 (smallest first)
+        """
+        state = cls(len(locations), goal=goal, n_pegs=n_pegs)
+        state.pegs = [[] for _ in range(n_pegs)]
+        for disk in range(len(locations), 0, -1):
+            peg = locations[disk-1]
+            if not 0 <= peg < n_pegs:
+                raise ValueError(f"Disk {disk} is on unknown peg {peg}")
+            state.pegs[peg].append(disk)
+            state.location[disk] = peg
+        return state
+
+    def copy(self):
+        """Return an independent copy of this state."""
+        other = HanoiState.__new__(HanoiState)
+        other.n_disks = self.n_disks
+        other.n_pegs = self.n_pegs
+        other.goal = self.goal
+        other.pegs = [list(peg) for peg in self.pegs]
+        other.location = bytearray(self.location)
+        other.steps = self.steps
+        return other
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    def top(self, peg):
+        """Return the top disk on `peg`, or 0 if the peg is empty."""
+        stack = self.pegs[peg]
+        return stack[-1] if stack else 0
+
+    def height(self, peg):
+        """Return the number of disks on `peg`."""
+        return len(self.pegs[peg])
+
+    def peg_of(self, disk):
+        """Return the peg that `disk` is on."""
+        return self.location[disk]
+
+    def can_move(self, src, dst):
+        """Check whether the top disk of `src` may be placed on `dst`."""
+        if src == dst or not (0 <= src < self.n_pegs and 0 <= dst < self.n_pegs):
+            return False
+        src_stack = self.pegs[src]
+        if not src_stack:
+            return False
+        dst_stack = self.pegs[dst]
+        return not dst_stack or dst_stack[-1] > src_stack[-1]
+
+    def is_won(self):
+        """Check whether every disk is on the goal peg."""
+        return len(self.pegs[self.goal]) == self.n_disks
+
+    def locations(self):
+        """Return the peg of every disk as a tuple, smallest disk first."""
+        return tuple(self.location[1:])
+
+    # -----------------------------
+    # Evaluation
+    # -----------------------------
+    def _plan(self):
+        """
+        Walk the disks from largest to smallest, tracking the peg each
+        one must reach. A disk already on its target costs nothing;
+        otherwise it costs 2^(d-1) moves and the smaller disks must
+        first gather on the third peg. The last disk found out of
+        place is the one the optimal plan moves first.
+
+        Returns (distance, (src, dst) or None). O(n), no search.
+        """
+        if self.n_pegs != 3:
+            raise ValueError("Distance evaluation needs exactly 3 pegs")
+        location = self.location
+        target = self.goal
+        distance = 0
+        first = None
+        for disk in range(self.n_disks, 0, -1):
+            peg = location[disk]
+            if peg != target:
+                distance += 1 << (disk - 1)
+                first = (peg, target)
+                target = 3 - peg - target
+        return distance, first
+
+    def distance_to_goal(self):
+        """Return the minimum number of moves left to win from here."""
+        return self._plan()[0]
+
+    def best_move(self):
+        """Return the optimal next move as (src, dst), or None if won."""
+        return self._plan()[1]
+
+    # -----------------------------
+    # Moves
+    # -----------------------------
+    def move(self, src, dst):
+        """
+        Move the top disk of `src` onto `dst`.
+
+        Returns the disk that was moved.
+        Raises ValueError if the move is illegal.
+        """
+        if not self.can_move(src, dst):
+            raise ValueError(f"Illegal move {src} -> {dst}")
+        disk = self.pegs[src].pop()
+        self.pegs[dst].append(disk)
+        self.location[disk] = dst
+        self.steps += 1
+        return disk
+
+    def __eq__(self, other):
+        if not isinstance(other, HanoiState):
+            return NotImplemented
+        return self.goal == other.goal and self.location == other.location
+
+    def __repr__(self):
+        return f"HanoiState(n_disks={self.n_disks}, pegs={self.pegs}, steps={self.steps})"
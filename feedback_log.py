@@ -0,0 +1,166 @@
+# ===============================================
+# Tower of Hanoi - Feedback Ingestion
+# ===============================================
+# Feedback is queued in memory and written by a background
+# thread, in batches, to a rotating line-delimited JSON file.
+# ===============================================
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+
+from logs import get_logger
+
+log = get_logger('feedback')
+
+
+# -----------------------------
+# Class: FeedbackWriter
+# Purpose: Bounded queue + batched append-only JSONL writer
+# -----------------------------
+class FeedbackWriter:
+    """
+    submit() puts a record on a bounded queue and returns at once.
+    A writer thread appends queued records in batches (one write and
+    one flush per batch) and rotates the file once it passes max_bytes
+    (feedback.jsonl -> feedback.jsonl.1 -> ... .backup_count).
+
+    When the queue is full, submit() waits at most `put_timeout`
+    seconds for room and then drops the record (counted in 'dropped'),
+    so a stalled disk slows requests by a bounded amount, not forever.
+
+    Parameters:
+    path : str
+        Feedback file
+    max_queue : int
+        Records allowed to wait for the writer
+    batch_size : int
+        Most records written per batch
+    max_bytes : int
+        File size that triggers rotation
+    backup_count : int
+        Rotated files kept
+    put_timeout : float
+        Seconds submit() waits for queue space
+    """
+
+    def __init__(self, path, max_queue=10000, batch_size=256, max_bytes=10*1024*1024,
+                 backup_count=5, put_timeout=0.05):
+        self.path = path
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.put_timeout = put_timeout
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.submitted = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.closed = False
+        self.writer = threading.Thread(target=self._write_loop, name='feedback-writer', daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    # -----------------------------
+    # Producer side
+    # -----------------------------
+    def submit(self, username, disks, moves, text):
+        """Queue one feedback record. Returns False if it had to be dropped."""
+        record = {
+            'username': username,
+            'disks': disks,
+            'moves': moves,
+            'text': text,
+            'timestamp': time.time(),
+        }
+        try:
+            self.queue.put(record, timeout=self.put_timeout)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.submitted += 1
+        return True
+
+    def close(self, timeout=5):
+        """Write everything still queued, then stop the writer."""
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.writer.join(timeout)
+
+    # -----------------------------
+    # Writer thread
+    # -----------------------------
+    def _write_loop(self):
+        running = True
+        while running:
+            batch = []
+            item = self.queue.get()
+            while True:
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self._write_batch(batch)
+                except OSError as e:
+                    log.error("⚠ Could not write %d feedback records -> %s", len(batch), e)
+
+    def _write_batch(self, batch):
+        started = time.perf_counter()
+        data = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in batch)
+        self._rotate_if_needed(len(data.encode('utf-8')))
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(data)
+            f.flush()
+        elapsed = (time.perf_counter() - started) * 1000
+        self.written += len(batch)
+        self.batches += 1
+        self.last_batch_size = len(batch)
+        self.last_flush_ms = elapsed
+        self.max_flush_ms = max(self.max_flush_ms, elapsed)
+
+    def _rotate_if_needed(self, incoming):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size + incoming <= self.max_bytes:
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i+1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    # -----------------------------
+    # Counters
+    # -----------------------------
+    def stats(self):
+        return {
+            'queue_depth': self.queue.qsize(),
+            'submitted': self.submitted,
+            'dropped': self.dropped,
+            'written': self.written,
+            'batches': self.batches,
+            'last_batch_size': self.last_batch_size,
+            'last_flush_ms': round(self.last_flush_ms, 3),
+            'max_flush_ms': round(self.max_flush_ms, 3),
+        }
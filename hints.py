@@ -0,0 +1,189 @@
+# ===============================================
+# Tower of Hanoi - Precomputed Hint Tables
+# ===============================================
+# Offline BFS over every legal board, stored as a memory-
+# mapped .npy file: the distance to the Finish tower and
+# the best next move for each state, one lookup each.
+#
+# Build with:  python hints.py --max-disks 13 --pegs 3 4
+# ===============================================
+
+import argparse
+import os
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:   # tables can't be built or read; callers fall back
+    np = None
+
+# Largest table built: 3^15 states (~43 MB on disk)
+MAX_TABLE_STATES = 3 ** 15
+NO_MOVE = 255
+DEFAULT_DIR = os.environ.get(
+    'HANOI_HINTS', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hints'))
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+# -----------------------------
+# Function: table_path
+# Purpose: File name of the table for n disks on k pegs
+# -----------------------------
+def table_path(n_disks, n_pegs=3, directory=None):
+    return os.path.join(directory or DEFAULT_DIR, f"hints_{n_pegs}pegs_{n_disks}disks.npy")
+
+
+# -----------------------------
+# Function: build_table
+# Purpose: Breadth-first search back from the goal
+# -----------------------------
+def build_table(n_disks, n_pegs=3):
+    """
+    Return a structured array with one ('distance', 'move') row per
+    state. A state is the integer whose base-k digit d is the peg of
+    disk d+1, so disk 1 is the least significant digit and the goal
+    (everything on the last peg) is k^n - 1.
+
+    Moves are reversible, so searching outward from the goal gives
+    every state's distance to it. Each BFS layer is processed as whole
+    NumPy arrays: digits, the top disk of every peg, then one masked
+    step per (src, dst) pair. 'move' is src * k + dst of a best next
+    move (NO_MOVE for the goal).
+    """
+    if np is None:
+        raise RuntimeError("NumPy is required to build hint tables")
+    size = n_pegs ** n_disks
+    if size > MAX_TABLE_STATES:
+        raise ValueError(f"{n_pegs}^{n_disks} states is more than the {MAX_TABLE_STATES} allowed")
+    powers = n_pegs ** np.arange(n_disks, dtype=np.int64)
+    pairs = [(a, b) for a in range(n_pegs) for b in range(n_pegs) if a != b]
+
+    distance = np.full(size, -1, np.int64)
+    move = np.full(size, NO_MOVE, np.uint8)
+    frontier = np.array([size - 1], np.int64)
+    distance[size - 1] = 0
+    depth = 0
+    while frontier.size:
+        digits = (frontier[:, None] // powers[None, :]) % n_pegs
+        # tops[:, p] is the index of the smallest disk on peg p (n_disks if empty)
+        tops = np.empty((frontier.size, n_pegs), np.int64)
+        for peg in range(n_pegs):
+            on_peg = digits == peg
+            tops[:, peg] = np.where(on_peg.any(1), on_peg.argmax(1), n_disks)
+        depth += 1
+        found = []
+        for a, b in pairs:
+            legal = tops[:, a] < tops[:, b]
+            neighbours = frontier[legal] + (b - a) * powers[tops[legal, a]]
+            neighbours = neighbours[distance[neighbours] < 0]
+            if neighbours.size:
+                distance[neighbours] = depth
+                move[neighbours] = b * n_pegs + a    # step back toward the goal
+                found.append(neighbours)
+        frontier = np.unique(np.concatenate(found)) if found else np.empty(0, np.int64)
+
+    dist_type = np.uint16 if depth < 1 << 16 else np.uint32
+    table = np.empty(size, [('distance', dist_type), ('move', np.uint8)])
+    table['distance'] = distance
+    table['move'] = move
+    return table
+
+
+# -----------------------------
+# Function: build
+# Purpose: Build a table and write it next to the others
+# -----------------------------
+def build(n_disks, n_pegs=3, directory=None):
+    """Build the table and write it atomically. Returns the file path."""
+    path = table_path(n_disks, n_pegs, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = build_table(n_disks, n_pegs)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        np.save(f, table)
+    os.replace(tmp, path)
+    return path
+
+
+# -----------------------------
+# Class: HintTable
+# Purpose: Read-only, memory-mapped view of one table
+# -----------------------------
+class HintTable:
+    """
+    Opens a table with mmap_mode='r': nothing is read up front and
+    every process using the same file shares one copy in the OS page
+    cache.
+
+    Parameters:
+    path : str
+        Table file written by build()
+    n_disks : int
+        Number of disks the table was built for
+    n_pegs : int
+        Number of pegs the table was built for
+    """
+
+    def __init__(self, path, n_disks, n_pegs=3):
+        self.table = np.load(path, mmap_mode='r')
+        if len(self.table) != n_pegs ** n_disks:
+            raise ValueError(f"{path} does not hold {n_pegs}^{n_disks} states")
+        self.n_disks = n_disks
+        self.n_pegs = n_pegs
+        self.powers = [n_pegs ** d for d in range(n_disks)]
+        self.min_moves = int(self.table[0]['distance'])   # everything on the start peg
+
+    def index(self, locations):
+        """State number of a peg-per-disk sequence (smallest disk first)."""
+        return sum(peg * power for peg, power in zip(locations, self.powers))
+
+    def lookup(self, locations):
+        """Return (distance to the goal, best move as (src, dst) or None)."""
+        row = self.table[self.index(locations)]
+        code = int(row['move'])
+        best = None if code == NO_MOVE else divmod(code, self.n_pegs)
+        return int(row['distance']), best
+
+
+# -----------------------------
+# Function: open_table
+# Purpose: Shared HintTable for a game size, or None if not built
+# -----------------------------
+def open_table(n_disks, n_pegs=3, directory=None):
+    """Open (once per process) the table for n disks on k pegs."""
+    if np is None:
+        return None
+    path = table_path(n_disks, n_pegs, directory)
+    with _tables_lock:
+        table = _tables.get(path)
+        if table is None and os.path.exists(path):
+            table = _tables[path] = HintTable(path, n_disks, n_pegs)
+        return table
+
+
+# -----------------------------
+# Command line builder
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build Tower of Hanoi hint tables")
+    parser.add_argument('--max-disks', type=int, default=13)
+    parser.add_argument('--pegs', type=int, nargs='+', default=[3])
+    parser.add_argument('--directory', default=DEFAULT_DIR)
+    args = parser.parse_args(argv)
+
+    for n_pegs in args.pegs:
+        for n_disks in range(1, args.max_disks + 1):
+            if n_pegs ** n_disks > MAX_TABLE_STATES:
+                print(f"Skipping {n_disks} disks on {n_pegs} pegs and up (too many states)")
+                break
+            started = time.perf_counter()
+            path = build(n_disks, n_pegs, args.directory)
+            print(f"{n_pegs} pegs, {n_disks:2d} disks: {n_pegs ** n_disks:>10,} states "
+                  f"in {time.perf_counter() - started:6.2f}s -> {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,324 @@
+# ===============================================
+# Tower of Hanoi - Pre-warmed Game Launcher
+# ===============================================
+# Keeps worker processes with the game already imported,
+# hands them (username, n_disks, n_pegs, options) jobs over a pipe and caps
+# how many games run at once.
+# ===============================================
+
+import atexit
+import collections
+import contextlib
+import multiprocessing
+import sys
+import threading
+import time
+import types
+from multiprocessing.connection import wait
+
+from logs import get_logger
+
+log = get_logger('launcher')
+
+
+# -----------------------------
+# Function: _worker_main
+# Purpose: Body of a pre-warmed worker process
+# -----------------------------
+def _worker_main(conn, options):
+    """
+    Imports the game (pygame included) up front, reports 'ready', then
+    blocks until a job arrives and runs exactly one game with it.
+    """
+    import pygame
+    import Towerofhanoi as game
+    pygame.init()
+    conn.send('ready')
+    job = conn.recv()
+    if job is None:
+        return
+    username, n_disks, n_pegs, extra = job
+    conn.send('started')
+    game.main([username, str(n_disks), f'--pegs={n_pegs}'] + list(options) + list(extra))
+
+
+# -----------------------------
+# Function: _without_main
+# Purpose: Keep spawned workers from re-importing the server script
+# -----------------------------
+@contextlib.contextmanager
+def _without_main():
+    """
+    A spawned child re-runs the parent's __main__ (app.py under
+    `python app.py`) as __mp_main__, which would open the database and
+    start the server's threads in every game process. Process.start()
+    reads __main__ while it runs, so a bare stand-in is swapped in for
+    that moment; workers then import only this module and the game.
+    """
+    main = sys.modules['__main__']
+    sys.modules['__main__'] = types.ModuleType('__main__')
+    try:
+        yield
+    finally:
+        sys.modules['__main__'] = main
+
+
+# -----------------------------
+# Class: GamePool
+# Purpose: Pool of pre-imported game processes
+# -----------------------------
+class GamePool:
+    """
+    Launches games on pre-warmed worker processes.
+
+    Each worker runs one game and then exits; a replacement is started
+    in the background so `warm` workers stay ready. At most `max_games`
+    games run at once, up to `max_queue` more wait for a free slot and
+    anything beyond that is rejected.
+
+    A worker that exits before it is ready (pygame or the display
+    failed to start) is a boot failure. Replacements are then delayed,
+    doubling from `backoff` up to `max_backoff` seconds, and after
+    `max_failures` failures in a row the pool is marked unhealthy: it
+    stops spawning and turns launches away until the server restarts.
+
+    Parameters:
+    warm : int
+        Number of idle, ready-to-go workers to keep
+    max_games : int
+        Maximum number of games running at the same time
+    max_queue : int
+        Maximum number of launches waiting for a slot
+    options : sequence of str
+        Extra --flags passed to every game (e.g. ['--no-voice'])
+    on_started : callable
+        Called with the launch latency in seconds each time a game starts
+    backoff, max_backoff : float
+        First and longest delay (seconds) before respawning after a boot failure
+    max_failures : int
+        Boot failures in a row before the pool gives up
+    """
+
+    def __init__(self, warm=2, max_games=8, max_queue=16, options=(), on_started=None,
+                 backoff=0.5, max_backoff=30.0, max_failures=5):
+        self.warm = warm
+        self.on_started = on_started
+        self.max_games = max_games
+        self.max_queue = max_queue
+        self.options = tuple(options)
+        self.ctx = multiprocessing.get_context('spawn')
+        self.lock = threading.Lock()
+        self.booting = {}      # process -> conn, still importing
+        self.idle = collections.deque()   # (process, conn), ready for a job
+        self.running = {}      # process -> (conn, username, n_disks, n_pegs, extra, submitted)
+        self.pending = collections.deque()  # (username, n_disks, n_pegs, extra, submitted)
+        self.launched = 0
+        self.rejected = 0
+        self.latencies = collections.deque(maxlen=1000)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_failures = max_failures
+        self.failures = 0      # boot failures in a row
+        self.respawn_at = 0.0  # no spawning before this (perf_counter)
+        self.healthy = True
+        self.closed = False
+        self._wake_r, self._wake_w = multiprocessing.Pipe(duplex=False)
+        self.monitor = None
+
+    # -----------------------------
+    # Lifecycle
+    # -----------------------------
+    def start(self):
+        with self.lock:
+            self._top_up()
+        self.monitor = threading.Thread(target=self._monitor, name='game-pool', daemon=True)
+        self.monitor.start()
+        atexit.register(self.shutdown)
+        return self
+
+    def shutdown(self):
+        """Stop idle and booting workers. Games already running are left open."""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            for process, conn in list(self.idle):
+                try:
+                    conn.send(None)
+                except OSError:     # died since the monitor last looked
+                    pass
+            for process in list(self.booting):
+                process.terminate()
+            self.idle.clear()
+            self.booting.clear()
+            self.pending.clear()
+        self._wake()
+
+    # -----------------------------
+    # Launching
+    # -----------------------------
+    def submit(self, username, n_disks, n_pegs=3, extra=()):
+        """
+        Start a game. Returns 'started', 'queued', 'rejected' (pool
+        full) or 'unavailable' (workers keep failing to boot).
+        `extra` holds --flags for this game only (e.g. a challenge).
+        """
+        extra = tuple(extra)
+        submitted = time.perf_counter()
+        with self.lock:
+            if self.closed:
+                self.rejected += 1
+                return 'rejected'
+            if not self.healthy:
+                self.rejected += 1
+                return 'unavailable'
+            if len(self.running) < self.max_games and self.idle:
+                self._dispatch(username, n_disks, n_pegs, extra, submitted)
+                return 'started'
+            if len(self.pending) < self.max_queue:
+                self.pending.append((username, n_disks, n_pegs, extra, submitted))
+                self._top_up()
+                return 'queued'
+            self.rejected += 1
+            return 'rejected'
+
+    def _dispatch(self, username, n_disks, n_pegs, extra, submitted):
+        # Caller holds the lock
+        process, conn = self.idle.popleft()
+        conn.send((username, n_disks, n_pegs, extra))
+        self.running[process] = (conn, username, n_disks, n_pegs, extra, submitted)
+        self.launched += 1
+        self._wake()        # watch its pipe for 'started'
+        self._top_up()
+
+    def _drain_pending(self):
+        # Caller holds the lock
+        while self.pending and self.idle and len(self.running) < self.max_games:
+            self._dispatch(*self.pending.popleft())
+
+    def _top_up(self):
+        # Caller holds the lock
+        if self.closed or not self.healthy or time.perf_counter() < self.respawn_at:
+            return
+        spawned = False
+        while len(self.idle) + len(self.booting) < max(self.warm, len(self.pending)):
+            if len(self.running) + len(self.idle) + len(self.booting) >= self.max_games + self.warm:
+                break
+            parent, child = self.ctx.Pipe()
+            process = self.ctx.Process(target=_worker_main, args=(child, self.options),
+                                       name='hanoi-game')
+            with _without_main():
+                process.start()
+            child.close()
+            self.booting[process] = parent
+            spawned = True
+        if spawned:
+            self._wake()    # so the monitor watches the new workers
+
+    def _wake(self):
+        try:
+            self._wake_w.send_bytes(b'')
+        except OSError:
+            pass
+
+    # -----------------------------
+    # Monitor thread
+    # -----------------------------
+    def _monitor(self):
+        while True:
+            with self.lock:
+                if self.closed and not self.running:
+                    return
+                watch = {self._wake_r: ('wake', None)}
+                for process, conn in self.booting.items():
+                    watch[conn] = ('booting', process)
+                    watch[process.sentinel] = ('exit', process)
+                for process, conn in self.idle:
+                    watch[process.sentinel] = ('exit', process)
+                for process, (conn, *_) in self.running.items():
+                    watch[conn] = ('running', process)
+                    watch[process.sentinel] = ('exit', process)
+                # Wake up when a boot-failure backoff runs out
+                delay = self.respawn_at - time.perf_counter() if self.healthy and not self.closed else -1
+            for ready in wait(list(watch), timeout=delay if delay > 0 else None):
+                kind, process = watch[ready]
+                if kind == 'wake':
+                    self._wake_r.recv_bytes()
+                    continue
+                with self.lock:
+                    if kind == 'exit':
+                        self._reap(process)
+                    else:
+                        self._receive(kind, process, ready)
+                    self._drain_pending()
+            with self.lock:
+                self._top_up()
+
+    def _receive(self, kind, process, conn):
+        # Caller holds the lock
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            self._reap(process)
+            return
+        if kind == 'booting' and message == 'ready' and process in self.booting:
+            del self.booting[process]
+            self.idle.append((process, conn))
+            self.failures = 0
+        elif kind == 'running' and message == 'started' and process in self.running:
+            latency = time.perf_counter() - self.running[process][-1]
+            self.latencies.append(latency)
+            if self.on_started is not None:
+                self.on_started(latency)
+
+    def _reap(self, process):
+        # Caller holds the lock
+        process.join(0)
+        if self.booting.pop(process, None) is not None and not self.closed:
+            self._boot_failed(process)
+        self.running.pop(process, None)
+        self.idle = collections.deque(item for item in self.idle if item[0] is not process)
+        self._top_up()
+
+    def _boot_failed(self, process):
+        # Caller holds the lock
+        process.join(0.5)   # its pipe can close a moment before it exits
+        self.failures += 1
+        if self.failures >= self.max_failures:
+            self.healthy = False
+            self.rejected += len(self.pending)
+            self.pending.clear()
+            log.error("Game workers failed to boot %d times in a row (last exit code %s); "
+                      "launcher disabled", self.failures, process.exitcode)
+            return
+        delay = min(self.backoff * 2 ** (self.failures - 1), self.max_backoff)
+        self.respawn_at = time.perf_counter() + delay
+        log.warning("Game worker exited while booting (exit code %s), retrying in %.1fs",
+                    process.exitcode, delay)
+
+    # -----------------------------
+    # Stats
+    # -----------------------------
+    def stats(self):
+        """Return pool occupancy and launch latency (ms) as a dict."""
+        with self.lock:
+            last = self.latencies[-1] if self.latencies else None
+            latencies = sorted(self.latencies)
+            stats = {
+                'warm_idle': len(self.idle),
+                'booting': len(self.booting),
+                'running': len(self.running),
+                'queued': len(self.pending),
+                'max_games': self.max_games,
+                'launched': self.launched,
+                'rejected': self.rejected,
+                'healthy': self.healthy,
+                'boot_failures': self.failures,
+            }
+        if latencies:
+            stats['latency_ms'] = {
+                'last': round(last*1000, 3),
+                'p50': round(latencies[len(latencies)//2]*1000, 3),
+                'max': round(latencies[-1]*1000, 3),
+            }
+        return stats
@@ -0,0 +1,143 @@
+# ===============================================
+# Tower of Hanoi - Logging
+# ===============================================
+# Leveled, per-subsystem loggers under 'hanoi'. Records are
+# put on a queue and written by a listener thread, so the
+# game loop and request threads never wait on stdout.
+#
+# Environment:
+#   HANOI_LOG_LEVEL    default level (INFO)
+#   HANOI_LOG_LEVELS   per subsystem, e.g. "game.moves=DEBUG,web.pages=DEBUG"
+#   HANOI_LOG_SAMPLE   keep 1 in N records, e.g. "game.moves=10"
+# ===============================================
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+ROOT = 'hanoi'
+LOG_FORMAT = '%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+MAX_QUEUE = 10000
+
+_listener = None
+_handler = None
+_lock = threading.Lock()
+
+
+def get_logger(subsystem):
+    """Logger for one part of the app, e.g. get_logger('game.moves') -> 'hanoi.game.moves'."""
+    return logging.getLogger(f"{ROOT}.{subsystem}")
+
+
+# -----------------------------
+# Class: SampleFilter
+# Purpose: Keep 1 in `every` records from each call site
+# -----------------------------
+class SampleFilter(logging.Filter):
+    """
+    For high-frequency events (moves, menu presses). Counts are kept
+    per source line, so sampling one message never hides another.
+    Warnings and errors always pass.
+    """
+
+    def __init__(self, every):
+        super().__init__()
+        self.every = max(1, every)
+        self.counts = {}
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.pathname, record.lineno)
+        count = self.counts.get(key, 0)
+        self.counts[key] = count + 1
+        return count % self.every == 0
+
+
+# -----------------------------
+# Class: DroppingQueueHandler
+# Purpose: Queue handler that drops instead of blocking or erroring
+# -----------------------------
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _parse(spec):
+    """'a=1,b=2' -> {'a': '1', 'b': '2'}"""
+    pairs = (item.split('=', 1) for item in spec.split(',') if '=' in item)
+    return {name.strip(): value.strip() for name, value in pairs}
+
+
+# -----------------------------
+# Function: configure
+# Purpose: Route every 'hanoi' logger through one queue (once per process)
+# -----------------------------
+def configure(level=None, levels=None, sample=None, stream=None):
+    """
+    Set up levels, sampling and the queue handler; later calls are
+    ignored. Arguments left as None come from the environment.
+
+    Parameters:
+    level : str
+        Level of the 'hanoi' logger (e.g. 'INFO')
+    levels : dict
+        Subsystem -> level overrides
+    sample : dict
+        Subsystem -> N, keep one in N records logged on that subsystem
+    stream : file
+        Where the listener writes (default stdout)
+    """
+    global _listener, _handler
+    with _lock:
+        root = logging.getLogger(ROOT)
+        if _listener is not None:
+            return root
+        level = level or os.environ.get('HANOI_LOG_LEVEL', 'INFO')
+        levels = _parse(os.environ.get('HANOI_LOG_LEVELS', '')) if levels is None else levels
+        sample = _parse(os.environ.get('HANOI_LOG_SAMPLE', '')) if sample is None else sample
+
+        root.setLevel(level.upper())
+        for name, value in levels.items():
+            get_logger(name).setLevel(value.upper())
+        for name, every in sample.items():
+            get_logger(name).addFilter(SampleFilter(int(every)))
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(logging.Formatter(LOG_FORMAT))
+        log_queue = queue.Queue(MAX_QUEUE)
+        _handler = DroppingQueueHandler(log_queue)
+        root.addHandler(_handler)
+        root.propagate = False
+        _listener = logging.handlers.QueueListener(log_queue, output)
+        _listener.start()
+        atexit.register(shutdown)
+        return root
+
+
+def shutdown():
+    """Write out everything still queued and stop the listener thread."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+            logging.getLogger(ROOT).removeHandler(_handler)
+
+
+def stats():
+    """Records dropped because the queue was full, and records still queued."""
+    if _handler is None:
+        return {'dropped': 0, 'queued': 0}
+    return {'dropped': _handler.dropped, 'queued': _handler.queue.qsize()}
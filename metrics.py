@@ -0,0 +1,206 @@
+# ===============================================
+# Tower of Hanoi - Prometheus Metrics
+# ===============================================
+# Request counts, error counts and latency histograms for
+# every Flask route, plus game-launch telemetry, served on
+# /metrics in the Prometheus text format. No client
+# library needed; recording a request is one bisect and
+# a few integer increments under a lock.
+# ===============================================
+
+import bisect
+import threading
+import time
+
+from flask import Response, g, request
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; fine at the low end, where cached pages and API calls land
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# -----------------------------
+# Class: Counter
+# Purpose: Monotonic count per label set
+# -----------------------------
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self.lock:
+            items = list(self.values.items())
+        for values, count in items:
+            yield self.name, _labels(self.labels, values), count
+
+
+# -----------------------------
+# Class: Histogram
+# Purpose: Bucketed distribution per label set
+# -----------------------------
+class Histogram:
+    """
+    Each label set keeps one count per bucket (not cumulative, so an
+    observation touches one slot); cumulative counts are built when
+    /metrics is scraped.
+    """
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.series = {}    # label values -> [bucket counts..., +Inf count, sum]
+        self.lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        slot = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[slot] += 1
+            series[-1] += value
+
+    def samples(self):
+        with self.lock:
+            items = [(values, list(series)) for values, series in self.series.items()]
+        for values, series in items:
+            running = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series):
+                running += count
+                yield (f'{self.name}_bucket', _labels(self.labels, values, f'le="{_number(bound)}"'),
+                       running)
+            yield f'{self.name}_sum', _labels(self.labels, values), round(series[-1], 6)
+            yield f'{self.name}_count', _labels(self.labels, values), running
+
+
+# -----------------------------
+# Class: Collected
+# Purpose: Gauge or counter read from elsewhere when scraped
+# -----------------------------
+class Collected:
+    """
+    `read()` returns a number, a {label value: number} dict (for one
+    label) or None to skip the metric, e.g. while the launcher pool has
+    not been started.
+    """
+
+    def __init__(self, name, help_text, read, kind='gauge', label=None):
+        self.name = name
+        self.help = help_text
+        self.read = read
+        self.kind = kind
+        self.label = label
+
+    def samples(self):
+        value = self.read()
+        if value is None:
+            return
+        if isinstance(value, dict):
+            for key, number in value.items():
+                yield self.name, _labels((self.label,), (key,)), number
+        else:
+            yield self.name, '', value
+
+
+# -----------------------------
+# Class: Registry
+# Purpose: Every metric, rendered in the text exposition format
+# -----------------------------
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self.add(Counter(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        return self.add(Histogram(name, help_text, labels, buckets))
+
+    def collect(self, name, help_text, read, kind='gauge', label=None):
+        return self.add(Collected(name, help_text, read, kind, label))
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+# -----------------------------
+# Function: instrument
+# Purpose: Time every request and serve /metrics
+# -----------------------------
+def instrument(app, registry, path='/metrics'):
+    """
+    Adds request hooks that count and time every route, labelled by
+    endpoint (the view function's name, so the label set stays small
+    whatever the URLs), method and status, and registers `path`.
+    Responses from error handlers and unhandled exceptions (500s) pass
+    through the same hook, so they are counted too.
+    """
+    requests = registry.counter('hanoi_http_requests_total', 'HTTP requests',
+                                ('endpoint', 'method', 'status'))
+    errors = registry.counter('hanoi_http_errors_total', 'HTTP responses with a 5xx status',
+                              ('endpoint',))
+    latency = registry.histogram('hanoi_http_request_duration_seconds', 'Time spent handling a request',
+                                 ('endpoint', 'method'))
+    clock = time.perf_counter
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = clock()
+
+    @app.after_request
+    def _record(response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            endpoint = request.endpoint or 'unmatched'
+            latency.observe(clock() - started, endpoint, request.method)
+            requests.inc(endpoint, request.method, response.status_code)
+            if response.status_code >= 500:
+                errors.inc(endpoint)
+        return response
+
+    def serve_metrics():
+        return Response(registry.render(), content_type=CONTENT_TYPE)
+
+    app.add_url_rule(path, 'metrics', serve_metrics)
+    return registry
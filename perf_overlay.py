@@ -0,0 +1,141 @@
+# ===============================================
+# Tower of Hanoi - In-game Performance Overlay & Profiler
+# ===============================================
+# Per-frame phase timing for the O key overlay, and a
+# cProfile capture of the next N frames for the P key,
+# so frame drops can be diagnosed on a player's machine.
+# ===============================================
+
+import collections
+import cProfile
+import io
+import os
+import pstats
+import time
+
+# The towers are pre-rendered into the renderer's background, so their
+# phase is the time spent restoring that layer under changed regions
+PHASES = ('events', 'logic', 'towers', 'disks', 'text', 'flip')
+PROFILE_DIR = os.environ.get('HANOI_PROFILE_DIR', '.')
+
+
+# -----------------------------
+# Class: FrameStats
+# Purpose: Time each phase of every loop iteration
+# -----------------------------
+class FrameStats:
+    """
+    begin() starts a frame, mark(phase) adds the time since the last
+    mark to that phase, skip() drops time that isn't work (waiting for
+    input) and end() files the frame. Keeps the last `window` frames
+    for rolling averages; FPS counts rendered frames over the last
+    second of wall-clock time.
+
+    Parameters:
+    window : int
+        Frames kept for averages and the maximum
+    """
+
+    def __init__(self, window=120):
+        self.frames = collections.deque(maxlen=window)     # (total, {phase: seconds})
+        self.rendered_at = collections.deque()
+        self.current = None
+        self.last = 0.0
+
+    def begin(self):
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.current[phase] += now - self.last
+        self.last = now
+
+    def shift(self, src, dst, seconds):
+        """Move time measured inside one phase (e.g. display.update within render) to another."""
+        seconds = min(seconds, self.current[src])
+        self.current[src] -= seconds
+        self.current[dst] += seconds
+
+    def skip(self):
+        self.last = time.perf_counter()
+
+    def end(self, rendered):
+        self.frames.append((sum(self.current.values()), self.current))
+        if rendered:
+            now = time.perf_counter()
+            self.rendered_at.append(now)
+            while self.rendered_at and now - self.rendered_at[0] > 1.0:
+                self.rendered_at.popleft()
+
+    def fps(self):
+        return len(self.rendered_at)
+
+    def summary(self):
+        """Last and rolling frame times, and rolling per-phase averages, in ms."""
+        if not self.frames:
+            return None
+        totals = [total for total, _ in self.frames]
+        count = len(self.frames)
+        return {
+            'last_ms': totals[-1] * 1000,
+            'avg_ms': sum(totals) / count * 1000,
+            'max_ms': max(totals) * 1000,
+            'phases_ms': {phase: sum(p[phase] for _, p in self.frames) / count * 1000 for phase in PHASES},
+        }
+
+
+# -----------------------------
+# Class: FrameProfiler
+# Purpose: cProfile the next N frames and save the stats
+# -----------------------------
+class FrameProfiler:
+    """
+    start(frames) enables cProfile; frame_done() counts frames and,
+    after the last one, writes a .prof file (open it with pstats or
+    snakeviz) and returns its path with a short text summary.
+
+    Parameters:
+    directory : str
+        Where captures are written (HANOI_PROFILE_DIR, default '.')
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or PROFILE_DIR
+        self.profile = None
+        self.remaining = 0
+        self.frames = 0        # frames asked for
+        self.captured = 0      # frames actually profiled (fewer if stopped early)
+
+    @property
+    def active(self):
+        return self.profile is not None
+
+    def start(self, frames=120):
+        if self.active:
+            return
+        self.remaining = frames
+        self.frames = frames
+        self.captured = 0
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def frame_done(self):
+        """Returns (path, summary) once the capture is finished, else None."""
+        if not self.active:
+            return None
+        self.remaining -= 1
+        self.captured += 1
+        if self.remaining > 0:
+            return None
+        return self.stop()
+
+    def stop(self):
+        profile, self.profile = self.profile, None
+        profile.disable()
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, time.strftime('hanoi_profile_%Y%m%d_%H%M%S.prof'))
+        profile.dump_stats(path)
+        text = io.StringIO()
+        pstats.Stats(profile, stream=text).sort_stats('cumulative').print_stats(15)
+        return path, text.getvalue()
@@ -0,0 +1,132 @@
+# ===============================================
+# Tower of Hanoi - Dirty-Rect Renderer
+# ===============================================
+# Keeps a pre-rendered background and only repaints and
+# pushes the screen regions whose contents changed.
+# ===============================================
+
+import time
+
+import pygame
+
+
+# -----------------------------
+# Class: DirtyRenderer
+# Purpose: Layered background + dynamic items, partial updates
+# -----------------------------
+class DirtyRenderer:
+    """
+    Two-layer renderer: a static background surface drawn once, and
+    dynamic items (disks, pointer, labels) that are repainted only when
+    their rect or signature changes.
+
+    Each item is a tuple (key, rect, signature, paint) where paint is a
+    callable taking the target surface. Items that did not change since
+    the last frame cost one tuple comparison.
+
+    Each render() also records where its time went: restoring the
+    background, painting items (per group, when `group` is given) and
+    pushing pixels to the display.
+
+    Parameters:
+    screen : pygame.Surface
+        Display surface
+    background : pygame.Surface
+        Pre-rendered static layer, same size as screen
+    group : callable
+        group(key) -> name under which an item's paint time is added up
+    """
+
+    def __init__(self, screen, background, group=None):
+        self.screen = screen
+        self.background = background
+        self.group = group
+        self.drawn = {}            # key -> (rect tuple, signature) last frame
+        self.full_redraw = True
+        self.frames_updated = 0
+        self.frames_skipped = 0
+        self.pixels_updated = 0
+        self.update_seconds = 0.0  # time spent in display.flip/update last frame
+        self.background_seconds = 0.0   # time restoring the static layer last frame
+        self.paint_seconds = {}    # group -> time painting its items last frame
+
+    def invalidate(self):
+        """Force a full repaint on the next render (e.g. after a menu)."""
+        self.drawn = {}
+        self.full_redraw = True
+
+    def render(self, items):
+        """
+        Repaint changed items and push only the dirty regions.
+
+        Returns the list of rects passed to pygame.display.update.
+        """
+        self.update_seconds = 0.0
+        self.background_seconds = 0.0
+        self.paint_seconds = {}
+        if self.full_redraw:
+            started = time.perf_counter()
+            self.screen.blit(self.background, (0, 0))
+            self.background_seconds = time.perf_counter() - started
+            for key, rect, sig, paint in items:
+                self._paint(key, paint)
+                self.drawn[key] = (tuple(rect), sig)
+            started = time.perf_counter()
+            pygame.display.flip()
+            self.update_seconds = time.perf_counter() - started
+            self.full_redraw = False
+            self.frames_updated += 1
+            self.pixels_updated += self.screen.get_width() * self.screen.get_height()
+            return [self.screen.get_rect()]
+
+        dirty = []
+        current = {}
+        for key, rect, sig, paint in items:
+            entry = (tuple(rect), sig)
+            current[key] = entry
+            old = self.drawn.get(key)
+            if old != entry:
+                if old is not None:
+                    dirty.append(pygame.Rect(old[0]))
+                dirty.append(pygame.Rect(rect))
+        for key, old in self.drawn.items():
+            if key not in current:
+                dirty.append(pygame.Rect(old[0]))
+        self.drawn = current
+
+        if not dirty:
+            self.frames_skipped += 1
+            return dirty
+
+        # Erase dirty regions back to the background, then repaint every
+        # item that touches one of them so overlaps stay correct.
+        started = time.perf_counter()
+        for rect in dirty:
+            self.screen.blit(self.background, rect, rect)
+        self.background_seconds = time.perf_counter() - started
+        for key, rect, sig, paint in items:
+            if pygame.Rect(rect).collidelist(dirty) != -1:
+                self._paint(key, paint)
+        started = time.perf_counter()
+        pygame.display.update(dirty)
+        self.update_seconds = time.perf_counter() - started
+        self.frames_updated += 1
+        self.pixels_updated += sum(rect.width * rect.height for rect in dirty)
+        return dirty
+
+    def _paint(self, key, paint):
+        if self.group is None:
+            paint(self.screen)
+            return
+        started = time.perf_counter()
+        paint(self.screen)
+        name = self.group(key)
+        self.paint_seconds[name] = self.paint_seconds.get(name, 0.0) + time.perf_counter() - started
+
+    def stats(self):
+        """Return renderer counters as a dict."""
+        return {
+            'frames_updated': self.frames_updated,
+            'frames_skipped': self.frames_skipped,
+            'pixels_updated': self.pixels_updated,
+        }
@@ -0,0 +1,310 @@
+# ===============================================
+# Tower of Hanoi - Compact Replay Format
+# ===============================================
+# Every move is one of 6 peg pairs and is stored in 3 bits.
+# Encoding and decoding both stream, so replays of millions
+# of moves never need to be held as Python lists.
+#
+# Layout:
+#   header  'HR' | version | flags | n_disks [| n_pegs]   (5-6 bytes)
+#   body    bit stream, optionally deflated:
+#           per move: 3-bit code [+ Elias-gamma(delta_ms + 1) if timed]
+#           end:      3-bit code 7, then zero padding to a byte
+# Games with more than 3 pegs set FLAG_PEGS, add the n_pegs byte and
+# use wider codes: one per (src, dst) pair, all-ones marks the end.
+#
+# Size: untimed replays are 3 bits per move (solve(20), 2^20 - 1 moves,
+# is ~3.2 KB of base64url). Timing is not cheap: a gap of g ms costs
+# 2*bit_length(g+1) - 1 bits, so human play (0.2-1.5 s between moves)
+# averages ~22 bits per move and does not deflate. Timed replays go in
+# POST bodies; URLs carry the untimed form (to_base64(..., timed=False)).
+# ===============================================
+
+import base64
+import itertools
+import zlib
+from collections import namedtuple
+
+from solver import MAX_PEGS
+
+MAGIC = b'HR'
+VERSION = 1
+FLAG_TIMED = 0x01
+FLAG_DEFLATE = 0x02
+FLAG_PEGS = 0x04
+END_CODE = 7
+
+ReplayHeader = namedtuple('ReplayHeader', 'n_disks timed n_pegs')
+MoveCodes = namedtuple('MoveCodes', 'codes width end bits_moves end_bits')
+
+
+# -----------------------------
+# Function: move_codes
+# Purpose: Code table for k pegs (cached)
+# -----------------------------
+_code_tables = {}
+
+
+def move_codes(n_pegs=3):
+    """
+    (src, dst) pairs numbered in order, in the narrowest width that
+    still leaves the all-ones code free as the end marker.
+    For 3 pegs this is the 3-bit table with end code 7.
+    """
+    table = _code_tables.get(n_pegs)
+    if table is None:
+        pairs = [(a, b) for a in range(n_pegs) for b in range(n_pegs) if a != b]
+        codes = {pair: code for code, pair in enumerate(pairs)}
+        width = len(pairs).bit_length()
+        end = (1 << width) - 1
+        bits_moves = {format(code, f'0{width}b'): pair for pair, code in codes.items()}
+        table = _code_tables[n_pegs] = MoveCodes(codes, width, end, bits_moves,
+                                                 format(end, f'0{width}b'))
+    return table
+
+
+# (src, dst) <-> 3-bit code for the standard 3-peg game
+MOVE_CODES = move_codes(3).codes
+
+
+# -----------------------------
+# Class: ReplayWriter
+# Purpose: Incremental encoder, ~3 bits of memory per move
+# -----------------------------
+class ReplayWriter:
+    """
+    Appends moves to a packed buffer as they are played. Memory and
+    output are 3 bits per move untimed, ~22 bits per move with human
+    timing (see the size note at the top of this module).
+
+    Parameters:
+    n_disks : int
+        Number of disks in the game
+    timed : bool
+        Also store the milliseconds since the previous move
+    n_pegs : int
+        Number of pegs in the game
+    """
+
+    def __init__(self, n_disks, timed=True, n_pegs=3):
+        self.n_disks = n_disks
+        self.timed = timed
+        self.n_pegs = n_pegs
+        self.table = move_codes(n_pegs)
+        self.buffer = bytearray()
+        self.acc = 0        # pending bits, most significant first
+        self.nbits = 0
+        self.moves = 0
+
+    def _put(self, value, width):
+        self.acc = (self.acc << width) | value
+        self.nbits += width
+        if self.nbits >= 64:
+            spare = self.nbits % 8
+            self.buffer += (self.acc >> spare).to_bytes((self.nbits - spare) // 8, 'big')
+            self.acc &= (1 << spare) - 1
+            self.nbits = spare
+
+    def add(self, src, dst, delta_ms=0):
+        """Append one move. Raises KeyError for an impossible peg pair."""
+        self._put(self.table.codes[(src, dst)], self.table.width)
+        if self.timed:
+            value = max(0, int(delta_ms)) + 1
+            length = value.bit_length()
+            self._put(value, 2*length - 1)     # (length-1) zeros, then value
+        self.moves += 1
+
+    def take(self):
+        """Return and clear the whole bytes encoded so far."""
+        spare = self.nbits % 8
+        chunk = bytes(self.buffer)
+        if self.nbits - spare:
+            chunk += (self.acc >> spare).to_bytes((self.nbits - spare) // 8, 'big')
+            self.acc &= (1 << spare) - 1
+            self.nbits = spare
+        self.buffer.clear()
+        return chunk
+
+    def finish(self):
+        """Write the end marker and pad; return the remaining bytes."""
+        self._put(self.table.end, self.table.width)
+        if self.nbits % 8:
+            self._put(0, 8 - self.nbits % 8)
+        return self.take()
+
+    def header(self, deflate=False):
+        flags = (FLAG_TIMED if self.timed else 0) | (FLAG_DEFLATE if deflate else 0)
+        if self.n_pegs != 3:
+            return MAGIC + bytes([VERSION, flags | FLAG_PEGS, self.n_disks, self.n_pegs])
+        return MAGIC + bytes([VERSION, flags, self.n_disks])
+
+    def to_bytes(self, deflate=True, timed=None):
+        """
+        Complete replay (header + body) of everything added so far.
+        timed=False drops the timing of a timed writer (re-encoded,
+        streaming) for the short URL form.
+        """
+        if self.timed and timed is False:
+            _, moves = decode(self.to_bytes(deflate=False))
+            return b''.join(encode(self.n_disks, ((src, dst) for src, dst, _ in moves),
+                                   deflate=deflate, n_pegs=self.n_pegs))
+        copy = ReplayWriter(self.n_disks, self.timed, self.n_pegs)
+        copy.buffer, copy.acc, copy.nbits = bytearray(self.buffer), self.acc, self.nbits
+        body = copy.finish()
+        return self.header(deflate) + (zlib.compress(body, 9) if deflate else body)
+
+
+# -----------------------------
+# Function: encode
+# Purpose: Streaming encoder over any move iterable
+# -----------------------------
+def encode(n_disks, moves, timed=False, deflate=True, chunk_size=65536, n_pegs=3):
+    """
+    Generator of byte chunks for a replay.
+
+    moves yields (src, dst) or, when timed, (src, dst, delta_ms).
+    """
+    writer = ReplayWriter(n_disks, timed, n_pegs)
+    compressor = zlib.compressobj(9) if deflate else None
+    yield writer.header(deflate)
+    for move in moves:
+        writer.add(*move)
+        if len(writer.buffer) >= chunk_size:
+            chunk = writer.take()
+            chunk = compressor.compress(chunk) if compressor else chunk
+            if chunk:
+                yield chunk
+    tail = writer.finish()
+    if compressor:
+        tail = compressor.compress(tail) + compressor.flush()
+    yield tail
+
+
+# -----------------------------
+# Function: decode
+# Purpose: Streaming decoder over byte chunks
+# -----------------------------
+def decode(chunks):
+    """
+    Decode a replay from an iterable of byte chunks (or one bytes object).
+
+    Returns (ReplayHeader, moves) where moves is a generator of
+    (src, dst, delta_ms) tuples; delta_ms is 0 for untimed replays.
+    Raises ValueError for a malformed replay.
+    """
+    if isinstance(chunks, (bytes, bytearray)):
+        chunks = [chunks]
+    chunks = iter(chunks)
+    head = b''
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= 6:
+            break
+    if len(head) < 5 or head[:2] != MAGIC or head[2] != VERSION:
+        raise ValueError("Not a Tower of Hanoi replay")
+    flags, n_disks = head[3], head[4]
+    size, n_pegs = 5, 3
+    if flags & FLAG_PEGS:
+        if len(head) < 6 or not 3 <= head[5] <= MAX_PEGS:
+            raise ValueError("Bad peg count in replay header")
+        size, n_pegs = 6, head[5]
+    header = ReplayHeader(n_disks, bool(flags & FLAG_TIMED), n_pegs)
+
+    def body():
+        rest = head[size:]
+        if flags & FLAG_DEFLATE:
+            # Bounded output per call, so a tiny input cannot balloon in memory
+            decompressor = zlib.decompressobj()
+            for chunk in itertools.chain([rest], chunks):
+                while chunk:
+                    yield decompressor.decompress(chunk, 65536)
+                    chunk = decompressor.unconsumed_tail
+            yield decompressor.flush()
+        else:
+            if rest:
+                yield rest
+            yield from chunks
+
+    return header, _read_moves(body(), header.timed, move_codes(n_pegs))
+
+
+def _read_moves(body, timed, table):
+    """
+    Parse the bit stream held as a '0'/'1' string, refilled one chunk
+    at a time, so slicing and str.find do the bit work in C.
+    """
+    width, bits_moves, end_bits = table.width, table.bits_moves, table.end_bits
+    source = iter(body)
+    bits = ''
+    pos = 0
+
+    def more():
+        nonlocal bits, pos
+        for chunk in source:
+            if chunk:
+                bits = bits[pos:] + format(int.from_bytes(chunk, 'big'), f'0{8*len(chunk)}b')
+                pos = 0
+                return
+        raise ValueError("Replay ended without an end marker")
+
+    if not timed:
+        # Fixed-width codes: slice whole chunks at once
+        while True:
+            end = pos + (len(bits) - pos) // width * width
+            for code in [bits[i:i+width] for i in range(pos, end, width)]:
+                move = bits_moves.get(code)
+                if move is None:
+                    if code == end_bits:
+                        return
+                    raise ValueError(f"Invalid move code {int(code, 2)}")
+                yield move[0], move[1], 0
+            pos = end
+            more()
+
+    while True:
+        while pos + width > len(bits):
+            more()
+        code = bits[pos:pos+width]
+        move = bits_moves.get(code)
+        if move is None:
+            if code == end_bits:
+                return
+            raise ValueError(f"Invalid move code {int(code, 2)}")
+        pos += width
+        delta = 0
+        if timed:
+            # Elias gamma: `zeros` zero bits, then a (zeros+1)-bit value
+            one = bits.find('1', pos)
+            while one < 0:
+                scanned = len(bits) - pos
+                more()
+                one = bits.find('1', scanned)
+            zeros = one - pos
+            while pos + 2*zeros + 1 > len(bits):
+                more()
+            delta = int(bits[pos+zeros:pos+2*zeros+1], 2) - 1
+            pos += 2*zeros + 1
+        yield move[0], move[1], delta
+
+
+# -----------------------------
+# Functions: to_base64 / from_base64
+# Purpose: URL-safe text form for query strings and POST bodies
+# -----------------------------
+def to_base64(data, timed=None):
+    """
+    base64url text (no padding) for replay bytes or a ReplayWriter;
+    timed=False leaves a writer's timing out (see ReplayWriter.to_bytes).
+    """
+    if isinstance(data, ReplayWriter):
+        data = data.to_bytes(timed=timed)
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def from_base64(text):
+    """Decode base64url text; returns (ReplayHeader, moves generator)."""
+    try:
+        data = base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid replay text: {e}")
+    return decode(data)
@@ -0,0 +1,219 @@
+# ===============================================
+# Tower of Hanoi - Game-to-Server Result Channel
+# ===============================================
+# The game POSTs its result and replay straight to the
+# Flask app over local HTTP, retrying with backoff; the
+# server queues it and verifies and records it on a
+# background thread.
+# ===============================================
+
+import atexit
+import collections
+import json
+import queue
+import secrets
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from logs import get_logger
+
+log = get_logger('results')
+
+
+def new_result_id():
+    """Random id the game attaches to its result, so every retry and fallback names the same game."""
+    return secrets.token_urlsafe(12)
+
+
+def _valid_id(value):
+    return (isinstance(value, str) and 8 <= len(value) <= 64
+            and all(c.isascii() and (c.isalnum() or c in '-_') for c in value))
+
+
+# -----------------------------
+# Class: ResultReporter
+# Purpose: Game side - send one result in the background
+# -----------------------------
+class ResultReporter:
+    """
+    Starts sending as soon as it is created, so the request overlaps
+    with whatever the game does next (the win screen, speech). wait()
+    returns the server's reply ({'id': ...}) as soon as it arrives, or
+    None if every attempt failed.
+
+    Connection errors and 5xx replies are retried with exponential
+    backoff; a 4xx reply means the server rejected the result and is
+    not retried. The payload carries a result id (`.id`) made here, so
+    an attempt that timed out after the server stored it, or a late
+    delivery racing the game-over page's fallback, is recognised as the
+    same game and not saved twice.
+
+    Parameters:
+    url : str
+        Result endpoint, e.g. http://127.0.0.1:5000/api/results
+    payload : dict
+        JSON body (username, replay, ...)
+    retries : int
+        Attempts after the first one
+    backoff : float
+        Seconds before the first retry, doubled after each one
+    timeout : float
+        Seconds allowed per attempt
+    """
+
+    def __init__(self, url, payload, retries=4, backoff=0.1, timeout=2.0):
+        self.url = url
+        payload = dict(payload, id=payload.get('id') or new_result_id())
+        self.id = payload['id']
+        self.data = json.dumps(payload).encode('utf-8')
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.response = None
+        self.error = None
+        self.attempts = 0
+        self.done = threading.Event()
+        threading.Thread(target=self._send, name='result-reporter', daemon=True).start()
+
+    def _send(self):
+        delay = self.backoff
+        try:
+            for attempt in range(self.retries + 1):
+                self.attempts += 1
+                request = urllib.request.Request(self.url, self.data, {'Content-Type': 'application/json'})
+                try:
+                    with urllib.request.urlopen(request, timeout=self.timeout) as reply:
+                        self.response = json.load(reply)
+                    self.error = None
+                    return
+                except urllib.error.HTTPError as e:
+                    self.error = e
+                    if e.code < 500:
+                        return
+                except (OSError, ValueError) as e:
+                    self.error = e
+                if attempt < self.retries:
+                    time.sleep(delay)
+                    delay *= 2
+        finally:
+            self.done.set()
+
+    def wait(self, timeout=None):
+        """Block until the result is delivered or given up on. Returns the reply or None."""
+        self.done.wait(timeout)
+        return self.response
+
+
+# -----------------------------
+# Class: ResultInbox
+# Purpose: Server side - queue results and ingest them off the request path
+# -----------------------------
+class ResultInbox:
+    """
+    submit() queues the result under the id the game sent (or a new
+    one) and returns at once, so the game's POST is answered without
+    waiting on verification or the database; an id that is still
+    queued or remembered is a retry and is not queued again. A
+    background thread passes each payload to `handler` and keeps the
+    last `keep` outcomes, which get() can wait for (the game-over page
+    uses this to show the verified move count).
+
+    Parameters:
+    handler : callable
+        handler(payload) -> outcome, run on the ingest thread
+    max_queue : int
+        Results allowed to wait for the ingest thread
+    keep : int
+        Outcomes remembered for get()
+    put_timeout : float
+        Seconds submit() waits for queue space
+    """
+
+    def __init__(self, handler, max_queue=1000, keep=1000, put_timeout=0.05):
+        self.handler = handler
+        self.keep = keep
+        self.put_timeout = put_timeout
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.pending = set()
+        self.outcomes = collections.OrderedDict()
+        self.ready = threading.Condition()
+        self.received = 0
+        self.ingested = 0
+        self.failed = 0
+        self.dropped = 0
+        self.duplicates = 0
+        self.last_ingest_ms = 0.0
+        self.closed = False
+        self.worker = threading.Thread(target=self._ingest_loop, name='result-inbox', daemon=True)
+        self.worker.start()
+        atexit.register(self.close)
+
+    def submit(self, payload):
+        """Queue one result. Returns its id, or None if the queue is full."""
+        result_id = payload.get('id')
+        if not _valid_id(result_id):
+            result_id = new_result_id()
+        payload['id'] = result_id
+        with self.ready:
+            if result_id in self.pending or result_id in self.outcomes:
+                self.duplicates += 1
+                return result_id
+            self.pending.add(result_id)
+        try:
+            self.queue.put((result_id, payload), timeout=self.put_timeout)
+        except queue.Full:
+            with self.ready:
+                self.pending.discard(result_id)
+            self.dropped += 1
+            return None
+        self.received += 1
+        return result_id
+
+    def get(self, result_id, timeout=0):
+        """Outcome for an id, waiting up to `timeout` seconds if it is still queued."""
+        with self.ready:
+            self.ready.wait_for(lambda: result_id not in self.pending, timeout)
+            return self.outcomes.get(result_id)
+
+    def close(self, timeout=5):
+        """Ingest everything still queued, then stop the thread."""
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.worker.join(timeout)
+
+    def _ingest_loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            result_id, payload = item
+            started = time.perf_counter()
+            try:
+                outcome = self.handler(payload)
+                self.ingested += 1
+            except Exception as e:
+                log.exception("⚠ Could not ingest result %s -> %s", result_id, e)
+                outcome = None
+                self.failed += 1
+            self.last_ingest_ms = (time.perf_counter() - started) * 1000
+            with self.ready:
+                self.pending.discard(result_id)
+                self.outcomes[result_id] = outcome
+                while len(self.outcomes) > self.keep:
+                    self.outcomes.popitem(last=False)
+                self.ready.notify_all()
+
+    def stats(self):
+        return {
+            'received': self.received,
+            'ingested': self.ingested,
+            'failed': self.failed,
+            'dropped': self.dropped,
+            'duplicates': self.duplicates,
+            'queued': self.queue.qsize(),
+            'last_ingest_ms': round(self.last_ingest_ms, 3),
+        }
@@ -0,0 +1,250 @@
+# ===============================================
+# Tower of Hanoi - Results Store (SQLite)
+# ===============================================
+# Records finished games with write-behind batching and
+# serves leaderboards and per-disk aggregates from a cache.
+# ===============================================
+
+import atexit
+import collections
+import queue
+import sqlite3
+import threading
+import time
+
+from engine import MAX_DISKS
+from solver import min_moves_pegs, MAX_PEGS
+from logs import get_logger
+
+log = get_logger('results')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL,
+    disks INTEGER NOT NULL,
+    moves INTEGER NOT NULL,
+    created REAL NOT NULL,
+    pegs INTEGER NOT NULL DEFAULT 3,
+    result_key TEXT
+);
+
+-- Histogram of move counts per (pegs, disks), kept up to date on insert so
+-- aggregates never have to scan the results table.
+CREATE TABLE IF NOT EXISTS move_counts (
+    pegs INTEGER NOT NULL DEFAULT 3,
+    disks INTEGER NOT NULL,
+    moves INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    PRIMARY KEY (pegs, disks, moves)
+);
+
+CREATE INDEX IF NOT EXISTS idx_results_pegs_disks_moves_created
+    ON results (pegs, disks, moves, created);
+-- One row per finished game, however often it is reported (NULLs don't clash)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_results_result_key ON results (result_key);
+"""
+
+# -----------------------------
+# Class: ResultsStore
+# Purpose: Write-behind SQLite store for finished games
+# -----------------------------
+class ResultsStore:
+    """
+    record() only puts the result on a queue; a writer thread inserts
+    queued results in batches (one transaction each) and then drops the
+    read cache, so leaderboard and aggregate reads are served from memory
+    until the next batch lands. A result recorded with a key that is
+    already stored (the same game reported twice) is skipped.
+
+    Parameters:
+    path : str
+        SQLite database file
+    batch_size : int
+        Most results written per transaction
+    flush_interval : float
+        Seconds the writer waits to fill a batch
+    """
+
+    def __init__(self, path, batch_size=500, flush_interval=0.25):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+        self.local = threading.local()
+        self.cache = {}
+        self.cache_version = 0
+        self.cache_lock = threading.Lock()
+        self.written = 0
+        self.duplicates = 0
+        self.batches = 0
+        self.closed = False
+
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+        self.writer = threading.Thread(target=self._write_loop, name='results-writer', daemon=True)
+        self.writer.start()
+        # Registered before the result inbox is created, so at exit the
+        # inbox hands over its last results before this flushes them
+        atexit.register(self.close)
+
+    # -----------------------------
+    # Connections
+    # -----------------------------
+    def _connect(self):
+        """Return this thread's connection (WAL, so reads never block the writer)."""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self.local.conn = conn
+        return conn
+
+    # -----------------------------
+    # Writes
+    # -----------------------------
+    def record(self, username, disks, moves, created=None, pegs=3, key=None):
+        """
+        Queue one finished game. Returns immediately. `key` identifies
+        the game; a second result with the same key is not saved.
+        """
+        self.queue.put((username, int(disks), int(moves), created or time.time(), int(pegs), key))
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far has been written."""
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5):
+        """Flush pending results and stop the writer."""
+        if self.closed:
+            return
+        self.closed = True
+        self.flush(timeout)
+        self.queue.put(None)
+        self.writer.join(timeout)
+
+    def _write_loop(self):
+        conn = self._connect()
+        running = True
+        while running:
+            batch, waiters = [], []
+            item = self.queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if not running or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self._write_batch(conn, batch)
+                except sqlite3.Error as e:
+                    log.error("⚠ Could not save %d results -> %s", len(batch), e)
+            for waiter in waiters:
+                waiter.set()
+
+    def _write_batch(self, conn, batch):
+        with conn:
+            # Row by row, so games whose key is already stored (rowcount 0)
+            # stay out of the move_counts histogram too
+            inserted = [row for row in batch if conn.execute(
+                'INSERT OR IGNORE INTO results (username, disks, moves, created, pegs, result_key) '
+                'VALUES (?, ?, ?, ?, ?, ?)', row).rowcount]
+            counts = collections.Counter((pegs, disks, moves) for _, disks, moves, _, pegs, _ in inserted)
+            conn.executemany(
+                'INSERT INTO move_counts (pegs, disks, moves, games) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (pegs, disks, moves) DO UPDATE SET games = games + excluded.games',
+                [key + (games,) for key, games in counts.items()])
+        self.written += len(inserted)
+        self.duplicates += len(batch) - len(inserted)
+        self.batches += 1
+        if not inserted:
+            return
+        with self.cache_lock:
+            self.cache.clear()
+            self.cache_version += 1
+
+    # -----------------------------
+    # Reads (cached until the next insert)
+    # -----------------------------
+    def _cached(self, key, compute):
+        with self.cache_lock:
+            if key in self.cache:
+                return self.cache[key]
+            version = self.cache_version
+        value = compute()
+        with self.cache_lock:
+            # Don't cache a result computed before a newer batch landed
+            if version == self.cache_version:
+                self.cache[key] = value
+        return value
+
+    def leaderboard(self, disks, limit=10, pegs=3):
+        """Fewest-move results for a disk and peg count, earliest first on ties."""
+        def compute():
+            rows = self._connect().execute(
+                'SELECT username, moves, created FROM results WHERE pegs = ? AND disks = ? '
+                'ORDER BY moves, created LIMIT ?', (pegs, disks, limit)).fetchall()
+            return [{'username': u, 'moves': m, 'created': c} for u, m, c in rows]
+        return self._cached(('leaderboard', pegs, disks, limit), compute)
+
+    def aggregates(self):
+        """
+        Per (pegs, disks): games, best, median, p90, p99 and % optimal,
+        computed from the move_counts histogram.
+        """
+        def compute():
+            rows = self._connect().execute(
+                'SELECT pegs, disks, moves, games FROM move_counts '
+                'ORDER BY pegs, disks, moves').fetchall()
+            per_game = collections.defaultdict(list)
+            for pegs, disks, moves, games in rows:
+                # Rows no game could produce (edited by hand, say) are left out
+                if not (1 <= disks <= MAX_DISKS and 3 <= pegs <= MAX_PEGS):
+                    continue
+                per_game[(pegs, disks)].append((moves, games))
+            return [_summarise(disks, hist, pegs)
+                    for (pegs, disks), hist in sorted(per_game.items())]
+        return self._cached(('aggregates',), compute)
+
+
+# -----------------------------
+# Function: _summarise
+# Purpose: Stats for one disk/peg count from its (moves, games) histogram
+# -----------------------------
+def _summarise(disks, histogram, pegs=3):
+    total = sum(games for _, games in histogram)
+
+    def percentile(pct):
+        rank = max(1, -(-total * pct // 100))   # nearest-rank, ceil
+        seen = 0
+        for moves, games in histogram:
+            seen += games
+            if seen >= rank:
+                return moves
+        return histogram[-1][0]
+
+    optimal = sum(games for moves, games in histogram if moves == min_moves_pegs(disks, pegs))
+    return {
+        'pegs': pegs,
+        'disks': disks,
+        'games': total,
+        'best': histogram[0][0],
+        'median': percentile(50),
+        'p90': percentile(90),
+        'p99': percentile(99),
+        'optimal_pct': round(100.0 * optimal / total, 1),
+    }
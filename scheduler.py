@@ -0,0 +1,93 @@
+# ===============================================
+# Tower of Hanoi - Frame Scheduler
+# ===============================================
+# Sleeps on the event queue while nothing is moving and
+# only runs a fixed frame tick during animations.
+# ===============================================
+
+import time
+
+import pygame
+
+
+# -----------------------------
+# Class: FrameScheduler
+# Purpose: Event-driven loop pacing with frame accounting
+# -----------------------------
+class FrameScheduler:
+    """
+    Replaces a fixed clock.tick(fps) loop.
+
+    While idle, events() blocks in pygame.event.wait until input arrives
+    (or idle_timeout ms pass), so an untouched window uses no CPU.
+    While animating (see start_animation), it ticks at a fixed fps.
+
+    Parameters:
+    fps : int
+        Frame rate used while animating
+    idle_timeout : int
+        Longest time in ms to block while idle (0 blocks until an event)
+    """
+
+    def __init__(self, fps=60, idle_timeout=1000):
+        self.fps = fps
+        self.idle_timeout = idle_timeout
+        self.clock = pygame.time.Clock()
+        self.animations = 0
+        self.wakeups = 0
+        self.idle_wakeups = 0
+        self.frames_rendered = 0
+        self.frames_unchanged = 0
+        self.idle_seconds = 0.0
+
+    # -----------------------------
+    # Animation mode
+    # -----------------------------
+    @property
+    def animating(self):
+        return self.animations > 0
+
+    def start_animation(self):
+        """Switch to fixed-rate ticking until stop_animation is called."""
+        if not self.animations:
+            self.clock.tick()  # reset so the first tick does not stall
+        self.animations += 1
+
+    def stop_animation(self):
+        self.animations = max(0, self.animations - 1)
+
+    # -----------------------------
+    # Loop pacing
+    # -----------------------------
+    def events(self):
+        """Wait for the next frame and return the pending events."""
+        self.wakeups += 1
+        if self.animating:
+            self.clock.tick(self.fps)
+            return pygame.event.get()
+        self.idle_wakeups += 1
+        started = time.perf_counter()
+        event = pygame.event.wait(self.idle_timeout)
+        self.idle_seconds += time.perf_counter() - started
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def frame_done(self, rendered):
+        """Record whether the last loop iteration actually drew anything."""
+        if rendered:
+            self.frames_rendered += 1
+        else:
+            self.frames_unchanged += 1
+
+    def stats(self):
+        """
+        Return counters as a dict. ticks_skipped is how many fixed-rate
+        ticks the idle waits replaced compared with a plain fps loop.
+        """
+        return {
+            'wakeups': self.wakeups,
+            'frames_rendered': self.frames_rendered,
+            'frames_unchanged': self.frames_unchanged,
+            'ticks_skipped': max(0, int(self.idle_seconds * self.fps) - self.idle_wakeups),
+        }
@@ -0,0 +1,188 @@
+# ===============================================
+# Tower of Hanoi - Production Server
+# ===============================================
+# Serves app.py without the debugger or reloader: each
+# worker process answers requests on a fixed-size thread
+# pool, and several workers can share one listening socket.
+#
+# Usage:
+#   python serve.py [--host 0.0.0.0] [--port 8000] [--workers 1] [--threads 16]
+#   python serve.py --no-launch        (load testing: don't open game windows)
+# ===============================================
+
+import argparse
+import os
+import signal
+import socket
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer, select_address_family
+
+
+# -----------------------------
+# Class: PooledWSGIServer
+# Purpose: Werkzeug server that handles connections on a bounded thread pool
+# -----------------------------
+class PooledWSGIServer(BaseWSGIServer):
+    """
+    Werkzeug's threaded server starts a new thread per connection with
+    no upper bound; this one hands connections to `threads` long-lived
+    threads and lets the rest wait in the listen backlog. Responses are
+    HTTP/1.1, but werkzeug sends `Connection: close` on every one, so
+    there is no keep-alive and each request takes a pool thread only
+    while it is being answered.
+
+    Parameters:
+    host, port : str, int
+        Address to listen on (ignored when `fd` is given)
+    app : WSGI application
+        Application to serve
+    threads : int
+        Connections handled at the same time
+    fd : int
+        Already-listening socket to serve from (shared by workers)
+    """
+
+    multithread = True
+    request_queue_size = 1024
+
+    def __init__(self, host, port, app, threads=16, fd=None):
+        super().__init__(host, port, app, fd=fd)
+        self.pool = ThreadPoolExecutor(threads, thread_name_prefix='http')
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        if hasattr(self, 'pool'):
+            self.pool.shutdown(wait=False)
+
+
+# -----------------------------
+# Function: load_app
+# Purpose: Import and prepare the Flask app for production
+# -----------------------------
+def load_app(log_level=None, launch_games=True, warm=True, server_url=None):
+    """
+    Import app.py (after the log level is set, since it configures
+    logging on import), turn off debug, and warm the page cache and the
+    game launcher pool so the first visitor doesn't pay for them.
+    server_url is where launched games report (HANOI_SERVER_URL wins).
+    """
+    os.environ['HANOI_LOG_LEVEL'] = log_level or os.environ.get('HANOI_LOG_LEVEL', 'WARNING')
+    import logging
+    import app as hanoi
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)    # no per-request access lines
+    hanoi.app.debug = False
+    hanoi.app.config['LAUNCH_GAMES'] = launch_games
+    if server_url and 'HANOI_SERVER_URL' not in os.environ:
+        hanoi.app.config['SERVER_URL'] = server_url
+    if warm:
+        hanoi.page_cache.warm(hanoi.CACHED_PAGES)
+        if launch_games:
+            hanoi.get_game_pool()
+    return hanoi.app
+
+
+# -----------------------------
+# Function: listen
+# Purpose: Bind the socket every worker accepts from
+# -----------------------------
+def listen(host, port):
+    family = select_address_family(host, port)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(PooledWSGIServer.request_queue_size)
+    sock.set_inheritable(True)
+    return sock
+
+
+# -----------------------------
+# Function: local_url
+# Purpose: URL games on this machine use to reach the bound socket
+# -----------------------------
+def local_url(sock):
+    host, port = sock.getsockname()[:2]
+    host = {'0.0.0.0': '127.0.0.1', '::': '::1'}.get(host, host)   # wildcard -> loopback
+    if ':' in host:
+        host = f"[{host}]"
+    return f"http://{host}:{port}"
+
+
+# -----------------------------
+# Function: run_worker
+# Purpose: Body of one worker process
+# -----------------------------
+def run_worker(sock, args):
+    # The app (and its background threads) is imported here, after the
+    # fork, so every worker gets its own writer threads and caches
+    app = load_app(args.log_level, not args.no_launch, server_url=local_url(sock))
+    server = PooledWSGIServer(args.host, args.port, app, args.threads, fd=sock.fileno())
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Tower of Hanoi in production mode")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=1,
+                        help="worker processes (POSIX only); hosted game sessions live "
+                             "in one worker, so use threads if the session API is in use")
+    parser.add_argument('--threads', type=int, default=16, help="request threads per worker")
+    parser.add_argument('--log-level', default=None,
+                        help="app log level (default: HANOI_LOG_LEVEL, else WARNING)")
+    parser.add_argument('--no-launch', action='store_true',
+                        help="accept Start Game without opening a game window (load testing)")
+    args = parser.parse_args(argv)
+
+    sock = listen(args.host, args.port)
+    print(f"Serving Tower of Hanoi on http://{args.host}:{sock.getsockname()[1]}/ "
+          f"with {args.workers} worker(s) x {args.threads} threads")
+    if args.workers <= 1 or not hasattr(os, 'fork'):
+        run_worker(sock, args)
+        return
+
+    children = []
+    for _ in range(args.workers):
+        pid = os.fork()
+        if pid == 0:
+            run_worker(sock, args)
+            sys.exit(0)     # normal exit, so queued results and feedback are flushed
+        children.append(pid)
+    sock.close()
+
+    def stop(*_):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        stop()
+        for pid in children:
+            os.waitpid(pid, 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+# ===============================================
+# Tower of Hanoi - Server-side Game Sessions
+# ===============================================
+# In-memory store of games played through the JSON API,
+# with idle sessions evicted after a time-to-live.
+# ===============================================
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from engine import HanoiState
+from solver import MAX_PEGS
+
+
+# -----------------------------
+# Class: GameSession
+# Purpose: One hosted game (player + engine state)
+# -----------------------------
+class GameSession:
+    __slots__ = ('id', 'username', 'state', 'created', 'touched')
+
+    def __init__(self, session_id, username, n_disks, now, n_pegs=3):
+        self.id = session_id
+        self.username = username
+        self.state = HanoiState(n_disks, goal=n_pegs - 1, n_pegs=n_pegs)
+        self.created = now
+        self.touched = now
+
+    def to_dict(self):
+        state = self.state
+        return {
+            'id': self.id,
+            'username': self.username,
+            'disks': state.n_disks,
+            'towers': state.n_pegs,
+            'pegs': state.pegs,
+            'steps': state.steps,
+            'won': state.is_won(),
+        }
+
+
+# -----------------------------
+# Class: SessionStore
+# Purpose: Thread-safe session map with TTL eviction
+# -----------------------------
+class SessionStore:
+    """
+    Keeps sessions in an OrderedDict ordered by last use, so expired
+    sessions are always at the front and eviction only looks at the
+    sessions it removes.
+
+    Parameters:
+    ttl : float
+        Seconds a session may sit unused before it is evicted
+    max_sessions : int
+        Hard cap; the least recently used session is evicted beyond it
+    """
+
+    def __init__(self, ttl=1800, max_sessions=100000):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def create(self, username, n_disks, n_pegs=3):
+        """Start a new game. Raises ValueError for a bad disk or peg count."""
+        if not 3 <= n_pegs <= MAX_PEGS:
+            raise ValueError(f"n_pegs must be between 3 and {MAX_PEGS}, got {n_pegs}")
+        now = time.monotonic()
+        session = GameSession(secrets.token_urlsafe(12), username, n_disks, now, n_pegs)
+        with self.lock:
+            self._evict(now)
+            self.sessions[session.id] = session
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+                self.evicted += 1
+        return session
+
+    def get(self, session_id):
+        """Return the live session or None if unknown/expired."""
+        now = time.monotonic()
+        with self.lock:
+            self._evict(now)
+            session = self.sessions.get(session_id)
+            if session is not None:
+                session.touched = now
+                self.sessions.move_to_end(session_id)
+            return session
+
+    def move(self, session_id, src, dst):
+        """
+        Apply a move. Returns the session, or None if it does not exist.
+        Raises ValueError for an illegal move.
+        """
+        now = time.monotonic()
+        with self.lock:
+            self._evict(now)
+            session = self.sessions.get(session_id)
+            if session is None:
+                return None
+            session.touched = now
+            self.sessions.move_to_end(session_id)
+            session.state.move(src, dst)
+            return session
+
+    def delete(self, session_id):
+        with self.lock:
+            return self.sessions.pop(session_id, None) is not None
+
+    def _evict(self, now):
+        # Caller holds the lock
+        sessions = self.sessions
+        deadline = now - self.ttl
+        while sessions:
+            session = next(iter(sessions.values()))
+            if session.touched > deadline:
+                break
+            sessions.popitem(last=False)
+            self.evicted += 1
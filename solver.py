@@ -0,0 +1,286 @@
+# ===============================================
+# Tower of Hanoi - Optimal Solver
+# ===============================================
+# Streams the optimal move sequence without recursion
+# and gives random access to any move or position.
+# ===============================================
+
+from engine import HanoiState, START_PEG, FINISH_PEG, MAX_DISKS
+
+
+# -----------------------------
+# Function: min_moves
+# Purpose: Minimum number of moves for n disks
+# -----------------------------
+def min_moves(n_disks):
+    return (1 << n_disks) - 1
+
+
+# -----------------------------
+# Function: _peg_map
+# Purpose: Map the bit-trick's fixed pegs onto start/goal
+# -----------------------------
+def _peg_map(n_disks, start, goal):
+    """
+    The bit formula below always moves the tower from peg 0 to peg 2
+    when n is odd and from peg 0 to peg 1 when n is even, so return
+    a tuple translating its pegs onto the requested start and goal.
+    """
+    _check(n_disks, start, goal)
+    aux = 3 - start - goal
+    if n_disks % 2:
+        return (start, aux, goal)
+    return (start, goal, aux)
+
+
+def _check(n_disks, start, goal):
+    if not 1 <= n_disks <= MAX_DISKS:
+        raise ValueError(f"n_disks must be between 1 and {MAX_DISKS}, got {n_disks}")
+    if start == goal or not (0 <= start < 3 and 0 <= goal < 3):
+        raise ValueError(f"Invalid start/goal pegs {start} -> {goal}")
+
+
+# -----------------------------
+# Function: solve
+# Purpose: Lazily yield the optimal move sequence
+# -----------------------------
+def solve(n_disks, start=START_PEG, goal=FINISH_PEG):
+    """
+    Generator over the optimal solution as (src, dst) peg pairs.
+
+    Uses the move-number bit trick, so memory is O(1) and the
+    sequence for n=64 can be consumed for as long as needed.
+
+    Parameters:
+    n_disks : int
+        Number of disks
+    start : int
+        Peg the tower starts on
+    goal : int
+        Peg the tower must end on
+    """
+    pegs = _peg_map(n_disks, start, goal)
+    for m in range(1, 1 << n_disks):
+        yield pegs[(m & (m - 1)) % 3], pegs[((m | (m - 1)) + 1) % 3]
+
+
+# -----------------------------
+# Function: nth_move
+# Purpose: Random access to move k of the optimal solution
+# -----------------------------
+def nth_move(n_disks, k, start=START_PEG, goal=FINISH_PEG):
+    """
+    Return move k (1-based) of the optimal solution as (disk, src, dst).
+
+    The disk moved is one plus the number of trailing zero bits of k.
+    """
+    pegs = _peg_map(n_disks, start, goal)
+    if not 1 <= k <= min_moves(n_disks):
+        raise ValueError(f"Move {k} is outside 1..{min_moves(n_disks)}")
+    disk = (k & -k).bit_length()
+    return disk, pegs[(k & (k - 1)) % 3], pegs[((k | (k - 1)) + 1) % 3]
+
+
+# -----------------------------
+# Function: state_after
+# Purpose: Board state after k optimal moves, in O(n)
+# -----------------------------
+def state_after(n_disks, k, start=START_PEG, goal=FINISH_PEG):
+    """
+    Return the HanoiState reached after the first k optimal moves.
+
+    Walks from the largest disk down: in the first half of a
+    sub-solution the disk is still on its source peg, in the second
+    half it has already moved to its destination.
+    """
+    _check(n_disks, start, goal)
+    if not 0 <= k <= min_moves(n_disks):
+        raise ValueError(f"Move {k} is outside 0..{min_moves(n_disks)}")
+    src, dst, aux = start, goal, 3 - start - goal
+    locations = [0] * n_disks
+    remaining = k
+    for disk in range(n_disks, 0, -1):
+        half = 1 << (disk - 1)
+        if remaining < half:
+            locations[disk-1] = src
+            dst, aux = aux, dst
+        else:
+            locations[disk-1] = dst
+            remaining -= half
+            src, aux = aux, src
+    state = HanoiState.from_locations(locations, goal=goal)
+    state.steps = k
+    return state
+
+
+# -----------------------------
+# Function: _gather
+# Purpose: Moves to stack disks 1..k on one peg, and the first of them
+# -----------------------------
+def _gather(locations, k, peg):
+    distance, first = 0, None
+    for disk in range(k, 0, -1):
+        at = locations[disk-1]
+        if at != peg:
+            distance += 1 << (disk - 1)
+            first = (at, peg)
+            peg = 3 - at - peg
+    return distance, first
+
+
+# -----------------------------
+# Function: plan_between
+# Purpose: Shortest path between two arbitrary 3-peg boards, in O(n)
+# -----------------------------
+def plan_between(source, target):
+    """
+    Return (distance, first move or None) from one board to another.
+    Boards are peg-per-disk sequences, smallest disk first.
+
+    Disks larger than the largest one that differs never move. That
+    disk moves either once (the smaller disks wait on the third peg)
+    or twice, via the third peg; both costs come from _gather and the
+    shorter one wins.
+    """
+    if len(source) != len(target):
+        raise ValueError("Boards have different numbers of disks")
+    for disk in range(len(source), 0, -1):
+        a, b = source[disk-1], target[disk-1]
+        if a != b:
+            break
+    else:
+        return 0, None
+    c = 3 - a - b
+    small = disk - 1
+    there, first_once = _gather(source, small, c)
+    back, _ = _gather(target, small, c)
+    once = there + 1 + back
+    there, first_twice = _gather(source, small, b)
+    back, _ = _gather(target, small, a)
+    twice = there + 1 + ((1 << small) - 1) + 1 + back
+    if once <= twice:
+        return once, first_once or (a, b)
+    return twice, first_twice or (a, c)
+
+
+# ===============================================
+# Multi-peg (k >= 3) solver: Frame-Stewart
+# ===============================================
+MAX_PEGS = 10
+
+# Memoised tables per peg count: _fs_moves[k][n] is the Frame-Stewart
+# move count for n disks on k pegs, _fs_split[k][n] the number of top
+# disks parked on an intermediate peg. Tables only ever grow, so every
+# request after the first is a lookup.
+_fs_moves = {}
+_fs_split = {}
+
+
+# -----------------------------
+# Function: _fs_extend
+# Purpose: Grow the Frame-Stewart tables for k pegs up to n disks
+# -----------------------------
+def _fs_extend(n_disks, n_pegs):
+    """
+    T(n, 3) = 2^n - 1
+    T(n, k) = min over 1 <= t < n of 2*T(t, k) + T(n-t, k-1)
+
+    Both terms are convex in t and the best t never decreases as n
+    grows, so each new n resumes the search at the previous best split
+    and only walks forward while the cost keeps dropping: O(n) per
+    peg count instead of O(n^2).
+    """
+    if n_pegs == 3:
+        moves = _fs_moves.setdefault(3, [0])
+        split = _fs_split.setdefault(3, [0])
+        for n in range(len(moves), n_disks + 1):
+            moves.append((1 << n) - 1)
+            split.append(n - 1)
+        return
+    _fs_extend(n_disks, n_pegs - 1)
+    below = _fs_moves[n_pegs - 1]
+    moves = _fs_moves.setdefault(n_pegs, [0, 1])
+    split = _fs_split.setdefault(n_pegs, [0, 0])
+    for n in range(len(moves), n_disks + 1):
+        t = max(1, split[n-1])
+        best = 2*moves[t] + below[n-t]
+        while t + 1 < n:
+            cost = 2*moves[t+1] + below[n-t-1]
+            if cost > best:
+                break
+            t, best = t + 1, cost
+        moves.append(best)
+        split.append(t)
+
+
+def _check_pegs(n_disks, n_pegs):
+    if not 3 <= n_pegs <= MAX_PEGS:
+        raise ValueError(f"n_pegs must be between 3 and {MAX_PEGS}, got {n_pegs}")
+    if n_disks < 0:
+        raise ValueError(f"n_disks must not be negative, got {n_disks}")
+
+
+# -----------------------------
+# Function: min_moves_pegs
+# Purpose: Frame-Stewart move count for n disks on k pegs
+# -----------------------------
+def min_moves_pegs(n_disks, n_pegs=3):
+    """
+    Move count of the Frame-Stewart solution (proven optimal for 3 and
+    4 pegs, conjectured optimal above that).
+    """
+    _check_pegs(n_disks, n_pegs)
+    if n_pegs == 3:
+        return min_moves(n_disks)
+    if len(_fs_moves.get(n_pegs, ())) <= n_disks:
+        _fs_extend(n_disks, n_pegs)
+    return _fs_moves[n_pegs][n_disks]
+
+
+# -----------------------------
+# Function: _solve3
+# Purpose: Bit-trick solution on three arbitrary peg labels
+# -----------------------------
+def _solve3(n_disks, src, dst, aux):
+    pegs = (src, aux, dst) if n_disks % 2 else (src, dst, aux)
+    for m in range(1, 1 << n_disks):
+        yield pegs[(m & (m - 1)) % 3], pegs[((m | (m - 1)) + 1) % 3]
+
+
+# -----------------------------
+# Function: solve_pegs
+# Purpose: Lazily yield the Frame-Stewart move sequence
+# -----------------------------
+def solve_pegs(n_disks, n_pegs=3, start=START_PEG, goal=None):
+    """
+    Generator over (src, dst) moves taking n disks from `start` to
+    `goal` (default: the last peg) using n_pegs pegs.
+
+    Uses an explicit stack of sub-problems rather than recursion; each
+    sub-problem left with three pegs is streamed with the bit trick.
+    """
+    _check_pegs(n_disks, n_pegs)
+    goal = n_pegs - 1 if goal is None else goal
+    if start == goal or not (0 <= start < n_pegs and 0 <= goal < n_pegs):
+        raise ValueError(f"Invalid start/goal pegs {start} -> {goal}")
+    min_moves_pegs(n_disks, n_pegs)   # make sure the split tables are built
+
+    stack = [(n_disks, start, goal, tuple(range(n_pegs)))]
+    while stack:
+        n, src, dst, pegs = stack.pop()
+        if n == 0:
+            continue
+        if n == 1:
+            yield src, dst
+            continue
+        spare = [p for p in pegs if p != src and p != dst]
+        if len(pegs) == 3:
+            yield from _solve3(n, src, dst, spare[0])
+            continue
+        t = _fs_split[len(pegs)][n]
+        park = spare[0]
+        rest = tuple(p for p in pegs if p != park)
+        # pushed in reverse: park t disks, move the rest, bring the t back
+        stack.append((t, park, dst, pegs))
+        stack.append((n - t, src, dst, rest))
+        stack.append((t, src, park, pegs))
@@ -0,0 +1,73 @@
+# ===============================================
+# Tower of Hanoi - Background Speech
+# ===============================================
+# Text-to-speech on a worker thread so announcements
+# never hold up the game window.
+# ===============================================
+
+import queue
+import threading
+import time
+
+from logs import get_logger
+
+log = get_logger('speech')
+
+
+# -----------------------------
+# Class: Announcer
+# Purpose: Queue announcements for a lazily started TTS worker
+# -----------------------------
+class Announcer:
+    """
+    Speaks queued announcements on a daemon thread.
+
+    pyttsx3 is imported and initialised by the worker on the first
+    announcement, so neither the import nor engine start-up delays the
+    first frame. With enabled=False every call is a no-op.
+
+    Parameters:
+    enabled : bool
+        Turn speech on or off
+    on_ready : callable
+        Called with the engine start-up time in seconds once pyttsx3 is ready
+    """
+
+    def __init__(self, enabled=True, on_ready=None):
+        self.enabled = enabled
+        self.on_ready = on_ready
+        self.queue = queue.Queue()
+        self.thread = None
+
+    def say(self, text):
+        """Queue text to be spoken; returns immediately."""
+        if not self.enabled:
+            return
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name='tts', daemon=True)
+            self.thread.start()
+        self.queue.put(text)
+
+    def close(self, timeout=None):
+        """Let queued announcements finish (up to timeout seconds)."""
+        if self.thread is None:
+            return
+        self.queue.put(None)
+        self.thread.join(timeout)
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            import pyttsx3
+            engine = pyttsx3.init()
+        except Exception as e:
+            log.warning("Speech disabled: %s", e)
+            return
+        if self.on_ready:
+            self.on_ready(time.perf_counter() - started)
+        while True:
+            text = self.queue.get()
+            if text is None:
+                break
+            engine.say(text)
+            engine.runAndWait()
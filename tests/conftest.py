@@ -0,0 +1,14 @@
+# ===============================================
+# Tower of Hanoi - Test Setup
+# ===============================================
+# Puts the project folder on sys.path so the tests import
+# the modules the same way app.py does.
+#
+# Usage:
+#   python -m pytest tests
+# ===============================================
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
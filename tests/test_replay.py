@@ -0,0 +1,66 @@
+# ===============================================
+# Tower of Hanoi - Replay Format Tests
+# ===============================================
+# Encode/decode round-trips for the compact replay format.
+# ===============================================
+
+import pytest
+
+from replay import ReplayWriter, decode, encode, from_base64, to_base64
+from solver import solve, solve_pegs
+
+
+def _played(n_disks, n_pegs=3):
+    """Optimal moves with made-up human timing: (src, dst, delta_ms)."""
+    moves = solve(n_disks) if n_pegs == 3 else solve_pegs(n_disks, n_pegs)
+    return [(src, dst, 150 + 37*i % 1800) for i, (src, dst) in enumerate(moves)]
+
+
+@pytest.mark.parametrize('deflate', [True, False])
+@pytest.mark.parametrize('n_pegs', [3, 4, 10])
+def test_timed_writer_round_trip(n_pegs, deflate):
+    moves = _played(6, n_pegs)
+    writer = ReplayWriter(6, n_pegs=n_pegs)
+    for move in moves:
+        writer.add(*move)
+    header, decoded = decode(writer.to_bytes(deflate=deflate))
+    assert (header.n_disks, header.timed, header.n_pegs) == (6, True, n_pegs)
+    assert list(decoded) == moves
+
+
+@pytest.mark.parametrize('n_pegs', [3, 5])
+def test_untimed_stream_round_trip(n_pegs):
+    moves = [(src, dst) for src, dst, _ in _played(7, n_pegs)]
+    data = b''.join(encode(7, moves, chunk_size=16, n_pegs=n_pegs))
+    header, decoded = decode(data)
+    assert (header.n_disks, header.timed, header.n_pegs) == (7, False, n_pegs)
+    assert list(decoded) == [(src, dst, 0) for src, dst in moves]
+
+
+def test_untimed_url_form_drops_timing():
+    moves = _played(5)
+    writer = ReplayWriter(5)
+    for move in moves:
+        writer.add(*move)
+    header, decoded = from_base64(to_base64(writer, timed=False))
+    assert not header.timed
+    assert list(decoded) == [(src, dst, 0) for src, dst, _ in moves]
+    # and the timed text form keeps it
+    assert list(from_base64(to_base64(writer))[1]) == moves
+
+
+def test_empty_replay_round_trip():
+    header, decoded = decode(ReplayWriter(3, timed=False).to_bytes())
+    assert header.n_disks == 3
+    assert list(decoded) == []
+
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'XX\x01\x00\x03',
+    ReplayWriter(3, n_pegs=11).header(),
+    ReplayWriter(3, timed=False).to_bytes(deflate=False)[:-1],
+])
+def test_malformed_replays_raise(data):
+    with pytest.raises(ValueError):
+        list(decode(data)[1])
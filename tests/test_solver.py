@@ -0,0 +1,62 @@
+# ===============================================
+# Tower of Hanoi - Multi-peg Solver Tests
+# ===============================================
+# Frame-Stewart move counts against a brute-force search,
+# and the moves solve_pegs generates played on the engine.
+# ===============================================
+
+import itertools
+
+import pytest
+
+from engine import HanoiState
+from solver import MAX_PEGS, min_moves_pegs, solve_pegs
+
+
+def _shortest(n_disks, n_pegs):
+    """Breadth-first search from all disks on peg 0 to all on the last peg."""
+    start, goal = (0,) * n_disks, (n_pegs - 1,) * n_disks
+    seen, frontier, depth = {start}, [start], 0
+    while goal not in seen:
+        depth += 1
+        following = []
+        for state in frontier:
+            # state[d] is the peg of disk d, smallest first; the first disk
+            # found on a peg is its top disk
+            tops = {}
+            for disk, peg in enumerate(state):
+                tops.setdefault(peg, disk)
+            for src, disk in tops.items():
+                for dst in range(n_pegs):
+                    if dst != src and tops.get(dst, n_disks) > disk:
+                        moved = state[:disk] + (dst,) + state[disk+1:]
+                        if moved not in seen:
+                            seen.add(moved)
+                            following.append(moved)
+        frontier = following
+    return depth
+
+
+@pytest.mark.parametrize('n_disks, n_pegs', [
+    (n, k) for k, top in ((3, 7), (4, 7), (5, 6), (6, 5)) for n in range(top + 1)
+])
+def test_frame_stewart_matches_brute_force(n_disks, n_pegs):
+    assert min_moves_pegs(n_disks, n_pegs) == _shortest(n_disks, n_pegs)
+
+
+@pytest.mark.parametrize('n_disks, n_pegs', list(itertools.product([1, 4, 9, 15], [3, 4, 5, MAX_PEGS])))
+def test_solve_pegs_plays_a_shortest_game(n_disks, n_pegs):
+    state = HanoiState(n_disks, goal=n_pegs - 1, n_pegs=n_pegs)
+    for src, dst in solve_pegs(n_disks, n_pegs):
+        assert state.can_move(src, dst)
+        state.move(src, dst)
+    assert state.is_won()
+    assert state.steps == min_moves_pegs(n_disks, n_pegs)
+
+
+@pytest.mark.parametrize('n_pegs', [2, MAX_PEGS + 1])
+def test_peg_count_limits(n_pegs):
+    with pytest.raises(ValueError):
+        min_moves_pegs(3, n_pegs)
+    with pytest.raises(ValueError):
+        list(solve_pegs(3, n_pegs))
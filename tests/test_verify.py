@@ -0,0 +1,116 @@
+# ===============================================
+# Tower of Hanoi - Replay Verifier Tests
+# ===============================================
+# verify_replay and verify_batch (NumPy and one-by-one) must
+# agree, reject forged or broken replays, and respect the
+# batch move budget.
+# ===============================================
+
+import pytest
+
+import verify
+from replay import ReplayWriter, encode
+from solver import solve, solve_pegs
+from verify import BatchTooLarge, verify_batch, verify_replay
+
+
+def _replay(n_disks, moves, n_pegs=3):
+    return b''.join(encode(n_disks, moves, n_pegs=n_pegs))
+
+
+def _truncated(n_disks):
+    """A full solution with the end marker cut off."""
+    writer = ReplayWriter(n_disks, timed=False)
+    for src, dst in solve(n_disks):
+        writer.add(src, dst)
+    return writer.to_bytes(deflate=False)[:-1]
+
+
+def _mix():
+    won = [_replay(n, solve(n)) for n in range(1, 9)]
+    pegs = [_replay(n, solve_pegs(n, 4), n_pegs=4) for n in range(3, 7)]
+    forged = [
+        _replay(3, list(solve(3))[:-1]),               # not finished
+        _replay(3, [(0, 2), (0, 2)]),                  # big disk on small
+        _replay(3, list(solve(3)) + [(2, 0)]),         # moves after winning
+        _replay(3, [(0, 1), (1, 0)] + list(solve(3))),  # legal detour: valid
+        _truncated(4),
+        b'not a replay',
+    ]
+    # repeated so the length groups are big enough for the lockstep path
+    return (won + pegs + forged) * verify.MIN_LOCKSTEP
+
+
+@pytest.fixture(params=['numpy', 'engine'])
+def batch_mode(request, monkeypatch):
+    if request.param == 'engine':
+        monkeypatch.setattr(verify, 'np', None)
+    elif verify.np is None:
+        pytest.skip("NumPy is not installed")
+    return request.param
+
+
+def test_batch_agrees_with_single(batch_mode):
+    replays = _mix()
+    assert verify_batch(replays) == [verify_replay(r) for r in replays]
+
+
+def test_valid_replays():
+    for n_disks in (1, 5, 10):
+        result = verify_replay(_replay(n_disks, solve(n_disks)))
+        assert result.ok and result.moves == (1 << n_disks) - 1
+    result = verify_replay(_replay(5, solve_pegs(5, 4), n_pegs=4))
+    assert result.ok and result.n_pegs == 4
+
+
+@pytest.mark.parametrize('replay, reason', [
+    (_replay(3, list(solve(3))[:-1]), "game not finished"),
+    (_replay(3, [(0, 2), (0, 2)]), "illegal move 0->2"),
+    (_replay(3, list(solve(3)) + [(2, 0)]), "moves after the game was won"),
+])
+def test_rejects_forged_games(replay, reason):
+    result = verify_replay(replay)
+    assert not result.ok and result.reason == reason
+
+
+def test_rejects_bad_peg_count():
+    # The header byte allows more pegs than any game is played with
+    header = ReplayWriter(3, timed=False, n_pegs=11).header()
+    body = ReplayWriter(3, timed=False, n_pegs=10).finish()
+    for replays in ([header + body], [header + body] * verify.MIN_LOCKSTEP):
+        assert not any(result.ok for result in verify_batch(replays))
+    result = verify_replay(header + body)
+    assert not result.ok and 'peg' in result.reason
+
+
+def test_rejects_bad_disk_count():
+    result = verify_replay(_replay(0, []))
+    assert not result.ok and result.reason == "bad disk count"
+
+
+def test_rejects_truncated_replay():
+    result = verify_replay(_truncated(6))
+    assert not result.ok and result.reason == "Replay ended without an end marker"
+    assert 0 < result.moves < (1 << 6) - 1    # the moves read before the cut
+
+
+def test_max_moves():
+    result = verify_replay(_replay(6, solve(6)), max_moves=10)
+    assert not result.ok and result.reason == "replay too long"
+
+
+def test_budget_allows_batch_within_it(batch_mode):
+    replays = [_replay(5, solve(5))] * 4
+    assert all(r.ok for r in verify_batch(replays, max_total_moves=4 * 31))
+
+
+def test_budget_exhausted(batch_mode):
+    with pytest.raises(BatchTooLarge):
+        verify_batch([_replay(5, solve(5))] * 4, max_total_moves=4 * 31 - 1)
+
+
+def test_budget_charges_replays_that_fail_to_decode(batch_mode):
+    # Each of these decodes ~1000 moves before failing; they must not be free
+    replays = [_truncated(10)] * 4
+    with pytest.raises(BatchTooLarge):
+        verify_batch(replays, max_total_moves=2000)
@@ -0,0 +1,68 @@
+# ===============================================
+# Tower of Hanoi - Font & Text Surface Cache
+# ===============================================
+# Looks up each SysFont once and keeps rendered text
+# surfaces around so static labels are drawn from cache.
+# ===============================================
+
+from collections import OrderedDict
+
+import pygame
+
+
+# -----------------------------
+# Class: TextCache
+# Purpose: Font registry + LRU cache of rendered text
+# -----------------------------
+class TextCache:
+    """
+    Font registry keyed by (name, size) and an LRU cache of rendered
+    text surfaces keyed by (text, font, color, aa).
+
+    Parameters:
+    maxsize : int
+        Maximum number of rendered surfaces kept
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, name, size):
+        """Return the SysFont for (name, size), loading it on first use."""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.SysFont(name, size)
+        return font
+
+    def render(self, text, font, color, aa=True):
+        """Return the rendered surface for text, rendering it only on a miss."""
+        key = (text, font, tuple(color), aa)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = self.surfaces[key] = font.render(text, aa, color)
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def stats(self):
+        """Return cache counters as a dict."""
+        return {
+            'fonts': len(self.fonts),
+            'surfaces': len(self.surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def clear(self):
+        """Drop every cached font and surface (e.g. after pygame.quit)."""
+        self.fonts.clear()
+        self.surfaces.clear()
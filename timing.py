@@ -0,0 +1,63 @@
+# ===============================================
+# Tower of Hanoi - Startup Timing
+# ===============================================
+# Records how long each launch phase takes so launch
+# latency can be tracked between releases.
+# ===============================================
+
+import json
+import time
+
+
+# -----------------------------
+# Class: PhaseTimer
+# Purpose: Time consecutive named phases
+# -----------------------------
+class PhaseTimer:
+    """
+    Times consecutive phases: each mark(name) closes the phase that
+    started at the previous mark. Extra durations measured elsewhere
+    (e.g. on another thread) can be added with record().
+
+    Parameters:
+    started : float
+        time.perf_counter() value the first phase starts from
+    """
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.last = self.started
+        self.phases = {}
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases[name] = now - self.last
+        self.last = now
+
+    def restart_phase(self):
+        """
+        Start the next phase now, leaving out any gap since the last
+        mark (e.g. a pre-warmed worker waiting for a game) from the
+        phases and from total().
+        """
+        now = time.perf_counter()
+        self.started += now - self.last
+        self.last = now
+
+    def record(self, name, seconds):
+        self.phases[name] = seconds
+
+    def total(self):
+        return self.last - self.started
+
+    def report(self):
+        """Return a one-line summary in milliseconds."""
+        parts = [f"{name} {secs*1000:.1f} ms" for name, secs in self.phases.items()]
+        return ", ".join(parts) + f" (total {self.total()*1000:.1f} ms)"
+
+    def export(self, path):
+        """Write the phases (in ms) to a JSON file."""
+        data = {name: round(secs*1000, 3) for name, secs in self.phases.items()}
+        data['total'] = round(self.total()*1000, 3)
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
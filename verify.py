@@ -0,0 +1,286 @@
+# ===============================================
+# Tower of Hanoi - Replay Verification
+# ===============================================
+# Replays a submitted move log against the rules and
+# recomputes the real step count, one at a time or as a
+# NumPy-vectorised batch.
+# ===============================================
+
+import itertools
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import HanoiState, MAX_DISKS
+from replay import decode, from_base64
+from solver import MAX_PEGS
+
+try:
+    import numpy as np
+except ImportError:   # batch mode falls back to one-by-one verification
+    np = None
+
+# Replays longer than this are rejected outright (2^20 - 1 moves is the
+# optimal game for 20 disks, far beyond anything played by hand).
+MAX_REPLAY_MOVES = 1 << 22
+
+# Padding peg for the batch arrays; no real game has this many pegs
+NO_PEG = 255
+
+# Length groups with fewer replays than this are checked one by one: a
+# lockstep step costs a few NumPy calls whatever the group size, which
+# only pays off when it advances enough replays at once
+MIN_LOCKSTEP = 16
+
+VerifyResult = namedtuple('VerifyResult', 'ok n_disks moves reason n_pegs', defaults=(3,))
+
+
+class BatchTooLarge(ValueError):
+    """A batch holds more moves in total than the caller allowed."""
+
+
+# -----------------------------
+# Function: _open
+# Purpose: Accept base64url text or raw replay bytes
+# -----------------------------
+def _open(replay):
+    if isinstance(replay, str):
+        return from_base64(replay)
+    return decode(replay)
+
+
+# -----------------------------
+# Function: verify_replay
+# Purpose: Check one replay with the engine
+# -----------------------------
+def verify_replay(replay, max_moves=MAX_REPLAY_MOVES):
+    """
+    Replay a move log and check it is a legal, finished game.
+
+    Parameters:
+    replay : str or bytes
+        base64url text or raw replay bytes
+    max_moves : int
+        Longest replay accepted
+
+    Returns VerifyResult(ok, n_disks, moves, reason, n_pegs).
+    """
+    n_disks = 0
+    try:
+        header, moves = _open(replay)
+        n_disks = header.n_disks
+        if not 1 <= n_disks <= MAX_DISKS:
+            return VerifyResult(False, n_disks, 0, "bad disk count")
+        if not 3 <= header.n_pegs <= MAX_PEGS:
+            return VerifyResult(False, n_disks, 0, "bad peg count")
+        return _check(n_disks, header.n_pegs, moves, max_moves)
+    except ValueError as e:
+        return VerifyResult(False, n_disks, 0, str(e))
+
+
+# -----------------------------
+# Function: _check
+# Purpose: Play (src, dst, delta) moves on the engine and judge the game
+# -----------------------------
+def _check(n_disks, n_pegs, moves, max_moves):
+    # Failed results count the moves read, which is what a batch's budget is charged
+    # The goal is always the last peg (FINISH_PEG for the 3-peg game)
+    state = HanoiState(n_disks, goal=n_pegs - 1, n_pegs=n_pegs)
+    try:
+        for src, dst, _ in moves:
+            if state.steps >= max_moves:
+                return VerifyResult(False, n_disks, state.steps, "replay too long", n_pegs)
+            if state.is_won():
+                return VerifyResult(False, n_disks, state.steps, "moves after the game was won", n_pegs)
+            if not state.can_move(src, dst):
+                return VerifyResult(False, n_disks, state.steps, f"illegal move {src}->{dst}", n_pegs)
+            state.move(src, dst)
+    except ValueError as e:
+        return VerifyResult(False, n_disks, state.steps, str(e), n_pegs)
+    if not state.is_won():
+        return VerifyResult(False, n_disks, state.steps, "game not finished", n_pegs)
+    return VerifyResult(True, n_disks, state.steps, None, n_pegs)
+
+
+# -----------------------------
+# Function: _to_arrays
+# Purpose: Decode replay moves into (src array, dst array)
+# -----------------------------
+def _to_arrays(moves, limit):
+    """
+    Returns (arrays, decoded, error). arrays is None if the replay has
+    more than `limit` moves or stops decoding with `error`; decoded counts
+    the moves read either way, so the caller can charge them to a budget.
+    """
+    src, dst = bytearray(), bytearray()
+    try:
+        for a, b, _ in moves:
+            if len(src) >= limit:
+                return None, len(src), None
+            src.append(a)
+            dst.append(b)
+    except ValueError as e:
+        return None, len(src), e
+    return (np.frombuffer(bytes(src), np.uint8), np.frombuffer(bytes(dst), np.uint8)), len(src), None
+
+
+# -----------------------------
+# Function: verify_batch
+# Purpose: Verify many replays at once
+# -----------------------------
+def verify_batch(replays, processes=1, max_moves=MAX_REPLAY_MOVES, max_total_moves=None):
+    """
+    Verify a list of replays; returns a list of VerifyResult in order.
+
+    Replays are grouped by length (within a factor of four) and each
+    group advances in lockstep over a (replays x disks) peg-per-disk
+    array, so each move step is a handful of NumPy operations for the
+    whole group and one long replay can't pad every other one out to
+    its length. Groups
+    too small to gain from that (a long outlier, say) go through the
+    engine one by one. With processes > 1 the batch is split across a
+    process pool. Without NumPy, replays are checked one by one.
+
+    max_total_moves caps the moves decoded for the whole batch (split
+    evenly between processes); past it BatchTooLarge is raised, so one
+    request can't cost more than that much memory and CPU.
+    """
+    replays = list(replays)
+    if np is None:
+        return _verify_each(replays, max_moves, max_total_moves)
+    if processes > 1 and len(replays) > 1:
+        size = -(-len(replays) // processes)
+        parts = [replays[i:i+size] for i in range(0, len(replays), size)]
+        budget = None if max_total_moves is None else max_total_moves // len(parts)
+        with ProcessPoolExecutor(processes) as pool:
+            results = pool.map(_verify_vectorised, parts, [max_moves]*len(parts), [budget]*len(parts))
+            return [result for part in results for result in part]
+    return _verify_vectorised(replays, max_moves, max_total_moves)
+
+
+def _verify_each(replays, max_moves, max_total_moves):
+    # No NumPy: the engine, with the same overall move budget
+    results = []
+    budget = max_total_moves
+    for replay in replays:
+        limit = max_moves if budget is None else min(max_moves, budget)
+        result = verify_replay(replay, limit)
+        if result.reason == "replay too long" and limit < max_moves:
+            raise BatchTooLarge(f"batch has more than {max_total_moves} moves")
+        if budget is not None:
+            budget -= result.moves
+        results.append(result)
+    return results
+
+
+def _verify_vectorised(replays, max_moves, max_total_moves=None):
+    results = [None] * len(replays)
+    decoded = []     # (index, n_disks, n_pegs, src, dst)
+    budget = max_total_moves
+    for i, replay in enumerate(replays):
+        n_disks = 0
+        limit = max_moves if budget is None else min(max_moves, budget)
+        try:
+            header, moves = _open(replay)
+            n_disks = header.n_disks
+            if not 1 <= n_disks <= MAX_DISKS:
+                results[i] = VerifyResult(False, n_disks, 0, "bad disk count")
+                continue
+            if not 3 <= header.n_pegs <= MAX_PEGS:
+                results[i] = VerifyResult(False, n_disks, 0, "bad peg count")
+                continue
+            arrays, count, error = _to_arrays(moves, limit)
+        except ValueError as e:
+            results[i] = VerifyResult(False, n_disks, 0, str(e))
+            continue
+        # Charged whether or not the replay decoded to the end
+        if budget is not None:
+            budget -= count
+        if error is not None:
+            results[i] = VerifyResult(False, n_disks, count, str(error), header.n_pegs)
+            continue
+        if arrays is None:
+            if limit < max_moves:
+                raise BatchTooLarge(f"batch has more than {max_total_moves} moves")
+            results[i] = VerifyResult(False, n_disks, count, "replay too long", header.n_pegs)
+            continue
+        decoded.append((i, n_disks, header.n_pegs) + arrays)
+
+    # Lengths within a factor of 4 share a group: tighter groups mean more
+    # lockstep passes, looser ones more padding
+    groups = defaultdict(list)
+    for item in decoded:
+        groups[(len(item[3]).bit_length() + 1) // 2].append(item)
+    for group in groups.values():
+        if len(group) < MIN_LOCKSTEP:
+            for i, n, k, s, d in group:
+                results[i] = _check(n, k, zip(s.tolist(), d.tolist(), itertools.repeat(0)), max_moves)
+        else:
+            _lockstep(group, results)
+    return results
+
+
+# -----------------------------
+# Function: _lockstep
+# Purpose: Verify decoded replays of similar length together with NumPy
+# -----------------------------
+def _lockstep(decoded, results):
+    count = len(decoded)
+    n_max = max(item[1] for item in decoded)
+    lengths = np.array([len(item[3]) for item in decoded], np.int64)
+    n_disks = np.array([item[1] for item in decoded], np.int64)
+    goal = np.array([item[2] - 1 for item in decoded], np.int64)
+    steps = int(lengths.max()) if count else 0
+
+    # Moves padded to a rectangle; peg NO_PEG marks "no move" / "no disk"
+    src = np.full((count, steps), NO_PEG, np.uint8)
+    dst = np.full((count, steps), NO_PEG, np.uint8)
+    for row, (_, _, _, s, d) in enumerate(decoded):
+        src[row, :len(s)] = s
+        dst[row, :len(d)] = d
+    # loc[b, d] is the peg of disk d+1 (smallest first); padding disks sit on NO_PEG
+    disk_ids = np.arange(n_max)
+    loc = np.where(disk_ids[None, :] < n_disks[:, None], 0, NO_PEG).astype(np.uint8)
+    on_goal = np.zeros(count, np.int64)
+    failed_at = np.full(count, -1, np.int64)
+    reason = np.zeros(count, np.uint8)   # 1 illegal, 2 moved after winning
+    alive = np.ones(count, bool)
+    rows = np.arange(count)
+    big = np.int64(n_max)
+
+    for t in range(steps):
+        active = alive & (t < lengths)
+        if not active.any():
+            break
+        b = rows[active]
+        s = src[b, t].astype(np.int64)
+        d = dst[b, t].astype(np.int64)
+        cur = loc[b]
+        # Top disk of a peg = smallest disk on it (first match along the disk axis)
+        src_mask = cur == s[:, None]
+        dst_mask = cur == d[:, None]
+        src_top = np.where(src_mask.any(1), src_mask.argmax(1), big)
+        dst_top = np.where(dst_mask.any(1), dst_mask.argmax(1), big)
+        already_won = on_goal[b] == n_disks[b]
+        legal = (s != d) & (src_top < big) & (src_top < dst_top) & ~already_won
+
+        bad = b[~legal]
+        failed_at[bad] = t
+        reason[bad] = np.where(already_won[~legal], 2, 1)
+        alive[bad] = False
+
+        good = legal
+        loc[b[good], src_top[good]] = d[good]
+        g = goal[b[good]]
+        on_goal[b[good]] += (d[good] == g).astype(np.int64) - (s[good] == g)
+
+    for row, (i, n, k, s, d) in enumerate(decoded):
+        if failed_at[row] >= 0:
+            t = int(failed_at[row])
+            if reason[row] == 2:
+                results[i] = VerifyResult(False, n, t, "moves after the game was won", k)
+            else:
+                results[i] = VerifyResult(False, n, t, f"illegal move {s[t]}->{d[t]}", k)
+        elif on_goal[row] != n:
+            results[i] = VerifyResult(False, n, int(lengths[row]), "game not finished", k)
+        else:
+            results[i] = VerifyResult(True, n, int(lengths[row]), None, k)
@@ -0,0 +1,200 @@
+# ===============================================
+# Tower of Hanoi - Cached & Precompressed Responses
+# ===============================================
+# Pages whose output never changes are rendered once and
+# stored precompressed; CSS is served from content-hashed
+# URLs with far-future caching. Repeat views cost an ETag
+# comparison or a dictionary lookup.
+# ===============================================
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+
+from flask import Response, abort, render_template, request
+
+from logs import get_logger
+
+try:
+    import brotli
+except ImportError:   # gzip only
+    brotli = None
+
+ONE_YEAR = 365 * 24 * 3600
+log = get_logger('web.pages')
+
+
+# -----------------------------
+# Class: CachedBody
+# Purpose: One response body in every encoding, plus its ETag
+# -----------------------------
+class CachedBody:
+    __slots__ = ('etag', 'mimetype', 'variants', 'mtime')
+
+    def __init__(self, data, mimetype, mtime=None):
+        self.etag = hashlib.sha256(data).hexdigest()[:16]
+        self.mimetype = mimetype
+        self.mtime = mtime
+        self.variants = {'identity': data, 'gzip': gzip.compress(data, 9, mtime=0)}
+        if brotli is not None:
+            self.variants['br'] = brotli.compress(data, quality=11)
+
+    def respond(self, cache_control):
+        """
+        304 if the client already has this version, otherwise the
+        smallest encoding the client accepts.
+        """
+        headers = {'ETag': f'"{self.etag}"', 'Cache-Control': cache_control,
+                   'Vary': 'Accept-Encoding'}
+        if self.etag in request.if_none_match:
+            return Response(status=304, headers=headers)
+        accepted = request.accept_encodings
+        encoding = 'identity'
+        for name in ('br', 'gzip'):
+            if name in self.variants and accepted[name]:
+                encoding = name
+                break
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return Response(self.variants[encoding], mimetype=self.mimetype, headers=headers)
+
+
+# -----------------------------
+# Class: PageCache
+# Purpose: Render-once pages for routes with fixed output
+# -----------------------------
+class PageCache:
+    """
+    render(template) renders a template the first time it is asked for
+    and then serves the stored, precompressed bytes. Pages are marked
+    'no-cache' so browsers revalidate, which costs a 304 with no body.
+    In debug mode a page is re-rendered when its template file changes.
+
+    Parameters:
+    app : Flask
+        Application whose templates are cached
+    assets : StaticAssets
+        In debug mode, pages are also re-rendered when a static file
+        changes, so they link to its new URL
+    """
+
+    def __init__(self, app, assets=None):
+        self.app = app
+        self.assets = assets
+        self.pages = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.renders = 0
+
+    def _template_mtime(self, template):
+        try:
+            return os.path.getmtime(os.path.join(self.app.root_path, self.app.template_folder, template))
+        except OSError:
+            return None
+
+    def render(self, template, banner=None):
+        """Cached response for `template`; `banner` is printed only when it is rendered."""
+        page = self.pages.get(template)
+        if page is not None and self.app.debug:
+            changed = self.assets is not None and self.assets.refresh()
+            if changed or page.mtime != self._template_mtime(template):
+                page = None
+        if page is None:
+            with self.lock:
+                if banner:
+                    log.debug(banner)
+                page = CachedBody(render_template(template).encode('utf-8'), 'text/html',
+                                  self._template_mtime(template))
+                self.pages[template] = page
+                self.renders += 1
+        else:
+            self.hits += 1
+        return page.respond('no-cache')
+
+    def warm(self, templates):
+        """Render pages up front (needs a request context for url_for)."""
+        with self.app.test_request_context('/'):
+            for template in templates:
+                self.render(template)
+
+    def stats(self):
+        return {'pages': len(self.pages), 'renders': self.renders, 'hits': self.hits}
+
+
+# -----------------------------
+# Class: StaticAssets
+# Purpose: Content-hashed, precompressed, immutable static files
+# -----------------------------
+class StaticAssets:
+    """
+    Reads every file in the static folder once, precompresses it and
+    serves it at /assets/<name>.<hash>.<ext> with a one-year immutable
+    Cache-Control. Templates link to files with asset_url('style.css'),
+    so a changed file gets a new URL and browsers never hold a stale copy.
+    Files that are not text (CSS, JS, SVG, HTML) are stored uncompressed.
+
+    Parameters:
+    app : Flask
+        Application to register the route and template helper on
+    """
+
+    COMPRESSIBLE = ('text/', 'application/javascript', 'image/svg+xml', 'application/json')
+
+    def __init__(self, app):
+        self.app = app
+        self.folder = app.static_folder
+        self.files = {}     # hashed name -> CachedBody
+        self.urls = {}      # plain name -> hashed name
+        self.lock = threading.Lock()
+        self.load()
+        app.add_url_rule('/assets/<path:filename>', 'asset', self.serve)
+        app.jinja_env.globals['asset_url'] = self.url
+
+    def load(self):
+        files, urls = {}, {}
+        for root, _, names in os.walk(self.folder):
+            for name in names:
+                path = os.path.join(root, name)
+                relative = os.path.relpath(path, self.folder).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    data = f.read()
+                mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+                body = CachedBody(data, mimetype, os.path.getmtime(path))
+                if not mimetype.startswith(self.COMPRESSIBLE):
+                    body.variants = {'identity': data}
+                stem, ext = os.path.splitext(relative)
+                hashed = f"{stem}.{body.etag[:10]}{ext}"
+                files[hashed] = body
+                urls[relative] = hashed
+        with self.lock:
+            self.files, self.urls = files, urls
+
+    def url(self, filename):
+        """URL of the current version of a static file (for templates)."""
+        if self.app.debug:
+            self.refresh()
+        hashed = self.urls.get(filename)
+        if hashed is None:
+            return f"/static/{filename}"
+        return f"/assets/{hashed}"
+
+    def refresh(self):
+        """Reload if any static file was added, removed or modified (debug mode)."""
+        seen = {}
+        for root, _, names in os.walk(self.folder):
+            for name in names:
+                path = os.path.join(root, name)
+                seen[os.path.relpath(path, self.folder).replace(os.sep, '/')] = os.path.getmtime(path)
+        current = {name: self.files[hashed].mtime for name, hashed in self.urls.items()}
+        if seen == current:
+            return False
+        self.load()
+        return True
+
+    def serve(self, filename):
+        body = self.files.get(filename)
+        if body is None:
+            abort(404)
+        return body.respond(f'public, max-age={ONE_YEAR}, immutable')